@@ -0,0 +1,39 @@
+"""Add payment keyset pagination indexes
+
+Revision ID: eae60a2d90ef
+Revises: f50997feeff7
+Create Date: 2026-10-18 09:12:41.207318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eae60a2d90ef'
+down_revision: Union[str, None] = 'f50997feeff7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so payments stay writable; that cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payments_user_id_timestamp_id', 'payments',
+            ['user_id', sa.text('timestamp DESC'), sa.text('id DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_payments_timestamp_id', 'payments',
+            [sa.text('timestamp DESC'), sa.text('id DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_payments_timestamp_id', table_name='payments', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_payments_user_id_timestamp_id', table_name='payments', postgresql_concurrently=True, if_exists=True)
@@ -1,26 +1,33 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Header, Query
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.config import settings
-from backend.core.database import get_db
+from backend.core.database import get_async_db
 from backend.core.logging_config import get_logger
 from backend.schemas.user_schema import UserCreate, LoginRequest, UserMFASetup, UserMFAVerify
-from backend.services.mfa import generate_mfa_secret, verify_mfa_code
+from backend.services.mfa import get_pending_mfa_setup, clear_pending_mfa_setup, verify_mfa_code
 from backend.api.admin.admin_service import create_admin_user, list_admin_users, moderate_flagged_users
 from backend.models.user import User, UserType
-from backend.api.auth.auth_service import verify_password
-from backend.services.session_service import create_session, validate_session
+from backend.api.auth.auth_service import verify_password, admin_required, rehash_password_if_needed, check_login_rate_limit
+from backend.core.db_pool import get_pool_metrics
+from backend.core.password_hashing import password_hasher
+from backend.core.database import pool_profile
+from backend.services.session_service import create_session, validate_session, mark_session_mfa_verified
+from backend.api.middlewares.route_policy import public, superuser_only
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 
 @router.post("/create", tags=["Admin"])
-def create_admin(
+@superuser_only
+async def create_admin(
         user_data: UserCreate,
         x_superuser_secret: str = Header(None),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
 ):
     """ Securely create a new admin user. """
     try:
@@ -28,8 +35,8 @@ def create_admin(
             logger.warning("Invalid secret key attempt for admin creation")
             raise HTTPException(status_code=403, detail="Invalid secret key. Access denied.")
 
-        new_admin = create_admin_user(db, user_data)
-        logger.info(f"Admin user created: {new_admin.username}")
+        new_admin = await create_admin_user(db, user_data)
+        logger.info("Admin user created: %s", new_admin.username)
         return {"message": f"Admin user {new_admin.username} created successfully"}
 
     except HTTPException as e:
@@ -41,11 +48,13 @@ def create_admin(
 
 
 @router.post("/login", tags=["Admin"])
-async def admin_login(user_data: LoginRequest, db: Session = Depends(get_db)):
+@public
+async def admin_login(user_data: LoginRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
     """ Login an admin and enforce MFA requirements. """
     try:
-        user = db.query(User).filter(User.email == user_data.email).first()
-        if not user or not verify_password(user_data.password, user.hashed_password):
+        await check_login_rate_limit("admin_login", user_data.email, request)
+        user = await db.scalar(select(User).where(User.email == user_data.email))
+        if not user or not await verify_password(user_data.password, user.hashed_password):
             raise HTTPException(status_code=401, detail="Invalid email or password")
 
         if user.user_type != UserType.ADMIN:
@@ -57,7 +66,9 @@ async def admin_login(user_data: LoginRequest, db: Session = Depends(get_db)):
         if user.flagged_for_review:
             raise HTTPException(status_code=403, detail="Account under review")
 
-        session_token = create_session(user.id, db, is_mobile=user_data.is_mobile)
+        await rehash_password_if_needed(user, user_data.password, db)
+
+        session_token = await create_session(user.id, db, is_mobile=user_data.is_mobile)
 
         if not user.mfa_secret:
             return {"mfa_setup_required": True, "user_id": user.id, "session_token": session_token}
@@ -76,17 +87,22 @@ async def admin_login(user_data: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/mfa/setup", tags=["Admin"])
-def get_mfa_setup(user_id: UUID, db: Session = Depends(get_db)):
-    """ Generate a QR code and manual key for MFA setup. """
+@public
+async def get_mfa_setup(
+    user_id: UUID,
+    format: Optional[str] = Query(None, pattern="^(png|svg)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """ Generate a QR code (PNG or SVG) and manual key for MFA setup. """
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user or user.user_type != UserType.ADMIN:
             raise HTTPException(status_code=403, detail="Access denied")
 
         if user.mfa_secret:
             raise HTTPException(status_code=400, detail="MFA is already set up")
 
-        mfa_data = generate_mfa_secret(user.email)
+        mfa_data = await get_pending_mfa_setup(user.id, user.email, format)
         return {"qr_code_url": mfa_data["qr_code"], "manual_key": mfa_data["manual_key"]}
 
     except HTTPException as e:
@@ -98,24 +114,26 @@ def get_mfa_setup(user_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/mfa/setup", tags=["Admin"])
-def post_mfa_setup(data: UserMFASetup, db: Session = Depends(get_db)):
+@public
+async def post_mfa_setup(data: UserMFASetup, db: AsyncSession = Depends(get_async_db)):
     """ Verify the TOTP code, enable MFA, and return a session token. """
     try:
-        user = db.query(User).filter(User.id == data.user_id).first()
+        user = await db.get(User, data.user_id)
 
         if not user or user.user_type != UserType.ADMIN:
             raise HTTPException(status_code=403, detail="Access denied")
 
-        if not verify_mfa_code(data.mfa_secret, data.totp_code):
+        if not await verify_mfa_code(data.mfa_secret, data.totp_code):
             raise HTTPException(status_code=400, detail="Invalid TOTP code")
 
         user.mfa_secret = data.mfa_secret
         user.mfa_enabled = True
-        db.commit()
+        await db.commit()
+        await clear_pending_mfa_setup(user.id)
 
-        session_token = create_session(user.id, db, is_mobile=False)
+        session_token = await create_session(user.id, db, is_mobile=False)
 
-        logger.info(f"MFA setup successful for admin: {user.id}")
+        logger.info("MFA setup successful for admin: %s", user.id)
         return {"session_token": session_token}
 
     except HTTPException as e:
@@ -127,25 +145,25 @@ def post_mfa_setup(data: UserMFASetup, db: Session = Depends(get_db)):
 
 
 @router.post("/mfa/verify", tags=["Admin"])
-def post_mfa_verify(data: UserMFAVerify, db: Session = Depends(get_db)):
+@public
+async def post_mfa_verify(data: UserMFAVerify, db: AsyncSession = Depends(get_async_db)):
     """ Verify the TOTP code for login or protected access and return a session token. """
     try:
-        session = validate_session(data.session_token, db)
+        session = await validate_session(data.session_token, db)
 
-        user = db.query(User).filter(User.id == session.user_id).first()
+        user = await db.get(User, session.user_id)
         if not user or user.user_type != UserType.ADMIN:
             raise HTTPException(status_code=403, detail="Access denied")
 
         if not user.mfa_secret:
             raise HTTPException(status_code=400, detail="MFA is not set up for this user")
 
-        if not verify_mfa_code(user.mfa_secret, data.totp_code):
+        if not await verify_mfa_code(user.mfa_secret, data.totp_code):
             raise HTTPException(status_code=400, detail="Invalid TOTP code")
 
-        session.mfa_verified = True
-        db.commit()
+        await mark_session_mfa_verified(session.token, db)
 
-        logger.info(f"MFA verified successfully for user: {user.id}")
+        logger.info("MFA verified successfully for user: %s", user.id)
         return {"message": "MFA verification successful", "session_token": session.token}
 
     except HTTPException as e:
@@ -157,20 +175,32 @@ def post_mfa_verify(data: UserMFAVerify, db: Session = Depends(get_db)):
 
 
 @router.get("/list", tags=["Admin"])
-def list_admins(db: Session = Depends(get_db)):
+async def list_admins(db: AsyncSession = Depends(get_async_db)):
     """ List all admin users. """
     try:
-        return list_admin_users(db)
+        return await list_admin_users(db)
     except Exception as e:
         logger.exception("Error fetching admin users")
         raise HTTPException(status_code=500, detail="Failed to retrieve admin users")
 
 
 @router.get("/moderate-flagged", tags=["Admin"])
-def moderate_users(db: Session = Depends(get_db)):
+async def moderate_users(db: AsyncSession = Depends(get_async_db)):
     """ List all users flagged for review. """
     try:
-        return moderate_flagged_users(db)
+        return await moderate_flagged_users(db)
     except Exception as e:
         logger.exception("Error retrieving flagged users")
         raise HTTPException(status_code=500, detail="Failed to retrieve flagged users")
+
+
+@router.get("/metrics/db-pool", tags=["Admin"], dependencies=[Depends(admin_required)])
+async def db_pool_metrics():
+    """ Live connection pool metrics for this worker process. """
+    return {"profile": pool_profile.name, "pools": get_pool_metrics()}
+
+
+@router.get("/metrics/password-hasher", tags=["Admin"], dependencies=[Depends(admin_required)])
+async def password_hasher_metrics():
+    """ Queue depth and throughput of the password hashing pool in this worker process. """
+    return password_hasher.metrics()
@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, Depends
 
@@ -11,16 +12,16 @@ from backend.core.logging_config import get_logger
 logger = get_logger(__name__)
 
 
-def create_admin_user(db: Session, user_data: UserCreate):
+async def create_admin_user(db: AsyncSession, user_data: UserCreate):
     """ Create a new admin user securely. """
     try:
-        if db.query(User).filter(User.email == user_data.email).first():
+        if await db.scalar(select(User).where(User.email == user_data.email)):
             raise HTTPException(status_code=400, detail="Email already registered")
 
-        if db.query(User).filter(User.username == user_data.username).first():
+        if await db.scalar(select(User).where(User.username == user_data.username)):
             raise HTTPException(status_code=400, detail="Username already taken")
 
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password(user_data.password)
 
         admin_user = User(
             username=user_data.username,
@@ -42,29 +43,29 @@ def create_admin_user(db: Session, user_data: UserCreate):
         )
 
         db.add(admin_user)
-        db.commit()
-        db.refresh(admin_user)
+        await db.commit()
+        await db.refresh(admin_user)
 
-        logger.info(f"Admin user created successfully: {admin_user.username}")
+        logger.info("Admin user created successfully: %s", admin_user.username)
         return admin_user
 
     except SQLAlchemyError as e:
         logger.error(f"Database error during admin creation: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Database error occurred while creating admin user")
     except Exception as e:
         logger.exception("Unexpected error during admin creation")
         raise HTTPException(status_code=500, detail="Unexpected error occurred while creating admin user")
 
 
-def list_admin_users(db: Session):
+async def list_admin_users(db: AsyncSession):
     """ Retrieve a list of all admin users. """
     try:
-        admins = db.query(User).filter(User.user_type == UserType.ADMIN).all()
+        admins = (await db.scalars(select(User).where(User.user_type == UserType.ADMIN))).all()
         if not admins:
             raise HTTPException(status_code=404, detail="No admin users found")
 
-        logger.info(f"Retrieved {len(admins)} admin users")
+        logger.info("Retrieved %s admin users", len(admins))
         return admins
     except SQLAlchemyError as e:
         logger.error(f"Database error retrieving admin users: {str(e)}")
@@ -74,14 +75,14 @@ def list_admin_users(db: Session):
         raise HTTPException(status_code=500, detail="Unexpected error while retrieving admin users")
 
 
-def moderate_flagged_users(db: Session):
+async def moderate_flagged_users(db: AsyncSession):
     """ Retrieve a list of users flagged for review. """
     try:
-        flagged_users = db.query(User).filter(User.flagged_for_review == True).all()
+        flagged_users = (await db.scalars(select(User).where(User.flagged_for_review == True))).all()
         if not flagged_users:
             raise HTTPException(status_code=404, detail="No flagged users found")
 
-        logger.info(f"Retrieved {len(flagged_users)} flagged users")
+        logger.info("Retrieved %s flagged users", len(flagged_users))
         return flagged_users
     except SQLAlchemyError as e:
         logger.error(f"Database error retrieving flagged users: {str(e)}")
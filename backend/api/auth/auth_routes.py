@@ -1,16 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from fastapi.responses import RedirectResponse
 from fastapi.security import HTTPBearer
 from jose import jwt, JWTError, ExpiredSignatureError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
+from typing import Optional
 from urllib.parse import urlencode
 from uuid import UUID
+import math
 
-from backend.core.database import get_db
+from backend.core.database import get_async_db
 from backend.api.auth.auth_service import (
     create_user, get_user_by_username, get_user_by_email, verify_password,
-    hash_password, get_current_user, enable_mfa, disable_mfa
+    hash_password, get_current_user, enable_mfa, disable_mfa, rehash_password_if_needed,
+    check_login_rate_limit,
 )
 from backend.schemas.user_schema import UserCreate, Token, LoginRequest
 from backend.core.config import settings
@@ -18,10 +21,9 @@ from backend.services.session_service import create_session, validate_session, i
     invalidate_specific_session
 from backend.models.user import User, SetupStep
 from backend.core.logging_config import get_logger
-from backend.templates.email_templates import EMAIL_VERIFICATION_TEMPLATE
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
-
-print("DEBUG: auth_routes.py is being imported")
+from backend.core.ttl_store import get_ttl_store
+from backend.services.email_service import queue_email
+from backend.api.middlewares.route_policy import public, mfa_exempt
 
 auth_scheme = HTTPBearer()
 logger = get_logger(__name__)
@@ -31,77 +33,92 @@ router = APIRouter()
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
 EMAIL_TOKEN_EXPIRE_MINUTES = 60
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-)
 BASE_URL = settings.BASE_URL
 FRONTEND_BASE_URL = settings.FRONTEND_URL
-email_cooldown_cache = {}
+# Minimum gap between verification emails to the same address, shared by all workers
+email_cooldowns = get_ttl_store("email-cooldown")
 
 
-async def send_email(subject: str, recipient: str, template: str, context: dict):
-    try:
-        message = MessageSchema(
-            subject=subject,
-            recipients=[recipient],
-            body=template.render(context),
-            subtype="html",
-        )
-        fm = FastMail(conf)
-        await fm.send_message(message)
-        logger.info(f"Email sent to {recipient}")
-    except Exception as e:
-        logger.error(f"Failed to send email: {e}")
-        raise HTTPException(status_code=500, detail="Failed to send email")
+async def send_verification_email(user: User) -> Optional[float]:
+    """
+    Queue the verification email unless one went to this address recently.
+
+    Returns None when the email was queued, or the seconds left on the cooldown.
+    """
+    cooldown_key = user.email.lower()
+    if not await email_cooldowns.add(cooldown_key, True, ttl=settings.EMAIL_VERIFICATION_COOLDOWN_SECONDS):
+        return await email_cooldowns.ttl(cooldown_key) or 0.0
+
+    token_data = {"sub": str(user.id), "type": "email_verification"}
+    verification_token = jwt.encode(token_data, SECRET_KEY, algorithm=ALGORITHM)
+    verification_link = f"{BASE_URL}/api/auth/verify-email?token={verification_token}"
+
+    context = {
+        "username": user.username,
+        "verification_link": verification_link,
+        "current_year": datetime.now().year,
+    }
+
+    if not await queue_email("Verify Your Email", user.email, "email_verification", context):
+        # Let the user retry right away if the email never reached the queue.
+        await email_cooldowns.delete(cooldown_key)
+        raise HTTPException(status_code=503, detail="Email service unavailable, please retry")
+    return None
 
 
 @router.post("/register")
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+@public
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     if not user.accepted_privacy_policy or not user.accepted_terms:
         raise HTTPException(status_code=400, detail="You must accept terms and privacy policy")
 
-    if get_user_by_username(db, user.username):
+    if await get_user_by_username(db, user.username):
         raise HTTPException(status_code=400, detail="Username already registered")
-    if get_user_by_email(db, user.email):
+    if await get_user_by_email(db, user.email):
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    new_user = create_user(db, user)
+    new_user = await create_user(db, user)
     new_user.setup_step = SetupStep.email_verification
     new_user.profile_version = 1
-    db.commit()
+    await db.commit()
 
-    token_data = {"sub": str(new_user.id), "type": "email_verification"}
-    verification_token = jwt.encode(token_data, SECRET_KEY, algorithm=ALGORITHM)
-    verification_link = f"{BASE_URL}/api/auth/verify-email?token={verification_token}"
+    try:
+        await send_verification_email(new_user)
+    except HTTPException as e:
+        # The account exists either way; the user can ask for the email again.
+        logger.warning(f"Verification email for user {new_user.id} not queued: {e.detail}")
 
-    context = {
-        "username": user.username,
-        "verification_link": verification_link,
-        "current_year": datetime.now().year,
-    }
+    session_token = await create_session(new_user.id, db)
+    return {"access_token": session_token, "token_type": "bearer", "status": "pending"}
 
-    await send_email("Verify Your Email", user.email, EMAIL_VERIFICATION_TEMPLATE, context)
 
-    session_token = create_session(new_user.id, db)
-    return {"access_token": session_token, "token_type": "bearer", "status": "pending"}
+@router.post("/resend-verification")
+@mfa_exempt
+async def resend_verification(current_user: User = Depends(get_current_user)):
+    """ Send the verification email again, at most once per cooldown period. """
+    if current_user.is_verified:
+        raise HTTPException(status_code=400, detail="Email already verified")
+
+    remaining = await send_verification_email(current_user)
+    if remaining is not None:
+        raise HTTPException(
+            status_code=429,
+            detail="Verification email sent recently. Please wait before requesting another.",
+            headers={"Retry-After": str(max(1, math.ceil(remaining)))},
+        )
+    return {"message": "Verification email sent"}
 
 
 @router.get("/verify-email", include_in_schema=False)
-async def verify_email(token: str, db: Session = Depends(get_db)):
+@public
+async def verify_email(token: str, db: AsyncSession = Depends(get_async_db)):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         if payload.get("type") != "email_verification":
             raise HTTPException(status_code=400, detail="Invalid token type")
 
         user_id = UUID(payload.get("sub"))
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
@@ -111,9 +128,9 @@ async def verify_email(token: str, db: Session = Depends(get_db)):
         user.is_verified = True
         user.setup_step = SetupStep.profile_completion
         user.profile_version += 1
-        db.commit()
+        await db.commit()
 
-        session_token = create_session(user.id, db)
+        session_token = await create_session(user.id, db)
         return RedirectResponse(
             url=f"{FRONTEND_BASE_URL}/verify-email?{urlencode({'status': 'success', 'token': session_token})}")
 
@@ -129,15 +146,17 @@ async def verify_email(token: str, db: Session = Depends(get_db)):
 
 
 @router.post("/login")
-def login(request: LoginRequest, db: Session = Depends(get_db)):
-    logger.info(f"Login attempt for email: {request.email}, is_mobile: {request.is_mobile}")
+@public
+async def login(request: LoginRequest, http_request: Request, db: AsyncSession = Depends(get_async_db)):
+    logger.info("Login attempt for email: %s, is_mobile: %s", request.email, request.is_mobile)
+    await check_login_rate_limit("login", request.email, http_request)
 
-    user = get_user_by_email(db, request.email)
+    user = await get_user_by_email(db, request.email)
     if not user:
         logger.warning(f"User with email {request.email} not found")
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if not verify_password(request.password, user.hashed_password):
+    if not await verify_password(request.password, user.hashed_password):
         logger.warning(f"Password verification failed for email {user.email}")
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
@@ -145,34 +164,38 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
         logger.warning(f"Inactive user {user.email} attempted login")
         raise HTTPException(status_code=403, detail="User account is inactive")
 
-    token = create_session(user.id, db, request.is_mobile)
-    logger.info(f"Session created for email: {user.email}")
+    await rehash_password_if_needed(user, request.password, db)
+
+    token = await create_session(user.id, db, request.is_mobile)
+    logger.info("Session created for email: %s", user.email)
     return {"access_token": token, "token_type": "bearer"}
 
 @router.post("/enable-mfa")
-def enable_mfa_route(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    response = enable_mfa(current_user, db)
+async def enable_mfa_route(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    response = await enable_mfa(current_user, db)
     if not isinstance(response, dict):
         raise HTTPException(status_code=500, detail="Invalid response from enable_mfa")
     return response
 
 
 @router.post("/disable-mfa")
-def disable_mfa_route(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    response = disable_mfa(current_user, db)
+async def disable_mfa_route(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    response = await disable_mfa(current_user, db)
     if not isinstance(response, dict):
         raise HTTPException(status_code=500, detail="Invalid response from disable_mfa")
     return response
 
 
 @router.post("/logout")
-def logout(current_user: User = Depends(get_current_user), db: Session = Depends(get_db),
+@mfa_exempt
+async def logout(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db),
            token: str = Depends(auth_scheme)):
-    invalidate_specific_session(token.credentials, db)
+    await invalidate_specific_session(token.credentials, db)
     return {"message": "Logged out successfully"}
 
 
 @router.post("/logout-all")
-def logout_all(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    invalidate_session(current_user.id, db)
+@mfa_exempt
+async def logout_all(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    await invalidate_session(current_user.id, db)
     return {"message": "All sessions logged out successfully"}
\ No newline at end of file
@@ -1,45 +1,93 @@
-import bcrypt
-from sqlalchemy.orm import Session
-from fastapi import HTTPException, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, Depends, Request
 from uuid import UUID
 from datetime import datetime
 
+from backend.core.database import get_async_db
 from backend.models import User
 from backend.schemas.user_schema import UserCreate, UserType
-from backend.services.session_service import create_session
+from backend.services.session_service import create_session, get_request_session
 from backend.services.mfa import generate_mfa_secret
 from backend.core.logging_config import get_logger
+from backend.core.config import settings
+from backend.core.password_hashing import HasherBusyError, password_hasher
+from backend.core.rate_limit import RateLimit, rate_limiter, retry_after_header
 
 logger = get_logger(__name__)
 
-def hash_password(password: str) -> str:
-    """ Securely hashes a password using bcrypt. """
+# Per-endpoint login limits: (by email, by client IP)
+LOGIN_RATE_LIMITS = {
+    "login": (RateLimit.parse(settings.LOGIN_RATE_LIMIT_EMAIL), RateLimit.parse(settings.LOGIN_RATE_LIMIT_IP)),
+    "admin_login": (
+        RateLimit.parse(settings.ADMIN_LOGIN_RATE_LIMIT_EMAIL),
+        RateLimit.parse(settings.ADMIN_LOGIN_RATE_LIMIT_IP),
+    ),
+}
+
+async def check_login_rate_limit(endpoint: str, email: str, request: Request):
+    """ Reject a login attempt with 429 before any password work when its email or IP is over the limit. """
+    email_limit, ip_limit = LOGIN_RATE_LIMITS[endpoint]
+    client_ip = request.client.host if request.client else "unknown"
+    wait = await rate_limiter.hit([
+        (f"{endpoint}:email:{email.strip().lower()}", email_limit),
+        (f"{endpoint}:ip:{client_ip}", ip_limit),
+    ])
+    if wait > 0:
+        logger.warning(f"Login rate limit hit on {endpoint} for {email} from {client_ip}")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many login attempts. Please try again later.",
+            headers=retry_after_header(wait),
+        )
+
+async def hash_password(password: str) -> str:
+    """ Securely hashes a password using bcrypt on the dedicated hasher pool. """
     try:
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        return await password_hasher.hash(password)
+    except HasherBusyError:
+        logger.warning("Password hasher saturated, rejecting request")
+        raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
     except Exception as e:
         logger.exception("Error hashing password")
         raise HTTPException(status_code=500, detail="Password hashing failed")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """ Verifies a password against a stored hash. """
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """ Verifies a password against a stored hash on the dedicated hasher pool. """
     try:
-        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        return await password_hasher.verify(plain_password, hashed_password)
+    except HasherBusyError:
+        logger.warning("Password hasher saturated, rejecting request")
+        raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
     except Exception as e:
         logger.exception("Error verifying password")
         raise HTTPException(status_code=500, detail="Password verification failed")
 
-def create_user(db: Session, user_data: UserCreate) -> User:
+async def rehash_password_if_needed(user: User, plain_password: str, db: AsyncSession):
+    """ Re-hash a verified password when BCRYPT_ROUNDS has changed since it was stored. """
+    if not password_hasher.needs_rehash(user.hashed_password):
+        return
+    try:
+        user.hashed_password = await hash_password(plain_password)
+        await db.commit()
+        logger.info("Rehashed password for user %s with cost %s", user.id, password_hasher.rounds)
+    except Exception as e:
+        # Login already succeeded; keep the old hash and try again next time.
+        await db.rollback()
+        logger.warning(f"Password rehash failed for user {user.id}: {str(e)}")
+
+async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
     """ Creates a new user in the database. """
     try:
-        logger.info(f"Creating new user: {user_data.username}")
+        logger.info("Creating new user: %s", user_data.username)
 
-        if db.query(User).filter(User.email == user_data.email).first():
+        if await db.scalar(select(User.id).where(User.email == user_data.email)):
             raise HTTPException(status_code=400, detail="Email already registered")
 
-        if db.query(User).filter(User.username == user_data.username).first():
+        if await db.scalar(select(User.id).where(User.username == user_data.username)):
             raise HTTPException(status_code=400, detail="Username already taken")
 
-        hashed_pw = hash_password(user_data.password)
+        hashed_pw = await hash_password(user_data.password)
 
         new_user = User(
             username=user_data.username,
@@ -73,10 +121,10 @@ def create_user(db: Session, user_data: UserCreate) -> User:
         )
 
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
 
-        logger.info(f"User created successfully: {new_user.id}")
+        logger.info("User created successfully: %s", new_user.id)
         return new_user
 
     except HTTPException as e:
@@ -86,10 +134,10 @@ def create_user(db: Session, user_data: UserCreate) -> User:
         logger.exception("Unexpected error during user creation")
         raise HTTPException(status_code=500, detail="User registration failed. Please try again.")
 
-def get_user_by_email(db: Session, email: str) -> User:
+async def get_user_by_email(db: AsyncSession, email: str) -> User:
     """ Retrieves a user by email. """
     try:
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if not user:
             logger.warning(f"User not found for email: {email}")
         return user
@@ -97,10 +145,10 @@ def get_user_by_email(db: Session, email: str) -> User:
         logger.exception("Error retrieving user by email")
         raise HTTPException(status_code=500, detail="Failed to retrieve user")
 
-def get_user_by_username(db: Session, username: str) -> User:
+async def get_user_by_username(db: AsyncSession, username: str) -> User:
     """ Retrieves a user by username. """
     try:
-        user = db.query(User).filter(User.username == username).first()
+        user = await db.scalar(select(User).where(User.username == username))
         if not user:
             logger.warning(f"User not found for username: {username}")
         return user
@@ -108,51 +156,65 @@ def get_user_by_username(db: Session, username: str) -> User:
         logger.exception("Error retrieving user by username")
         raise HTTPException(status_code=500, detail="Failed to retrieve user")
 
-def get_current_user(db: Session, user_id: UUID) -> User:
-    """ Retrieves the currently authenticated user. """
+async def get_current_session(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """ Returns the request's validated session without loading the user. """
+    session = getattr(request.state, "session", None)
+    if session is None:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="Unauthorized: Missing or invalid token")
+        session = await get_request_session(request, auth_header.split(" ")[1], db)
+    return session
+
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_db)) -> User:
+    """ Retrieves the currently authenticated user from the request's validated session. """
+    session = await get_current_session(request, db)
+
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, session.user_id)
         if not user:
-            logger.warning(f"User not found: {user_id}")
+            logger.warning(f"User not found: {session.user_id}")
             raise HTTPException(status_code=404, detail="User not found")
         return user
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Error retrieving current user")
         raise HTTPException(status_code=500, detail="Failed to retrieve user")
 
-def update_last_login(user: User, db: Session):
+async def update_last_login(user: User, db: AsyncSession):
     """ Updates the last login timestamp for a user. """
     try:
         user.last_login = datetime.utcnow()
-        db.commit()
-        logger.info(f"Updated last login for user: {user.id}")
+        await db.commit()
+        logger.info("Updated last login for user: %s", user.id)
     except Exception as e:
         logger.exception("Error updating last login")
         raise HTTPException(status_code=500, detail="Failed to update last login")
 
-def enable_mfa(user: User, db: Session):
+async def enable_mfa(user: User, db: AsyncSession):
     """ Enables MFA for a user and generates a secret. """
     try:
-        mfa_data = generate_mfa_secret(user.email)
+        mfa_data = await generate_mfa_secret(user.email)
         user.mfa_secret = mfa_data["mfa_secret"]
         user.mfa_enabled = True
-        db.commit()
+        await db.commit()
         return {"message": "MFA enabled", "qr_code": mfa_data["qr_code"], "manual_key": mfa_data["manual_key"]}
     except Exception as e:
         logger.exception(f"Error enabling MFA: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to enable MFA")
 
-def disable_mfa(user: User, db: Session):
+async def disable_mfa(user: User, db: AsyncSession):
     """ Disables MFA for a user. """
     try:
         user.mfa_secret = None
         user.mfa_enabled = False
-        db.commit()
+        await db.commit()
         return {"message": "MFA disabled successfully"}
     except Exception as e:
         logger.exception(f"Error disabling MFA: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to disable MFA")
 
 def generate_password_reset_token(user_id: UUID) -> str:
@@ -166,30 +228,30 @@ def generate_password_reset_token(user_id: UUID) -> str:
             "exp": datetime.utcnow() + settings.PASSWORD_RESET_EXPIRATION,
         }
         token = jwt.encode(token_data, settings.SECRET_KEY, algorithm="HS256")
-        logger.info(f"Generated password reset token for user: {user_id}")
+        logger.info("Generated password reset token for user: %s", user_id)
         return token
     except Exception as e:
         logger.exception("Error generating password reset token")
         raise HTTPException(status_code=500, detail="Failed to generate password reset token")
 
-def update_password(user_id: UUID, new_password: str, db: Session):
+async def update_password(user_id: UUID, new_password: str, db: AsyncSession):
     """ Updates a user's password. """
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        user.hashed_password = hash_password(new_password)
-        db.commit()
-        logger.info(f"Password updated for user: {user.id}")
+        user.hashed_password = await hash_password(new_password)
+        await db.commit()
+        logger.info("Password updated for user: %s", user.id)
     except Exception as e:
         logger.exception("Error updating password")
         raise HTTPException(status_code=500, detail="Failed to update password")
 
-def create_user_session(user: User, db: Session, is_mobile: bool = False):
+async def create_user_session(user: User, db: AsyncSession, is_mobile: bool = False):
     """ Creates a session for a user upon login. """
     try:
-        session_token = create_session(user.id, db, is_mobile)
+        session_token = await create_session(user.id, db, is_mobile)
         return {"access_token": session_token, "token_type": "bearer"}
     except Exception as e:
         logger.exception("Error creating user session")
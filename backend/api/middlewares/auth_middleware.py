@@ -0,0 +1,97 @@
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.api.middlewares.route_policy import route_policies
+from backend.core.config import settings
+from backend.core.database import AsyncSessionLocal
+from backend.core.unit_of_work import get_unit_of_work
+from backend.core.logging_config import get_logger
+from backend.services.session_service import get_request_session
+
+logger = get_logger(__name__)
+
+
+class AuthMiddleware:
+    """
+    Pure ASGI middleware running session, MFA and admin checks in one pass.
+
+    Each route's policy comes from the compiled ``route_policies`` registry.
+    The validated session snapshot is left on ``request.state.session`` for
+    dependencies to reuse, and any lookup goes through the request's shared
+    unit of work rather than a connection of its own.
+    Responses are passed through untouched, so streaming responses stay streamed.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.whitelisted_ips = {ip.strip() for ip in settings.ADMIN_WHITELISTED_IPS.split(",")}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        policy = route_policies.resolve(scope["method"], scope["path"])
+        headers = Headers(scope=scope)
+
+        if policy.superuser:
+            error = self._check_superuser(scope, headers)
+            if error is not None:
+                await error(scope, receive, send)
+                return
+
+        if policy.session:
+            error = await self._check_session(scope, headers, policy.mfa)
+            if error is not None:
+                await error(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+    def _check_superuser(self, scope: Scope, headers: Headers):
+        provided_secret_key = headers.get("X-Superuser-Secret")
+        client_ip = scope["client"][0] if scope.get("client") else None
+
+        if not provided_secret_key:
+            logger.warning("Missing superuser secret key.")
+            return JSONResponse({"detail": "Missing superuser secret key."}, status_code=403)
+
+        if client_ip not in self.whitelisted_ips:
+            logger.warning(f"Unauthorized IP: {client_ip}")
+            return JSONResponse({"detail": "Access denied. Unauthorized IP."}, status_code=403)
+
+        if provided_secret_key != settings.SUPERUSER_CREATION_SECRET_KEY:
+            logger.warning("Invalid superuser secret key.")
+            return JSONResponse({"detail": "Invalid secret key."}, status_code=403)
+
+        return None
+
+    async def _check_session(self, scope: Scope, headers: Headers, require_mfa: bool):
+        auth_header = headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            logger.warning("Missing or malformed Authorization header")
+            return JSONResponse({"detail": "Unauthorized: Missing or invalid token"}, status_code=401)
+
+        token = auth_header.split(" ")[1]
+        try:
+            unit = get_unit_of_work(scope)
+            if unit is not None:
+                session = await get_request_session(Request(scope), token, unit.session)
+            else:
+                async with AsyncSessionLocal() as db:
+                    session = await get_request_session(Request(scope), token, db)
+        except HTTPException as e:
+            logger.warning(f"Session validation failed: {e.detail}")
+            return JSONResponse({"detail": f"Unauthorized: {e.detail}"}, status_code=401)
+        except Exception as e:
+            logger.error(f"Unexpected session validation error: {str(e)}")
+            return JSONResponse({"detail": "Unexpected error in middleware"}, status_code=500)
+
+        if require_mfa and not session.mfa_verified:
+            logger.warning(f"MFA not verified for session: {session.id}")
+            return JSONResponse({"detail": "MFA verification required"}, status_code=403)
+
+        return None
@@ -0,0 +1,33 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class RequestLoggingMiddleware:
+    """ Pure ASGI middleware logging one line per request: method, path, status and time to headers. """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                duration_ms = round((time.perf_counter() - started) * 1000, 1)
+                route = getattr(scope.get("route"), "path", scope["path"])
+                logger.info(
+                    "%s %s %s %.1fms", scope["method"], scope["path"], message["status"], duration_ms,
+                    extra={"route": route, "status": message["status"], "duration_ms": duration_ms},
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from starlette.routing import BaseRoute
+
+from backend.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    """ What the auth middleware must check before a request reaches its route. """
+    session: bool = True
+    mfa: bool = True
+    superuser: bool = False
+
+
+PUBLIC = RoutePolicy(session=False, mfa=False)
+SESSION_ONLY = RoutePolicy(session=True, mfa=False)
+AUTHENTICATED = RoutePolicy(session=True, mfa=True)
+SUPERUSER = RoutePolicy(session=False, mfa=False, superuser=True)
+
+# Routes that declare nothing fall back to these.
+DEFAULT_API_POLICY = AUTHENTICATED
+NON_API_POLICY = PUBLIC
+
+POLICY_ATTRIBUTE = "__route_policy__"
+
+
+### **Route Declarations**
+def _declare(policy: RoutePolicy):
+    def decorator(endpoint):
+        setattr(endpoint, POLICY_ATTRIBUTE, policy)
+        return endpoint
+    return decorator
+
+
+# Place these below the router decorator, e.g. ``@router.post(...)`` then ``@public``.
+public = _declare(PUBLIC)
+mfa_exempt = _declare(SESSION_ONLY)
+superuser_only = _declare(SUPERUSER)
+
+
+### **Compiled Registry**
+class _Node:
+    __slots__ = ("children", "param", "catch_all", "policies")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        self.catch_all: Optional[Dict[str, RoutePolicy]] = None
+        self.policies: Optional[Dict[str, RoutePolicy]] = None
+
+
+def _segments(path: str) -> Tuple[str, ...]:
+    stripped = path.strip("/")
+    return tuple(stripped.split("/")) if stripped else ()
+
+
+class RoutePolicyRegistry:
+    """
+    Per-route auth policies compiled once from the application's route table.
+
+    Literal paths are looked up in a dict. Paths with parameters are matched
+    segment by segment in a trie, so lookup cost depends only on path length.
+    """
+
+    def __init__(self):
+        self._static: Dict[Tuple[str, Tuple[str, ...]], RoutePolicy] = {}
+        self._root = _Node()
+
+    def compile(self, routes: Iterable[BaseRoute]) -> None:
+        static: Dict[Tuple[str, Tuple[str, ...]], RoutePolicy] = {}
+        root = _Node()
+        count = 0
+
+        for route in routes:
+            endpoint = getattr(route, "endpoint", None)
+            methods = getattr(route, "methods", None)
+            path = getattr(route, "path", None)
+            if endpoint is None or not methods or path is None:
+                continue
+
+            default = DEFAULT_API_POLICY if path.startswith("/api/") else NON_API_POLICY
+            policy = getattr(endpoint, POLICY_ATTRIBUTE, default)
+            segments = _segments(path)
+
+            if not any(segment.startswith("{") for segment in segments):
+                for method in methods:
+                    static[(method, segments)] = policy
+            else:
+                self._insert(root, segments, methods, policy)
+            count += 1
+
+        self._static, self._root = static, root
+        logger.info("Compiled auth policies for %s routes.", count)
+
+    @staticmethod
+    def _insert(root: _Node, segments, methods, policy: RoutePolicy) -> None:
+        node = root
+        for segment in segments:
+            if segment.startswith("{") and segment.endswith(":path}"):
+                node.catch_all = node.catch_all or {}
+                node.catch_all.update({method: policy for method in methods})
+                return
+            if segment.startswith("{"):
+                node.param = node.param or _Node()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, _Node())
+        node.policies = node.policies or {}
+        node.policies.update({method: policy for method in methods})
+
+    def resolve(self, method: str, path: str) -> RoutePolicy:
+        """ Return the policy for a request, falling back to the path default. """
+        if method == "HEAD":
+            method = "GET"
+        segments = _segments(path)
+
+        policy = self._static.get((method, segments))
+        if policy is None:
+            policies = self._match(self._root, segments, 0)
+            policy = policies.get(method) if policies else None
+        if policy is None:
+            policy = DEFAULT_API_POLICY if path.startswith("/api/") else NON_API_POLICY
+        return policy
+
+    def _match(self, node: _Node, segments, index: int) -> Optional[Dict[str, RoutePolicy]]:
+        if index == len(segments):
+            return node.policies
+
+        child = node.children.get(segments[index])
+        if child is not None:
+            found = self._match(child, segments, index + 1)
+            if found:
+                return found
+        if node.param is not None:
+            found = self._match(node.param, segments, index + 1)
+            if found:
+                return found
+        return node.catch_all
+
+
+route_policies = RoutePolicyRegistry()
@@ -0,0 +1,62 @@
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.core.database import AsyncSessionLocal
+from backend.core.logging_config import get_logger
+from backend.core.unit_of_work import SCOPE_KEY, RequestUnitOfWork
+
+logger = get_logger(__name__)
+
+
+class UnitOfWorkMiddleware:
+    """
+    Pure ASGI middleware attaching a lazy, request-scoped DB session to the scope.
+
+    The auth middleware, ``get_current_user``, ``admin_required`` and route
+    handlers all receive the same session through ``get_async_db``. The
+    transaction is settled once, right before the response starts: committed
+    for status codes below 400 and rolled back otherwise. A failed commit is
+    reported as a 500 instead of the handler's response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        unit = RequestUnitOfWork(AsyncSessionLocal)
+        scope[SCOPE_KEY] = unit
+        settled = False
+        failed = False
+
+        async def send_wrapper(message: Message):
+            nonlocal settled, failed
+            if failed:
+                # The handler's response was replaced by the commit error.
+                return
+            if message["type"] == "http.response.start" and not settled:
+                settled = True
+                try:
+                    await unit.complete(success=message["status"] < 400)
+                except Exception as e:
+                    logger.error(f"Failed to commit request transaction: {str(e)}")
+                    error = JSONResponse({"detail": "Internal Server Error"}, status_code=500)
+                    await send({
+                        "type": "http.response.start",
+                        "status": error.status_code,
+                        "headers": error.raw_headers,
+                    })
+                    await send({"type": "http.response.body", "body": error.body})
+                    failed = True
+                    return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Covers handlers that raised before responding, and sessions
+            # reopened after the response started (streaming, background tasks).
+            await unit.complete(success=False)
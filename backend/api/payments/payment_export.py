@@ -0,0 +1,159 @@
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Callable, Iterable, Optional, Sequence
+
+from sqlalchemy import select
+
+from backend.core.config import settings
+from backend.core.database import async_engine
+from backend.core.logging_config import get_logger
+from backend.models.payment import Payment, PaymentPlatform, PaymentStatus
+
+logger = get_logger(__name__)
+
+EXPORT_FIELDS = (
+    "id",
+    "user_id",
+    "subscription_id",
+    "amount",
+    "currency",
+    "platform",
+    "status",
+    "stripe_payment_id",
+    "google_payment_id",
+    "apple_payment_id",
+    "timestamp",
+    "renewal_date",
+)
+
+### **Export Slots**
+class ExportSlots:
+    """
+    Per-worker cap on concurrent exports; each holds one pooled connection for its whole run.
+
+    A slot is taken without waiting, before the response is returned, so a
+    request over the cap is refused at once instead of queueing.
+    """
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._taken = 0
+
+    def try_acquire(self) -> Optional[Callable[[], None]]:
+        """ A release callback (safe to call more than once), or None when every slot is taken. """
+        if self._taken >= self._limit:
+            return None
+        self._taken += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._taken -= 1
+
+        return release
+
+
+export_slots = ExportSlots(settings.PAYMENT_EXPORT_MAX_CONCURRENT)
+
+
+def payment_export_query(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status: Optional[str] = None,
+    platform: Optional[str] = None,
+):
+    """
+    Plain column SELECT over ``payments`` (no ORM entities, no identity map), oldest first.
+
+    ``start`` is inclusive and ``end`` exclusive; ``status`` and ``platform`` are enum names.
+    """
+    payments = Payment.__table__
+    query = select(*(payments.c[field] for field in EXPORT_FIELDS)).order_by(payments.c.timestamp, payments.c.id)
+    if start is not None:
+        query = query.where(payments.c.timestamp >= start)
+    if end is not None:
+        query = query.where(payments.c.timestamp < end)
+    if status is not None:
+        query = query.where(payments.c.status == PaymentStatus[status])
+    if platform is not None:
+        query = query.where(payments.c.platform == PaymentPlatform[platform])
+    return query
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.name
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def render_rows(rows: Iterable[Sequence], export_format: str) -> str:
+    """ One batch of rows as CSV lines or NDJSON objects. """
+    if export_format == "ndjson":
+        return "".join(json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row)))) + "\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([["" if value is None else value for value in map(_plain, row)] for row in rows])
+    return buffer.getvalue()
+
+
+async def encode_chunks(chunks: AsyncIterator[str], compress: bool) -> AsyncIterator[bytes]:
+    """ UTF-8 encode, and gzip on the fly when asked; only one chunk is ever held in memory. """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None  # | 16: gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode()) if compressor else chunk.encode()
+        if data:
+            yield data
+    if compressor:
+        yield compressor.flush()
+
+
+async def _export_chunks(query, export_format: str, batch_size: int) -> AsyncIterator[str]:
+    if export_format == "csv":
+        yield render_rows([EXPORT_FIELDS], "csv")
+
+    # A dedicated connection: the request's unit of work settles before the body is sent
+    async with async_engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        async with conn.begin():
+            # Server-side cursor, fetched batch_size rows at a time
+            result = await conn.stream(query.execution_options(yield_per=batch_size))
+            exported = 0
+            async for rows in result.partitions():
+                exported += len(rows)
+                yield render_rows(rows, export_format)
+    logger.info("Exported %s payments as %s.", exported, export_format)
+
+
+async def stream_payment_export(
+    query,
+    export_format: str = "csv",
+    compress: bool = False,
+    batch_size: int = settings.PAYMENT_EXPORT_BATCH_SIZE,
+    release_slot: Optional[Callable[[], None]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Response body for a payment export, produced batch by batch from one consistent snapshot.
+
+    Memory stays flat whatever the row count. An error after the first byte
+    is logged and re-raised so the client sees a broken transfer rather than
+    a file that merely looks complete. ``release_slot`` frees the export
+    slot the route took, however the stream ends.
+    """
+    try:
+        async for data in encode_chunks(_export_chunks(query, export_format, batch_size), compress):
+            yield data
+    except Exception:
+        logger.exception("Payment export failed mid-stream")
+        raise
+    finally:
+        if release_slot is not None:
+            release_slot()
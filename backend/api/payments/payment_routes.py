@@ -1,9 +1,12 @@
 from datetime import datetime, timedelta
-import stripe
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.core.database import get_db
+from backend.core.database import get_async_db
 from backend.api.auth.auth_service import get_current_user, admin_required
 from backend.models.payment import Payment
 from backend.schemas.payment_schema import (
@@ -14,6 +17,7 @@ from backend.schemas.payment_schema import (
     AdminPaymentHistory,
     PaymentPlatform,
     PaymentStatus,
+    ExportFormat,
 )
 from backend.models.user import User
 from backend.models.subscription_tier import SubscriptionTier
@@ -26,7 +30,10 @@ from backend.api.payments.payment_service import (
     create_stripe_payment,
     subscribe_to_free_tier,
 )
+from backend.api.payments.payment_export import export_slots, payment_export_query, stream_payment_export
 from backend.core.logging_config import get_logger
+from backend.core.responses import ModelResponse
+from backend.api.middlewares.route_policy import mfa_exempt
 
 # Logger setup
 logger = get_logger(__name__)
@@ -36,19 +43,20 @@ router = APIRouter()
 
 
 @router.post("/create", response_model=dict)
-def create_payment_route(
+@mfa_exempt
+async def create_payment_route(
         subscription_tier: str = Query(..., description="The subscription tier to purchase"),
         current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create a Stripe payment session for the selected subscription tier.
     """
     try:
-        logger.info(f"User {current_user.id} initiating a payment for subscription tier: {subscription_tier}")
+        logger.info("User %s initiating a payment for subscription tier: %s", current_user.id, subscription_tier)
 
         # Fetch subscription tier
-        tier = db.query(SubscriptionTier).filter_by(id=subscription_tier, is_active=True).first()
+        tier = await db.scalar(select(SubscriptionTier).filter_by(id=subscription_tier, is_active=True))
         if not tier:
             logger.error(f"Invalid or inactive subscription tier: {subscription_tier}")
             raise HTTPException(status_code=400, detail="Invalid subscription tier selected.")
@@ -59,7 +67,7 @@ def create_payment_route(
             raise HTTPException(status_code=400, detail="You are already subscribed to a plan.")
 
         # Create Stripe session
-        payment_session = create_stripe_payment(current_user, tier.id, db)
+        payment_session = await create_stripe_payment(current_user, tier.id, db)
 
         # Record payment in the database
         payment_data = PaymentCreate(
@@ -70,14 +78,14 @@ def create_payment_route(
             subscription_tier_id=tier.id,
             stripe_payment_id=payment_session["session_id"],
         )
-        logger.debug(f"Payment Data {payment_data}")
-        create_payment(db, payment_data, current_user.id)
+        logger.debug("Payment Data %s", payment_data)
+        await create_payment(db, payment_data, current_user.id)
 
         # Increment profile version
         current_user.profile_version += 1
-        db.commit()
+        await db.commit()
 
-        logger.info(f"Stripe session created: {payment_session['session_id']} for user {current_user.id}")
+        logger.info("Stripe session created: %s for user %s", payment_session['session_id'], current_user.id)
         return {"url": payment_session["url"]}
 
     except Exception as e:
@@ -86,18 +94,19 @@ def create_payment_route(
 
 
 @router.post("/verify", response_model=PaymentOut)
-def verify_payment_status(
+@mfa_exempt
+async def verify_payment_status(
         payment_data: PaymentVerify,
         current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
 ):
     """
     Verify the status of a payment with the platform (e.g., Stripe, Google, Apple).
     """
     try:
-        logger.info(f"User {current_user.id} verifying payment ID: {payment_data.payment_id}")
-        payment = verify_payment(db, payment_data, current_user.id)
-        logger.info(f"Payment verified: {payment.id}, Status: {payment.status}")
+        logger.info("User %s verifying payment ID: %s", current_user.id, payment_data.payment_id)
+        payment = await verify_payment(db, payment_data, current_user.id)
+        logger.info("Payment verified: %s, Status: %s", payment.id, payment.status)
         return payment
 
     except Exception as e:
@@ -106,58 +115,102 @@ def verify_payment_status(
 
 
 @router.get("/history", response_model=PaymentHistory)
-def get_user_payment_history(
-        page: int = Query(1, ge=1),
+async def get_user_payment_history(
+        cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
         page_size: int = Query(10, ge=1, le=100),
+        include_total: bool = Query(False, description="Also return the total number of payments"),
         current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Retrieve the payment history of the current user.
+    Retrieve the payment history of the current user, newest first, one cursor page at a time.
     """
     try:
-        logger.info(f"Fetching payment history for user {current_user.id}")
-        payments = get_user_payments(current_user.id, page, page_size, db)
-        logger.info(f"Fetched {len(payments.payments)} payments for user {current_user.id}")
-        return payments
+        logger.info("Fetching payment history for user %s", current_user.id)
+        payments = await get_user_payments(current_user.id, page_size, db, cursor, include_total)
+        logger.info("Fetched %s payments for user %s", len(payments.payments), current_user.id)
+        return ModelResponse(PaymentHistory, payments)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching payment history for user {current_user.id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch payment history.")
 
 
 @router.get("/admin/history", response_model=AdminPaymentHistory, dependencies=[Depends(admin_required)])
-def get_all_payment_history(
-        page: int = Query(1, ge=1),
+async def get_all_payment_history(
+        cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
         page_size: int = Query(10, ge=1, le=100),
-        db: Session = Depends(get_db),
+        include_total: bool = Query(False, description="Also return an estimated total (from planner statistics)"),
+        db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Retrieve payment history for all users (admin-only).
+    Retrieve payment history for all users (admin-only), newest first, one cursor page at a time.
     """
     try:
         logger.info("Admin fetching payment history for all users.")
-        payments = get_all_payments(page, page_size, db)
-        logger.info(f"Fetched {len(payments.payments)} payments for admin view.")
-        return payments
+        payments = await get_all_payments(page_size, db, cursor, include_total)
+        logger.info("Fetched %s payments for admin view.", len(payments.payments))
+        return ModelResponse(AdminPaymentHistory, payments)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching all payment history: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch payment history.")
 
 
+@router.get("/admin/export", dependencies=[Depends(admin_required)])
+async def export_payment_history(
+        export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+        start: Optional[datetime] = Query(None, description="Only payments at or after this time (UTC)"),
+        end: Optional[datetime] = Query(None, description="Only payments before this time (UTC)"),
+        status: Optional[PaymentStatus] = Query(None),
+        platform: Optional[PaymentPlatform] = Query(None),
+        gzip: bool = Query(False, description="Compress the file with gzip"),
+):
+    """
+    Stream every matching payment as CSV or NDJSON, oldest first (admin-only).
+    """
+    if start and end and start >= end:
+        raise HTTPException(status_code=400, detail="`start` must be before `end`.")
+    query = payment_export_query(
+        start, end, status.value if status else None, platform.value if platform else None
+    )
+    extension = "csv" if export_format == ExportFormat.CSV else "ndjson"
+    media_type = "text/csv; charset=utf-8" if export_format == ExportFormat.CSV else "application/x-ndjson"
+    filename = f"payments-{datetime.utcnow():%Y%m%dT%H%M%SZ}.{extension}"
+    if gzip:
+        media_type, filename = "application/gzip", filename + ".gz"
+
+    # Taken now, not when the body starts, so concurrent requests over the cap get 429 rather than queueing
+    release_slot = export_slots.try_acquire()
+    if release_slot is None:
+        raise HTTPException(status_code=429, detail="Too many exports in progress. Please try again shortly.")
+
+    logger.info("Admin exporting payments as %s (gzip=%s).", extension, gzip)
+    return StreamingResponse(
+        stream_payment_export(query, export_format.value, gzip, release_slot=release_slot),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        # Also frees the slot if the client disconnects before the body starts
+        background=BackgroundTask(release_slot),
+    )
+
+
 @router.post("/refund", response_model=PaymentOut, dependencies=[Depends(admin_required)])
-def refund_user_payment(
+async def refund_user_payment(
         payment_id: str,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
 ):
     """
     Refund a payment (admin-only).
     """
     try:
-        logger.info(f"Admin refunding payment ID: {payment_id}")
-        payment = refund_payment(payment_id, db)
-        logger.info(f"Payment refunded: {payment.id}")
+        logger.info("Admin refunding payment ID: %s", payment_id)
+        payment = await refund_payment(payment_id, db)
+        logger.info("Payment refunded: %s", payment.id)
         return payment
 
     except Exception as e:
@@ -1,12 +1,15 @@
 import uuid
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-import stripe
+from starlette.concurrency import run_in_threadpool
+from backend.core.service_registry import stripe
 
 from backend.core.logging_config import get_logger
+from backend.core.pagination import decode_cursor, encode_cursor, estimated_row_count, parse_utc_timestamp
 from backend.models.subscription_tier import SubscriptionTier
 from backend.models.payment import Payment, PaymentPlatform, PaymentStatus
 from backend.models.user import User
@@ -15,20 +18,18 @@ from backend.core.config import settings
 
 logger = get_logger(__name__)
 
-# Initialize Stripe API
-stripe.api_key = settings.STRIPE_SECRET_KEY
 
-
-def create_stripe_payment(user: User, subscription_tier_id: str, db: Session) -> dict:
+async def create_stripe_payment(user: User, subscription_tier_id: str, db: AsyncSession) -> dict:
     """Creates a Stripe Checkout session for a user based on subscription tier ID."""
     try:
-        logger.info(f"Creating Stripe payment for user {user.id}, subscription tier ID: {subscription_tier_id}")
+        logger.info("Creating Stripe payment for user %s, subscription tier ID: %s", user.id, subscription_tier_id)
 
-        tier = db.query(SubscriptionTier).filter_by(id=subscription_tier_id, is_active=True).first()
+        tier = await db.scalar(select(SubscriptionTier).filter_by(id=subscription_tier_id, is_active=True))
         if not tier:
             raise HTTPException(status_code=400, detail="Invalid subscription tier selected.")
 
-        stripe_session = stripe.checkout.Session.create(
+        stripe_session = await run_in_threadpool(
+            stripe.checkout.Session.create,
             payment_method_types=["card"],
             line_items=[{
                 "price_data": {
@@ -45,7 +46,7 @@ def create_stripe_payment(user: User, subscription_tier_id: str, db: Session) ->
             metadata={"user_id": str(user.id), "tier_id": str(tier.id)}
         )
 
-        logger.info(f"Stripe session created: {stripe_session.id} for user {user.id}")
+        logger.info("Stripe session created: %s for user %s", stripe_session.id, user.id)
         return {"session_id": stripe_session.id, "url": stripe_session.url}
 
     except stripe.error.StripeError as e:
@@ -56,27 +57,27 @@ def create_stripe_payment(user: User, subscription_tier_id: str, db: Session) ->
         raise HTTPException(status_code=500, detail="An error occurred while creating the payment session.")
 
 
-def subscribe_to_free_tier(user: User, db: Session):
+async def subscribe_to_free_tier(user: User, db: AsyncSession):
     """Subscribes a user to the Free tier and updates their setup step to completed."""
     try:
-        logger.info(f"Subscribing user {user.id} to Free tier")
+        logger.info("Subscribing user %s to Free tier", user.id)
 
         user.subscription_plan = "Free"
         user.setup_step = "completed"
         user.profile_version += 1
-        db.commit()
+        await db.commit()
 
-        logger.info(f"User {user.id} successfully subscribed to Free tier")
+        logger.info("User %s successfully subscribed to Free tier", user.id)
     except SQLAlchemyError as e:
         logger.error(f"Database error subscribing user {user.id} to Free tier: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to subscribe to Free tier.")
 
 
-def create_payment(db: Session, payment_data: PaymentCreate, user_id: uuid.UUID) -> Payment:
+async def create_payment(db: AsyncSession, payment_data: PaymentCreate, user_id: uuid.UUID) -> Payment:
     """Creates a new payment record in the database."""
     try:
-        logger.info(f"Creating payment for user ID: {user_id} with data: {payment_data}")
+        logger.info("Creating payment for user ID: %s with data: %s", user_id, payment_data)
 
         new_payment = Payment(
             id=uuid.uuid4(),
@@ -92,50 +93,50 @@ def create_payment(db: Session, payment_data: PaymentCreate, user_id: uuid.UUID)
         )
 
         db.add(new_payment)
-        db.commit()
-        db.refresh(new_payment)
+        await db.commit()
+        await db.refresh(new_payment)
 
         # Update profile version
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         user.profile_version += 1
-        db.commit()
+        await db.commit()
 
-        logger.info(f"Payment created successfully: {new_payment.id}")
+        logger.info("Payment created successfully: %s", new_payment.id)
         return new_payment
     except SQLAlchemyError as e:
         logger.error(f"Failed to create payment for user ID: {user_id}: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create payment record.")
 
 
-def verify_payment(db: Session, payment_verify: PaymentVerify, user_id: uuid.UUID) -> Payment:
+async def verify_payment(db: AsyncSession, payment_verify: PaymentVerify, user_id: uuid.UUID) -> Payment:
     """Verify the status of a payment and update user's subscription if successful."""
     try:
-        logger.info(f"Verifying payment for user ID: {user_id} with data: {payment_verify}")
+        logger.info("Verifying payment for user ID: %s with data: %s", user_id, payment_verify)
 
-        payment = db.query(Payment).filter(Payment.id == payment_verify.payment_id).first()
+        payment = await db.get(Payment, payment_verify.payment_id)
         if not payment:
             raise HTTPException(status_code=404, detail="Payment record not found.")
 
         if payment.platform == PaymentPlatform.STRIPE:
-            stripe_payment = stripe.PaymentIntent.retrieve(payment_verify.payment_id)
+            stripe_payment = await run_in_threadpool(stripe.PaymentIntent.retrieve, payment_verify.payment_id)
             payment.status = (
                 PaymentStatus.SUCCESS if stripe_payment["status"] == "succeeded" else PaymentStatus.FAILED
             )
 
-        db.commit()
-        db.refresh(payment)
+        await db.commit()
+        await db.refresh(payment)
 
         if payment.status == PaymentStatus.SUCCESS:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = await db.get(User, user_id)
             if not user:
                 raise HTTPException(status_code=404, detail="User not found.")
 
             user.setup_step = "completed"
             user.profile_version += 1
-            db.commit()
+            await db.commit()
 
-            logger.info(f"User {user_id}'s setup_step updated to 'completed'")
+            logger.info("User %s's setup_step updated to 'completed'", user_id)
 
         return payment
     except stripe.error.StripeError as e:
@@ -149,46 +150,61 @@ def verify_payment(db: Session, payment_verify: PaymentVerify, user_id: uuid.UUI
         raise HTTPException(status_code=500, detail="Payment verification failed.")
 
 
-def get_user_payments(user_id: uuid.UUID, page: int, page_size: int, db: Session) -> PaymentHistory:
-    """Fetch paginated payment history for a user."""
+async def _payment_page(query, page_size: int, cursor: Optional[str], db: AsyncSession):
+    """
+    One keyset page of ``query``, newest first, and the cursor for the next page.
+
+    Seeks past the cursor's ``(timestamp, id)`` on the composite index, so
+    every page costs the same as the first.
+    """
+    if cursor:
+        try:
+            timestamp, payment_id = decode_cursor(cursor, parse_utc_timestamp, uuid.UUID)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+        query = query.where(tuple_(Payment.timestamp, Payment.id) < tuple_(timestamp, payment_id))
+
+    payments = (await db.scalars(
+        query.order_by(Payment.timestamp.desc(), Payment.id.desc()).limit(page_size + 1)
+    )).all()
+    if len(payments) <= page_size:
+        return payments, None
+    last = payments[page_size - 1]
+    return payments[:page_size], encode_cursor(last.timestamp, last.id)
+
+
+async def get_user_payments(
+    user_id: uuid.UUID, page_size: int, db: AsyncSession, cursor: Optional[str] = None, include_total: bool = False
+) -> PaymentHistory:
+    """Fetch one keyset page of a user's payment history."""
     try:
-        logger.info(f"Fetching payment history for user ID: {user_id}")
-
-        payments_query = db.query(Payment).filter(Payment.user_id == user_id)
-        total_payments = payments_query.count()
-        payments = (
-            payments_query.order_by(Payment.timestamp.desc())
-            .offset((page - 1) * page_size)
-            .limit(page_size)
-            .all()
-        )
+        logger.info("Fetching payment history for user ID: %s", user_id)
 
-        return PaymentHistory(
-            total=total_payments,
-            payments=payments
-        )
+        payments, next_cursor = await _payment_page(select(Payment).where(Payment.user_id == user_id), page_size, cursor, db)
+        total = None
+        if include_total:
+            # Index-only count on (user_id, timestamp, id)
+            total = await db.scalar(select(func.count()).select_from(Payment).where(Payment.user_id == user_id))
+
+        return PaymentHistory(payments=payments, next_cursor=next_cursor, total=total)
     except SQLAlchemyError as e:
         logger.error(f"Error fetching payments for user {user_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Error fetching payment history.")
 
 
-def get_all_payments(page: int, page_size: int, db: Session) -> AdminPaymentHistory:
-    """Fetch paginated payment history for all users (admin-only)."""
+async def get_all_payments(
+    page_size: int, db: AsyncSession, cursor: Optional[str] = None, include_total: bool = False
+) -> AdminPaymentHistory:
+    """Fetch one keyset page of payment history for all users (admin-only)."""
     try:
         logger.info("Fetching all payment history for admin.")
 
-        payments_query = db.query(Payment)
-        total_payments = payments_query.count()
-        payments = (
-            payments_query.order_by(Payment.timestamp.desc())
-            .offset((page - 1) * page_size)
-            .limit(page_size)
-            .all()
-        )
+        payments, next_cursor = await _payment_page(select(Payment), page_size, cursor, db)
+        # An exact count scans the whole table; the planner's estimate is free
+        total = await estimated_row_count(db, Payment.__tablename__) if include_total else None
 
         return AdminPaymentHistory(
-            total=total_payments,
-            payments=payments
+            payments=payments, next_cursor=next_cursor, total=total, total_is_estimate=total is not None
         )
     except SQLAlchemyError as e:
         logger.error(f"Error fetching all payments: {str(e)}")
@@ -1,15 +1,13 @@
 from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Request, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from backend.core.logging_config import get_logger
 from backend.core.config import settings
 from backend.models.payment import Payment, PaymentStatus
 from backend.models.user import User
-from backend.core.database import get_db
-import stripe
-
-# Initialize Stripe
-stripe.api_key = settings.STRIPE_SECRET_KEY
+from backend.core.database import get_async_db
+from backend.core.service_registry import stripe
 
 # Logger setup
 logger = get_logger(__name__)
@@ -18,7 +16,7 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 @router.post("/", response_model=None)
-async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
+async def stripe_webhook(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Stripe webhook handler to process events sent by Stripe.
     """
@@ -43,7 +41,7 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
     # Log the event type and ID
     event_id = event.get("id", "unknown")
     event_type = event.get("type", "unknown")
-    logger.info(f"Received Stripe event: {event_type} (ID: {event_id})")
+    logger.info("Received Stripe event: %s (ID: %s)", event_type, event_id)
 
     event_data = event.get("data", {}).get("object", {})
     if not event_data:
@@ -52,17 +50,17 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
 
     try:
         if event_type == "checkout.session.completed":
-            handle_checkout_session_completed(event_data, db)
+            await handle_checkout_session_completed(event_data, db)
         elif event_type == "invoice.payment_succeeded":
-            handle_payment_success(event_data, db)
+            await handle_payment_success(event_data, db)
         elif event_type == "invoice.payment_failed":
-            handle_payment_failure(event_data, db)
+            await handle_payment_failure(event_data, db)
         elif event_type == "checkout.session.expired":
-            handle_checkout_session_expired(event_data, db)
+            await handle_checkout_session_expired(event_data, db)
         elif event_type == "customer.subscription.updated":
-            handle_subscription_updated(event_data, db)
+            await handle_subscription_updated(event_data, db)
         elif event_type == "customer.subscription.deleted":
-            handle_subscription_deleted(event_data, db)
+            await handle_subscription_deleted(event_data, db)
         else:
             logger.warning(f"Unhandled event type: {event_type}")
     except Exception as e:
@@ -73,80 +71,80 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
 
 
 # Event Handlers
-def handle_checkout_session_completed(session, db: Session):
+async def handle_checkout_session_completed(session, db: AsyncSession):
     stripe_payment_id = session.get("id")
     customer_email = session.get("customer_email")
-    logger.info(f"Checkout session completed for {stripe_payment_id}")
+    logger.info("Checkout session completed for %s", stripe_payment_id)
 
-    user = db.query(User).filter(User.email == customer_email).first()
+    user = await db.scalar(select(User).where(User.email == customer_email))
     if not user:
         logger.error(f"No user found with email {customer_email}")
         return
 
-    payment = db.query(Payment).filter(Payment.stripe_payment_id == stripe_payment_id).first()
+    payment = await db.scalar(select(Payment).where(Payment.stripe_payment_id == stripe_payment_id))
     if payment:
         if payment.status == PaymentStatus.SUCCESS:
-            logger.info(f"Payment {payment.id} already processed successfully.")
+            logger.info("Payment %s already processed successfully.", payment.id)
             return
 
         payment.status = PaymentStatus.SUCCESS
         payment.renewal_date = datetime.utcnow() + timedelta(days=30)
         user.subscription_plan = payment.subscription_tier.name
-        db.commit()
-        logger.info(f"Recovered and updated payment record for user {user.id}.")
+        await db.commit()
+        logger.info("Recovered and updated payment record for user %s.", user.id)
     else:
         logger.warning(f"No payment record found for Stripe session ID {stripe_payment_id}.")
 
-def handle_payment_success(invoice, db: Session):
+async def handle_payment_success(invoice, db: AsyncSession):
     stripe_subscription_id = invoice.get("subscription")
-    logger.info(f"Payment succeeded for subscription {stripe_subscription_id}")
+    logger.info("Payment succeeded for subscription %s", stripe_subscription_id)
 
-    payment = db.query(Payment).filter(Payment.stripe_subscription_id == stripe_subscription_id).first()
+    payment = await db.scalar(select(Payment).where(Payment.stripe_subscription_id == stripe_subscription_id))
     if payment:
         payment.status = PaymentStatus.SUCCESS
         payment.renewal_date = datetime.utcnow() + timedelta(days=30)
-        db.commit()
-        logger.info(f"Subscription renewed for payment ID {payment.id}")
+        await db.commit()
+        logger.info("Subscription renewed for payment ID %s", payment.id)
 
 
-def handle_payment_failure(invoice, db: Session):
+async def handle_payment_failure(invoice, db: AsyncSession):
     stripe_subscription_id = invoice.get("subscription")
     logger.warning(f"Payment failed for subscription {stripe_subscription_id}")
 
-    payment = db.query(Payment).filter(Payment.stripe_subscription_id == stripe_subscription_id).first()
+    payment = await db.scalar(select(Payment).where(Payment.stripe_subscription_id == stripe_subscription_id))
     if payment:
         payment.status = PaymentStatus.FAILED
-        db.commit()
+        await db.commit()
         logger.warning(f"Payment marked as failed for payment ID {payment.id}")
 
-def handle_checkout_session_expired(session, db: Session):
+async def handle_checkout_session_expired(session, db: AsyncSession):
     stripe_payment_id = session.get("id")
-    logger.info(f"Checkout session expired for {stripe_payment_id}")
+    logger.info("Checkout session expired for %s", stripe_payment_id)
 
-    payment = db.query(Payment).filter(Payment.stripe_payment_id == stripe_payment_id).first()
+    payment = await db.scalar(select(Payment).where(Payment.stripe_payment_id == stripe_payment_id))
     if payment:
         payment.status = PaymentStatus.FAILED
-        db.commit()
-        logger.info(f"Expired payment marked as FAILED for payment ID {payment.id}")
+        await db.commit()
+        logger.info("Expired payment marked as FAILED for payment ID %s", payment.id)
 
-def handle_subscription_updated(subscription, db: Session):
+async def handle_subscription_updated(subscription, db: AsyncSession):
     stripe_subscription_id = subscription.get("id")
     status = subscription.get("status")
-    logger.info(f"Subscription updated: {stripe_subscription_id}, status: {status}")
+    logger.info("Subscription updated: %s, status: %s", stripe_subscription_id, status)
 
-    payment = db.query(Payment).filter(Payment.stripe_subscription_id == stripe_subscription_id).first()
+    payment = await db.scalar(select(Payment).where(Payment.stripe_subscription_id == stripe_subscription_id))
     if payment:
         payment.status = PaymentStatus.SUCCESS if status == "active" else PaymentStatus.FAILED
         payment.renewal_date = datetime.utcnow() + timedelta(days=30) if status == "active" else None
-        db.commit()
-        logger.info(f"Subscription updated in database for payment ID {payment.id}")
+        await db.commit()
+        logger.info("Subscription updated in database for payment ID %s", payment.id)
 
-def handle_subscription_deleted(subscription, db: Session):
+async def handle_subscription_deleted(subscription, db: AsyncSession):
     stripe_subscription_id = subscription.get("id")
     logger.warning(f"Subscription deleted: {stripe_subscription_id}")
 
-    payment = db.query(Payment).filter(Payment.stripe_subscription_id == stripe_subscription_id).first()
+    payment = await db.scalar(select(Payment).where(Payment.stripe_subscription_id == stripe_subscription_id))
     if payment:
         payment.status = PaymentStatus.CANCELLED
-        db.commit()
+        await db.commit()
         logger.warning(f"Subscription cancelled for payment ID {payment.id}")
@@ -1,8 +1,10 @@
-import stripe
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from backend.core.database import get_db
+from backend.core.database import get_async_db
+from backend.core.service_registry import stripe
 from backend.api.auth.auth_service import get_current_user
 from backend.models import Payment, SubscriptionTier
 from backend.models.user import User
@@ -21,9 +23,6 @@ from backend.services.session_service import fetch_user_sessions
 from backend.api.subscriptions.subscription_service import update_user_subscription, cancel_user_subscription
 from backend.schemas.session_schema import UserSession
 
-# Initialize Stripe API
-stripe.api_key = "your-stripe-secret-key"
-
 # Logger setup
 logger = get_logger(__name__)
 
@@ -33,7 +32,7 @@ router = APIRouter(prefix="/api/settings", tags=["Settings"])
 ### **Notification Settings**
 @router.get("/notifications", response_model=NotificationPreferences)
 async def get_notification_preferences(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)
 ):
     """ Fetch the current user's notification preferences. """
     return {
@@ -45,12 +44,12 @@ async def get_notification_preferences(
 async def update_notification_preferences(
     preferences: NotificationPreferences,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """ Update the user's notification preferences. """
     current_user.email_notifications = preferences.email_notifications
     current_user.push_notifications = preferences.push_notifications
-    db.commit()
+    await db.commit()
     return {"message": "Notification preferences updated successfully."}
 
 ### **Profile Settings**
@@ -58,12 +57,12 @@ async def update_notification_preferences(
 async def update_profile(
     profile_data: UserProfileUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """ Update the user's profile information. """
     for key, value in profile_data.dict(exclude_unset=True).items():
         setattr(current_user, key, value)
-    db.commit()
+    await db.commit()
     return {"message": "Profile updated successfully."}
 
 ### **Privacy Settings**
@@ -71,12 +70,12 @@ async def update_profile(
 async def update_privacy_settings(
     privacy_data: PrivacySettings,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """ Update the user's privacy settings. """
     for key, value in privacy_data.dict(exclude_unset=True).items():
         setattr(current_user, key, value)
-    db.commit()
+    await db.commit()
     return {"message": "Privacy settings updated successfully."}
 
 ### **Security Settings**
@@ -84,12 +83,12 @@ async def update_privacy_settings(
 async def update_security_settings(
     security_data: SecuritySettings,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """ Update the user's security settings. """
     for key, value in security_data.dict(exclude_unset=True).items():
         setattr(current_user, key, value)
-    db.commit()
+    await db.commit()
     return {"message": "Security settings updated successfully."}
 
 ### **Theme & UI Preferences**
@@ -97,12 +96,12 @@ async def update_security_settings(
 async def update_theme_settings(
     theme_data: ThemePreferences,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """ Update theme settings for dark mode, font size, etc. """
     for key, value in theme_data.dict(exclude_unset=True).items():
         setattr(current_user, key, value)
-    db.commit()
+    await db.commit()
     return {"message": "Theme settings updated successfully."}
 
 ### **Third-Party Account Connections**
@@ -110,12 +109,12 @@ async def update_theme_settings(
 async def update_third_party_accounts(
     account_data: ThirdPartyAccounts,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """ Update the user's connected third-party accounts. """
     for key, value in account_data.dict(exclude_unset=True).items():
         setattr(current_user, key, value)
-    db.commit()
+    await db.commit()
     return {"message": "Third-party accounts updated successfully."}
 
 ### **Subscription Management**
@@ -123,18 +122,19 @@ async def update_third_party_accounts(
 async def update_subscription(
     subscription_data: UpdateSubscription,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """ Update a user's subscription via Stripe. """
-    current_subscription = stripe.Subscription.retrieve(current_user.stripe_subscription_id)
+    current_subscription = await run_in_threadpool(stripe.Subscription.retrieve, current_user.stripe_subscription_id)
     new_plan_id = subscription_data.new_plan_id
 
     # Fetch new plan
-    new_plan = db.query(SubscriptionTier).filter_by(id=new_plan_id, is_active=True).first()
+    new_plan = await db.scalar(select(SubscriptionTier).filter_by(id=new_plan_id, is_active=True))
     if not new_plan:
         raise HTTPException(status_code=400, detail="Invalid subscription plan.")
 
-    stripe.Subscription.modify(
+    await run_in_threadpool(
+        stripe.Subscription.modify,
         current_subscription["id"],
         cancel_at_period_end=False,
         proration_behavior="create_prorations",
@@ -143,7 +143,7 @@ async def update_subscription(
 
     current_user.subscription_plan = new_plan.name
     current_user.subscription_price = new_plan.price
-    db.commit()
+    await db.commit()
     return {"message": "Subscription updated successfully."}
 
 ### **Refund Management**
@@ -151,14 +151,14 @@ async def update_subscription(
 async def request_refund(
     refund_request: RefundRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """ Process a refund via Stripe. """
-    payment = db.query(Payment).filter(Payment.id == refund_request.payment_id).first()
+    payment = await db.get(Payment, refund_request.payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment record not found.")
 
-    stripe.Refund.create(payment_intent=payment.stripe_payment_id)
+    await run_in_threadpool(stripe.Refund.create, payment_intent=payment.stripe_payment_id)
     payment.status = "REFUNDED"
-    db.commit()
+    await db.commit()
     return {"message": "Refund processed successfully."}
@@ -0,0 +1,174 @@
+import enum
+import functools
+import operator
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.auth.auth_service import get_current_session
+from backend.api.subscriptions.tier_catalog import TierCatalog, tier_catalog
+from backend.core.config import settings
+from backend.core.database import get_async_db
+from backend.core.logging_config import get_logger
+from backend.models.subscription_tier import SubscriptionTier
+from backend.models.user import User
+from backend.services.session_cache import session_cache
+
+logger = get_logger(__name__)
+
+DEFAULT_PLAN = "Free"
+UNLIMITED = -1  # A negative limit means no limit, as in the seeded tiers
+
+
+class Capability(enum.IntFlag):
+    """ One bit per boolean capability column on ``SubscriptionTier`` (same name, upper-cased). """
+    HAS_ADS = enum.auto()
+    ACCESS_REELS = enum.auto()
+    REELS_AD_FREE = enum.auto()
+    ACCESS_WORKOUTS = enum.auto()
+    WORKOUT_FILTERS = enum.auto()
+    ACCESS_COMMUNITY_READ = enum.auto()
+    ACCESS_COMMUNITY_POST = enum.auto()
+    PRIVATE_COMMUNITY_CHALLENGES = enum.auto()
+    ACCESS_NUTRITION = enum.auto()
+    CALORIE_TRACKING = enum.auto()
+    PERSONALIZED_NUTRITION = enum.auto()
+    DIRECT_MESSAGING = enum.auto()
+    BASIC_PROGRESS_TRACKING = enum.auto()
+    ENHANCED_PROGRESS_TRACKING = enum.auto()
+    ACCESS_LIVE_CLASSES = enum.auto()
+    ONE_ON_ONE_COACHING = enum.auto()
+    PRIORITY_SUPPORT = enum.auto()
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    """ A tier compiled to a capability bitset plus its usage limits. """
+    plan: str
+    capabilities: Capability = Capability(0)
+    max_reel_uploads: int = 0
+    max_saved_workouts: int = 0
+    max_messages_per_day: int = 0
+
+    def allows(self, required: Capability) -> bool:
+        return self.capabilities & required == required
+
+
+def compile_tier(tier: SubscriptionTier) -> Entitlements:
+    capabilities = Capability(0)
+    for capability in Capability:
+        if getattr(tier, capability.name.lower()):
+            capabilities |= capability
+    return Entitlements(
+        plan=tier.name,
+        capabilities=capabilities,
+        max_reel_uploads=tier.max_reel_uploads or 0,
+        max_saved_workouts=tier.max_saved_workouts or 0,
+        max_messages_per_day=tier.max_messages_per_day or 0,
+    )
+
+
+# The default plan has no subscription_tiers row (the seed creates Starter, Champion and
+# Olympian), so unless one is added it gets the free Starter tier's capabilities.
+FREE_ENTITLEMENTS = Entitlements(
+    plan=DEFAULT_PLAN,
+    capabilities=(
+        Capability.HAS_ADS
+        | Capability.ACCESS_REELS
+        | Capability.ACCESS_WORKOUTS
+        | Capability.ACCESS_COMMUNITY_READ
+        | Capability.BASIC_PROGRESS_TRACKING
+    ),
+    max_reel_uploads=UNLIMITED,
+    max_saved_workouts=UNLIMITED,
+    max_messages_per_day=UNLIMITED,
+)
+
+
+async def _load_tier(db: AsyncSession, plan: str) -> Optional[SubscriptionTier]:
+    return await db.scalar(select(SubscriptionTier).where(SubscriptionTier.name == plan))
+
+
+### **Entitlement Resolver**
+class EntitlementResolver:
+    """
+    Compiled entitlements per tier name, valid for one tier catalog version.
+
+    Any tier write bumps the catalog version (see ``TierCatalog.bump``), which
+    empties this cache; until then resolving a plan costs no query. Like the
+    catalog itself, compiled tiers are also rebuilt every ``ttl`` seconds, so
+    a bump that never reaches this worker (no Redis) is picked up anyway.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[AsyncSession, str], Awaitable[Optional[SubscriptionTier]]] = _load_tier,
+        catalog: TierCatalog = tier_catalog,
+        ttl: float = settings.TIER_CATALOG_TTL_SECONDS,
+    ):
+        self._loader = loader
+        self._catalog = catalog
+        self._ttl = ttl
+        self._compiled: Dict[str, Entitlements] = {}
+        self._version: Optional[int] = None
+        self._built_at = 0.0
+
+    async def resolve(self, db: AsyncSession, plan: str) -> Entitlements:
+        version = await self._catalog.version()
+        now = time.monotonic()
+        if version != self._version or now - self._built_at >= self._ttl:
+            self._compiled.clear()
+            self._version = version
+            self._built_at = now
+
+        entitlements = self._compiled.get(plan)
+        if entitlements is None:
+            tier = await self._loader(db, plan)
+            if tier is not None:
+                entitlements = compile_tier(tier)
+            elif plan == DEFAULT_PLAN:
+                entitlements = FREE_ENTITLEMENTS
+            else:
+                logger.warning("Unknown subscription plan %r; granting no capabilities.", plan)
+                entitlements = Entitlements(plan=plan)
+            self._compiled[plan] = entitlements
+        return entitlements
+
+
+entitlement_resolver = EntitlementResolver()
+
+
+async def get_entitlements(request: Request, db: AsyncSession = Depends(get_async_db)) -> Entitlements:
+    """ The current user's entitlements, resolved once per request and kept on ``request.state``. """
+    entitlements = getattr(request.state, "entitlements", None)
+    if entitlements is not None:
+        return entitlements
+
+    session = await get_current_session(request, db)
+    plan = await session_cache.get_subscription_plan(session.user_id)
+    if plan is None:
+        plan = await db.scalar(select(User.subscription_plan).where(User.id == session.user_id)) or DEFAULT_PLAN
+        await session_cache.set_subscription_plan(session.user_id, plan)
+
+    request.state.entitlements = entitlements = await entitlement_resolver.resolve(db, plan)
+    return entitlements
+
+
+def requires(*capabilities: Capability):
+    """
+    Dependency that rejects the request with 403 unless the user's tier has every capability.
+
+        @router.get("/reels", dependencies=[Depends(requires(Capability.ACCESS_REELS))])
+    """
+    required = functools.reduce(operator.or_, capabilities, Capability(0))
+
+    async def check_entitlements(entitlements: Entitlements = Depends(get_entitlements)) -> Entitlements:
+        if not entitlements.allows(required):
+            raise HTTPException(status_code=403, detail="Your subscription plan does not include this feature.")
+        return entitlements
+
+    return check_entitlements
@@ -0,0 +1,290 @@
+import calendar
+import enum
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.auth.auth_service import get_current_user
+from backend.api.subscriptions.entitlements import DEFAULT_PLAN, Entitlements, entitlement_resolver
+from backend.core.cache import TTLCache
+from backend.core.database import get_async_db
+from backend.core.logging_config import get_logger
+from backend.core.redis_client import get_async_redis
+from backend.models.private_messaging import Message
+from backend.models.reels import Reel
+from backend.models.user import User
+from backend.models.workout import workout_bookmarks
+
+logger = get_logger(__name__)
+
+REDIS_KEY_PREFIX = "quota:"
+
+
+class Window(str, enum.Enum):
+    """ Fixed accounting windows, in UTC. """
+    DAY = "day"
+    MONTH = "month"
+    LIFETIME = "lifetime"
+
+
+def window_bounds(window: Window, now: Optional[datetime] = None) -> Tuple[str, Optional[datetime], Optional[datetime]]:
+    """ ``(period id, window start, reset time)``; a lifetime window has neither start nor reset. """
+    now = now or datetime.utcnow()
+    if window == Window.DAY:
+        start = datetime(now.year, now.month, now.day)
+        return start.strftime("%Y%m%d"), start, start + timedelta(days=1)
+    if window == Window.MONTH:
+        start = datetime(now.year, now.month, 1)
+        days = calendar.monthrange(now.year, now.month)[1]
+        return start.strftime("%Y%m"), start, start + timedelta(days=days)
+    return "all", None, None
+
+
+@dataclass(frozen=True)
+class QuotaSpec:
+    name: str
+    limit_attr: str  # Limit field on Entitlements
+    window: Window
+    count: Callable  # (user_id, since) -> SELECT count(*) over the source table
+
+
+def _count_messages(user_id, since):
+    return select(func.count()).select_from(Message).where(Message.sender_id == user_id, Message.created_at >= since)
+
+
+def _count_reel_uploads(user_id, since):
+    return select(func.count()).select_from(Reel).where(Reel.author_id == user_id, Reel.created_at >= since)
+
+
+def _count_saved_workouts(user_id, since):
+    return select(func.count()).select_from(workout_bookmarks).where(workout_bookmarks.c.user_id == user_id)
+
+
+class Quota(enum.Enum):
+    MESSAGES = QuotaSpec("messages", "max_messages_per_day", Window.DAY, _count_messages)
+    REEL_UPLOADS = QuotaSpec("reel_uploads", "max_reel_uploads", Window.MONTH, _count_reel_uploads)
+    SAVED_WORKOUTS = QuotaSpec("saved_workouts", "max_saved_workouts", Window.LIFETIME, _count_saved_workouts)
+
+
+@dataclass(frozen=True)
+class QuotaUsage:
+    quota: Quota
+    limit: int
+    used: int
+    reset_at: Optional[datetime]
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.limit < 0 else max(0, self.limit - self.used)
+
+
+def counter_key(quota: Quota, period: str, user_id) -> str:
+    return f"{REDIS_KEY_PREFIX}{quota.value.name}:{period}:{user_id}"
+
+
+def active_users_key(quota: Quota, period: str) -> str:
+    """ Set of users with a live counter in ``period``; what reconciliation walks. """
+    return f"{REDIS_KEY_PREFIX}active:{quota.value.name}:{period}"
+
+
+def quota_headers(usage: QuotaUsage) -> Dict[str, str]:
+    prefix = f"X-Quota-{usage.quota.value.name.replace('_', '-').title()}"
+    if usage.remaining is None:
+        return {f"{prefix}-Limit": "unlimited"}
+    headers = {f"{prefix}-Limit": str(usage.limit), f"{prefix}-Remaining": str(usage.remaining)}
+    if usage.reset_at is not None:
+        headers[f"{prefix}-Reset"] = str(int(calendar.timegm(usage.reset_at.timetuple())))
+    return headers
+
+
+# Check-and-increment in one step: the counter never passes the limit, however
+# many workers race. Returns {allowed, used}; {-1, 0} asks the caller to seed a
+# missing counter first. Counters never go below zero.
+CONSUME_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw and ARGV[5] == '1' then
+    return {-1, 0}
+end
+local used = tonumber(raw or '0')
+local limit = tonumber(ARGV[1])
+local amount = tonumber(ARGV[2])
+if amount > 0 and limit >= 0 and used + amount > limit then
+    return {0, used}
+end
+used = redis.call('INCRBY', KEYS[1], amount)
+if used < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    used = 0
+end
+redis.call('SADD', KEYS[2], ARGV[4])
+local ttl = tonumber(ARGV[3])
+if ttl > 0 then
+    if redis.call('TTL', KEYS[1]) < 0 then redis.call('EXPIRE', KEYS[1], ttl) end
+    if redis.call('TTL', KEYS[2]) < 0 then redis.call('EXPIRE', KEYS[2], ttl) end
+end
+return {1, used}
+"""
+
+
+### **Quota Counter**
+class QuotaCounter:
+    """
+    Usage counters shared across workers through Redis.
+
+    Without Redis, or if Redis fails, the same logic runs in process on a
+    bounded TTL cache, so limits then hold per worker only.
+    """
+
+    def __init__(self, max_local_keys: int = 100000):
+        self._local = TTLCache(maxsize=max_local_keys, ttl=32 * 24 * 3600)
+        self._lock = threading.Lock()
+        self._script = None
+
+    async def consume(
+        self,
+        key: str,
+        active_key: str,
+        member: str,
+        limit: int,
+        amount: int,
+        ttl: int,
+        seed: Optional[Callable[[], Awaitable[int]]] = None,
+    ) -> Tuple[bool, int]:
+        """
+        Add ``amount`` unless that would pass ``limit``; return ``(allowed, used)``.
+
+        ``seed`` rebuilds a missing counter (e.g. a lifetime quota after Redis lost it) from Postgres.
+        """
+        client = get_async_redis()
+        if client is not None:
+            try:
+                if self._script is None:
+                    self._script = client.register_script(CONSUME_SCRIPT)
+                args = [limit, amount, ttl, member, int(seed is not None)]
+                allowed, used = await self._script(keys=[key, active_key], args=args)
+                if allowed == -1:
+                    await client.set(key, await seed(), ex=ttl or None, nx=True)
+                    allowed, used = await self._script(keys=[key, active_key], args=args[:-1] + [0])
+                return bool(allowed), int(used)
+            except Exception as e:
+                logger.warning(f"Redis quota counter failed, using in-process fallback: {e}")
+
+        if seed is not None and self._local.get(key) is None:
+            seeded = await seed()
+            with self._lock:
+                if self._local.get(key) is None:
+                    self._local.set(key, seeded, ttl=ttl or None)
+        return self._consume_local(key, limit, amount, ttl)
+
+    def _consume_local(self, key: str, limit: int, amount: int, ttl: int) -> Tuple[bool, int]:
+        with self._lock:
+            used = self._local.get(key) or 0
+            if amount > 0 and 0 <= limit < used + amount:
+                return False, used
+            used = max(0, used + amount)
+            self._local.set(key, used, ttl=ttl or None)
+            return True, used
+
+    def reset(self) -> None:
+        self._local.clear()
+
+
+quota_counter = QuotaCounter()
+
+
+async def consume_quota(
+    user: User,
+    quota: Quota,
+    db: AsyncSession,
+    amount: int = 1,
+    entitlements: Optional[Entitlements] = None,
+) -> QuotaUsage:
+    """
+    Count ``amount`` uses of ``quota`` against the user's tier limit.
+
+    Raises 429 (with the quota headers) when the limit would be exceeded.
+    A negative ``amount`` gives usage back, e.g. when a saved workout is removed.
+    """
+    spec = quota.value
+    if entitlements is None:
+        entitlements = await entitlement_resolver.resolve(db, user.subscription_plan or DEFAULT_PLAN)
+    limit = getattr(entitlements, spec.limit_attr)
+    period, since, reset_at = window_bounds(spec.window)
+    ttl = int((reset_at - datetime.utcnow()).total_seconds()) + 60 if reset_at else 0
+
+    async def seed() -> int:
+        return await db.scalar(spec.count(user.id, since)) or 0
+
+    allowed, used = await quota_counter.consume(
+        counter_key(quota, period, user.id),
+        active_users_key(quota, period),
+        str(user.id),
+        limit,
+        amount,
+        ttl,
+        seed=seed if spec.window == Window.LIFETIME else None,
+    )
+    usage = QuotaUsage(quota=quota, limit=limit, used=used, reset_at=reset_at)
+    if not allowed:
+        logger.info("Quota %s exhausted for user %s (%s/%s).", spec.name, user.id, used, limit)
+        raise HTTPException(
+            status_code=429,
+            detail=f"You have reached your plan's {spec.name.replace('_', ' ')} limit.",
+            headers=quota_headers(usage),
+        )
+    return usage
+
+
+def enforce_quota(quota: Quota, amount: int = 1):
+    """
+    Dependency that consumes ``amount`` of ``quota`` and reports what is left in response headers.
+
+        @router.post("/messages", dependencies=[Depends(enforce_quota(Quota.MESSAGES))])
+    """
+
+    async def consume(
+        response: Response,
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_async_db),
+    ) -> QuotaUsage:
+        usage = await consume_quota(current_user, quota, db, amount)
+        response.headers.update(quota_headers(usage))
+        return usage
+
+    return consume
+
+
+### **Reconciliation**
+def reconcile_quotas(db, client, now: Optional[datetime] = None) -> int:
+    """
+    Raise live counters that fell behind Postgres; return how many changed.
+
+    Counters are only ever moved up. A counter ahead of Postgres is normal:
+    a use is counted before its row commits, so lowering it to the count
+    would hand those in-flight uses back. Each raise is an INCRBY of
+    ``actual - counted`` rather than a SET, so uses consumed while the
+    count query ran are kept.
+    """
+    corrected = 0
+    for quota in Quota:
+        spec = quota.value
+        period, since, _ = window_bounds(spec.window, now)
+        active_key = active_users_key(quota, period)
+        for member in client.sscan_iter(active_key):
+            user_id = member.decode() if isinstance(member, bytes) else member
+            key = counter_key(quota, period, user_id)
+            counted = client.get(key)
+            if counted is None:
+                client.srem(active_key, member)
+                continue
+            delta = (db.scalar(spec.count(user_id, since)) or 0) - int(counted)
+            if delta > 0:
+                client.incrby(key, delta)
+                corrected += 1
+                logger.info("Reconciled %s quota for user %s by %+d.", spec.name, user_id, delta)
+    return corrected
@@ -1,72 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from uuid import UUID
 
-from backend.core.database import get_db
+from backend.core.database import get_async_db
 from backend.api.auth.auth_service import admin_required
 from backend.schemas.subscription_tier_schema import SubscriptionTierBase, SubscriptionTierOut
 from backend.api.subscriptions.subscription_service import (
-    get_all_subscription_tiers,
     get_subscription_tier_by_id,
     create_subscription_tier,
     update_subscription_tier,
     deactivate_subscription_tier,
     delete_subscription_tier,
 )
-from backend.models.subscription_tier import SubscriptionTier
+from backend.api.subscriptions.tier_catalog import tier_catalog
+from backend.core.http_cache import etag_matches
 from backend.core.logging_config import get_logger
+from backend.api.middlewares.route_policy import public
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 
 @router.get("/", response_model=List[SubscriptionTierOut])
-def list_subscription_tiers(
+@public
+async def list_subscription_tiers(
     include_inactive: bool = Query(False, description="Include inactive subscription tiers in the response"),
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     List all subscription tiers.
+
+    Served from the pre-serialized catalog cache with a strong ETag;
+    a matching If-None-Match gets 304 Not Modified.
     """
     try:
-        logger.info("Listing subscription tiers.")
-        tiers = get_all_subscription_tiers(db, include_inactive)
-        return tiers
+        entry = await tier_catalog.get(db, include_inactive)
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
     except Exception as e:
         logger.error(f"Error listing subscription tiers: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to list subscription tiers.")
 
 @router.get("/version")
-def get_subscription_version(
-    db: Session = Depends(get_db),
-):
+@public
+async def get_subscription_version(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve the current version of the subscription tiers.
     """
     try:
-        logger.info("Fetching current subscription version.")
-        version = db.query(func.max(SubscriptionTier.version)).scalar()
-        if version is None:
-            version = 0  # Default version if no tiers exist
-        logger.debug(f"Current subscription version: {version}")
+        version = await tier_catalog.published_version(db)
+        logger.debug("Current subscription version: %s", version)
         return {"version": version}
     except Exception as e:
         logger.error(f"Error retrieving subscription version: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve subscription version.")
 
 @router.get("/{tier_id}", response_model=SubscriptionTierOut)
-def retrieve_subscription_tier(
+@public
+async def retrieve_subscription_tier(
     tier_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Retrieve a specific subscription tier by ID.
     """
     try:
-        logger.info(f"Retrieving subscription tier with ID: {tier_id}")
-        tier = get_subscription_tier_by_id(db, str(tier_id))
+        logger.info("Retrieving subscription tier with ID: %s", tier_id)
+        tier = await get_subscription_tier_by_id(db, str(tier_id))
         return tier
     except Exception as e:
         logger.error(f"Error retrieving subscription tier {tier_id}: {str(e)}")
@@ -74,22 +78,23 @@ def retrieve_subscription_tier(
 
 
 @router.post("/", response_model=SubscriptionTierOut, dependencies=[Depends(admin_required)])
-def create_subscription(
+async def create_subscription(
     subscription_data: SubscriptionTierBase,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create a new subscription tier (Admin only).
     """
     try:
-        logger.info(f"Creating subscription tier: {subscription_data.name}")
-        tier = create_subscription_tier(db, subscription_data.dict())
+        logger.info("Creating subscription tier: %s", subscription_data.name)
+        tier = await create_subscription_tier(db, subscription_data.dict())
 
         # Increment version when a new tier is created
         tier.version += 1
-        db.commit()
+        await db.commit()
+        await tier_catalog.bump()
 
-        logger.info(f"Subscription tier created: {tier.name}")
+        logger.info("Subscription tier created: %s", tier.name)
         return tier
     except Exception as e:
         logger.error(f"Error creating subscription tier: {str(e)}")
@@ -97,23 +102,24 @@ def create_subscription(
 
 
 @router.put("/{tier_id}", response_model=SubscriptionTierOut, dependencies=[Depends(admin_required)])
-def update_subscription(
+async def update_subscription(
     tier_id: UUID,
     updated_data: SubscriptionTierBase,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Update an existing subscription tier (Admin only).
     """
     try:
-        logger.info(f"Updating subscription tier with ID: {tier_id}")
-        tier = update_subscription_tier(db, str(tier_id), updated_data.dict())
+        logger.info("Updating subscription tier with ID: %s", tier_id)
+        tier = await update_subscription_tier(db, str(tier_id), updated_data.dict())
 
         # Increment version when the subscription tier is updated
         tier.version += 1
-        db.commit()
+        await db.commit()
+        await tier_catalog.bump()
 
-        logger.info(f"Subscription tier updated: {tier.name}")
+        logger.info("Subscription tier updated: %s", tier.name)
         return tier
     except Exception as e:
         logger.error(f"Error updating subscription tier {tier_id}: {str(e)}")
@@ -121,21 +127,22 @@ def update_subscription(
 
 
 @router.delete("/{tier_id}", dependencies=[Depends(admin_required)])
-def delete_subscription(
+async def delete_subscription(
     tier_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Delete a subscription tier if no users are subscribed to it (Admin only).
     """
     try:
-        logger.info(f"Deleting subscription tier with ID: {tier_id}")
-        delete_subscription_tier(db, str(tier_id))
+        logger.info("Deleting subscription tier with ID: %s", tier_id)
+        await delete_subscription_tier(db, str(tier_id))
 
         # Increment version when a subscription tier is deleted
-        db.commit()
+        await db.commit()
+        await tier_catalog.bump()
 
-        logger.info(f"Subscription tier deleted: {tier_id}")
+        logger.info("Subscription tier deleted: %s", tier_id)
         return {"message": "Subscription tier deleted successfully."}
     except HTTPException as e:
         raise e
@@ -145,21 +152,22 @@ def delete_subscription(
 
 
 @router.put("/{tier_id}/deactivate", dependencies=[Depends(admin_required)])
-def deactivate_subscription(
+async def deactivate_subscription(
     tier_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Deactivate a subscription tier (Admin only).
     """
     try:
-        logger.info(f"Deactivating subscription tier with ID: {tier_id}")
-        deactivate_subscription_tier(db, str(tier_id))
+        logger.info("Deactivating subscription tier with ID: %s", tier_id)
+        await deactivate_subscription_tier(db, str(tier_id))
 
         # Increment version when a subscription tier is deactivated
-        db.commit()
+        await db.commit()
+        await tier_catalog.bump()
 
-        logger.info(f"Subscription tier deactivated: {tier_id}")
+        logger.info("Subscription tier deactivated: %s", tier_id)
         return {"message": "Subscription tier deactivated successfully."}
     except Exception as e:
         logger.error(f"Error deactivating subscription tier {tier_id}: {str(e)}")
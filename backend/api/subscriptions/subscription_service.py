@@ -1,21 +1,20 @@
 from datetime import datetime, timedelta
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 
-from backend.core.config import settings
 from backend.models.subscription_tier import SubscriptionTier
 from backend.models.user import User
 from backend.core.logging_config import get_logger
 from backend.schemas.subscription_tier_schema import SubscriptionDetails, UpdateSubscription
-import stripe
+from backend.core.service_registry import stripe
 
 logger = get_logger(__name__)
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
-
-def get_all_subscription_tiers(db: Session, include_inactive: bool = False) -> List[SubscriptionTier]:
+async def get_all_subscription_tiers(db: AsyncSession, include_inactive: bool = False) -> List[SubscriptionTier]:
     """
     Retrieve all subscription tiers, ordered by price (ascending).
     :param db: Database session.
@@ -23,17 +22,17 @@ def get_all_subscription_tiers(db: Session, include_inactive: bool = False) -> L
     :return: List of subscription tiers.
     """
     try:
-        query = db.query(SubscriptionTier).order_by(SubscriptionTier.price.asc())  # Order by price ascending
+        query = select(SubscriptionTier).order_by(SubscriptionTier.price.asc())  # Order by price ascending
         if not include_inactive:
-            query = query.filter(SubscriptionTier.is_active.is_(True))
-        tiers = query.all()
-        logger.debug(f"Fetched subscription tiers: {tiers}")
+            query = query.where(SubscriptionTier.is_active.is_(True))
+        tiers = (await db.scalars(query)).all()
+        logger.debug("Fetched subscription tiers: %s", tiers)
         return tiers
     except SQLAlchemyError as e:
         logger.error(f"Error retrieving subscription tiers: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve subscription tiers.")
 
-def get_subscription_tier_by_id(db: Session, tier_id: str) -> Optional[SubscriptionTier]:
+async def get_subscription_tier_by_id(db: AsyncSession, tier_id: str) -> Optional[SubscriptionTier]:
     """
     Retrieve a subscription tier by its ID.
     :param db: Database session.
@@ -41,7 +40,7 @@ def get_subscription_tier_by_id(db: Session, tier_id: str) -> Optional[Subscript
     :return: Subscription tier or None.
     """
     try:
-        tier = db.query(SubscriptionTier).filter_by(id=tier_id).first()
+        tier = await db.scalar(select(SubscriptionTier).where(SubscriptionTier.id == tier_id))
         if not tier:
             raise HTTPException(status_code=404, detail="Subscription tier not found.")
         return tier
@@ -49,7 +48,7 @@ def get_subscription_tier_by_id(db: Session, tier_id: str) -> Optional[Subscript
         logger.error(f"Error retrieving subscription tier {tier_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve subscription tier.")
 
-def create_subscription_tier(db: Session, tier_data: dict) -> SubscriptionTier:
+async def create_subscription_tier(db: AsyncSession, tier_data: dict) -> SubscriptionTier:
     """
     Create a new subscription tier.
     :param db: Database session.
@@ -59,21 +58,21 @@ def create_subscription_tier(db: Session, tier_data: dict) -> SubscriptionTier:
     try:
         new_tier = SubscriptionTier(**tier_data, created_at=datetime.utcnow(), updated_at=datetime.utcnow())
         db.add(new_tier)
-        db.commit()
-        db.refresh(new_tier)
+        await db.commit()
+        await db.refresh(new_tier)
 
         # Increment version after creation
         new_tier.version = 1
-        db.commit()
+        await db.commit()
 
-        logger.info(f"Subscription tier created: {new_tier.name}")
+        logger.info("Subscription tier created: %s", new_tier.name)
         return new_tier
     except SQLAlchemyError as e:
         logger.error(f"Error creating subscription tier: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create subscription tier.")
 
-def update_subscription_tier(db: Session, tier_id: str, updated_data: dict) -> SubscriptionTier:
+async def update_subscription_tier(db: AsyncSession, tier_id: str, updated_data: dict) -> SubscriptionTier:
     """
     Update a subscription tier.
     :param db: Database session.
@@ -82,88 +81,87 @@ def update_subscription_tier(db: Session, tier_id: str, updated_data: dict) -> S
     :return: Updated subscription tier.
     """
     try:
-        tier = get_subscription_tier_by_id(db, tier_id)
+        tier = await get_subscription_tier_by_id(db, tier_id)
         for key, value in updated_data.items():
             setattr(tier, key, value)
         tier.updated_at = datetime.utcnow()
 
         # Increment the version
         tier.version += 1
-        logger.debug(f"Incremented version for subscription tier {tier_id} to {tier.version}")
+        logger.debug("Incremented version for subscription tier %s to %s", tier_id, tier.version)
 
-        db.commit()
-        db.refresh(tier)
-        logger.info(f"Subscription tier updated: {tier.name}")
+        await db.commit()
+        await db.refresh(tier)
+        logger.info("Subscription tier updated: %s", tier.name)
         return tier
     except SQLAlchemyError as e:
         logger.error(f"Error updating subscription tier {tier_id}: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update subscription tier.")
 
-def deactivate_subscription_tier(db: Session, tier_id: str) -> None:
+async def deactivate_subscription_tier(db: AsyncSession, tier_id: str) -> None:
     """
     Deactivate a subscription tier (set is_active to False).
     :param db: Database session.
     :param tier_id: ID of the subscription tier.
     """
     try:
-        tier = get_subscription_tier_by_id(db, tier_id)
+        tier = await get_subscription_tier_by_id(db, tier_id)
         tier.is_active = False
         tier.updated_at = datetime.utcnow()
 
         # Increment the version
         tier.version += 1
-        logger.debug(f"Incremented version for subscription tier {tier_id} to {tier.version}")
+        logger.debug("Incremented version for subscription tier %s to %s", tier_id, tier.version)
 
-        db.commit()
-        logger.info(f"Subscription tier deactivated: {tier.name}")
+        await db.commit()
+        logger.info("Subscription tier deactivated: %s", tier.name)
     except SQLAlchemyError as e:
         logger.error(f"Error deactivating subscription tier {tier_id}: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to deactivate subscription tier.")
 
-def delete_subscription_tier(db: Session, tier_id: str) -> None:
+async def delete_subscription_tier(db: AsyncSession, tier_id: str) -> None:
     """
     Delete a subscription tier if no users are subscribed to it.
     :param db: Database session.
     :param tier_id: ID of the subscription tier.
     """
     try:
-        tier = get_subscription_tier_by_id(db, tier_id)
-        active_users = db.query(User).filter(User.subscription_plan == tier.name).count()
+        tier = await get_subscription_tier_by_id(db, tier_id)
+        active_users = await db.scalar(
+            select(func.count()).select_from(User).where(User.subscription_plan == tier.name)
+        )
         if active_users > 0:
             raise HTTPException(
                 status_code=400,
                 detail="Cannot delete subscription tier with active subscribers. Deactivate it instead."
             )
-        db.delete(tier)
-        db.commit()
-
-        # Increment the version upon deletion
-        db.commit()
+        await db.delete(tier)
+        await db.commit()
 
-        logger.info(f"Subscription tier deleted: {tier.name}")
+        logger.info("Subscription tier deleted: %s", tier.name)
     except SQLAlchemyError as e:
         logger.error(f"Error deleting subscription tier {tier_id}: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to delete subscription tier.")
 
 
-def get_user_subscription_details(user_id: str, db: Session) -> SubscriptionDetails:
+async def get_user_subscription_details(user_id: str, db: AsyncSession) -> SubscriptionDetails:
     """
     Fetch subscription details for a specific user.
     :param user_id: ID of the user.
     :param db: Database session.
     :return: Subscription details.
     """
-    logger.info(f"Fetching subscription details for user ID {user_id}")
+    logger.info("Fetching subscription details for user ID %s", user_id)
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             logger.warning(f"User not found: {user_id}")
             raise HTTPException(status_code=404, detail="User not found")
 
-        subscription = db.query(SubscriptionTier).filter(SubscriptionTier.name == user.subscription_plan).first()
+        subscription = await db.scalar(select(SubscriptionTier).where(SubscriptionTier.name == user.subscription_plan))
         if not subscription:
             logger.warning(f"Subscription tier not found for user ID {user_id}")
             raise HTTPException(status_code=404, detail="Subscription tier not found")
@@ -179,28 +177,29 @@ def get_user_subscription_details(user_id: str, db: Session) -> SubscriptionDeta
         logger.error(f"Failed to fetch subscription details for user ID {user_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch subscription details")
 
-def update_user_subscription(user_id: str, subscription_data: UpdateSubscription, db: Session):
+async def update_user_subscription(user_id: str, subscription_data: UpdateSubscription, db: AsyncSession):
     """
     Update a user's subscription plan with Stripe integration.
     :param user_id: ID of the user.
     :param subscription_data: Updated subscription details.
     :param db: Database session.
     """
-    logger.info(f"Updating subscription for user ID {user_id}")
+    logger.info("Updating subscription for user ID %s", user_id)
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             logger.warning(f"User not found: {user_id}")
             raise HTTPException(status_code=404, detail="User not found")
 
-        new_subscription = db.query(SubscriptionTier).filter(SubscriptionTier.id == subscription_data.subscription_tier_id).first()
+        new_subscription = await db.get(SubscriptionTier, subscription_data.subscription_tier_id)
         if not new_subscription:
             logger.warning(f"Subscription tier not found: {subscription_data.subscription_tier_id}")
             raise HTTPException(status_code=404, detail="Subscription tier not found")
 
         # Update Stripe subscription if user has a Stripe customer ID
         if user.stripe_customer_id:
-            stripe.Subscription.modify(
+            await run_in_threadpool(
+                stripe.Subscription.modify,
                 user.stripe_subscription_id,
                 items=[
                     {
@@ -213,43 +212,43 @@ def update_user_subscription(user_id: str, subscription_data: UpdateSubscription
         user.subscription_plan = new_subscription.name
         user.renewal_date = datetime.utcnow() + timedelta(days=30)  # Example renewal period
 
-        db.commit()
-        logger.info(f"Subscription updated successfully for user ID {user_id}")
+        await db.commit()
+        logger.info("Subscription updated successfully for user ID %s", user_id)
     except stripe.error.StripeError as e:
         logger.error(f"Stripe error while updating subscription for user ID {user_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update subscription in Stripe")
     except SQLAlchemyError as e:
         logger.error(f"Failed to update subscription for user ID {user_id}: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update subscription")
 
-def cancel_user_subscription(user_id: str, db: Session):
+async def cancel_user_subscription(user_id: str, db: AsyncSession):
     """
     Cancel a user's subscription with Stripe integration.
     :param user_id: ID of the user.
     :param db: Database session.
     """
-    logger.info(f"Cancelling subscription for user ID {user_id}")
+    logger.info("Cancelling subscription for user ID %s", user_id)
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             logger.warning(f"User not found: {user_id}")
             raise HTTPException(status_code=404, detail="User not found")
 
         # Cancel Stripe subscription if user has a Stripe subscription ID
         if user.stripe_subscription_id:
-            stripe.Subscription.delete(user.stripe_subscription_id)
+            await run_in_threadpool(stripe.Subscription.delete, user.stripe_subscription_id)
 
         user.subscription_plan = "Free"
         user.renewal_date = None
 
-        db.commit()
-        logger.info(f"Subscription cancelled successfully for user ID {user_id}")
+        await db.commit()
+        logger.info("Subscription cancelled successfully for user ID %s", user_id)
     except stripe.error.StripeError as e:
         logger.error(f"Stripe error while cancelling subscription for user ID {user_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to cancel subscription in Stripe")
     except SQLAlchemyError as e:
         logger.error(f"Failed to cancel subscription for user ID {user_id}: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to cancel subscription")
 
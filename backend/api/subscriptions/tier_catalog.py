@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.core.logging_config import get_logger
+from backend.core.redis_client import get_async_redis
+from backend.core.responses import serialize
+from backend.schemas.subscription_tier_schema import SubscriptionTierOut
+
+logger = get_logger(__name__)
+
+VERSION_KEY = "tiers:catalog:version"
+CHANNEL = "tiers:catalog"
+
+_SHARED_CLIENT = object()  # Resolve the shared async Redis client on first use
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """ One serialized tier list, ready to write to the socket. """
+    version: int
+    body: bytes
+    etag: str
+
+
+def make_etag(body: bytes) -> str:
+    """ Strong ETag from the serialized bytes, so every worker agrees on it. """
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+async def _load_tiers(db: AsyncSession, include_inactive: bool):
+    from backend.api.subscriptions.subscription_service import get_all_subscription_tiers
+
+    return await get_all_subscription_tiers(db, include_inactive)
+
+
+async def _load_published_version(db: AsyncSession) -> int:
+    from backend.models.subscription_tier import SubscriptionTier
+
+    return await db.scalar(select(func.max(SubscriptionTier.version))) or 0
+
+
+### **Tier Catalog Cache**
+class TierCatalog:
+    """
+    Process-local cache of the serialized tier list, keyed by a global catalog version.
+
+    Every tier write calls ``bump``. With Redis the version is a shared
+    counter and each bump is published, so every worker drops its copy
+    as soon as the catalog changes; in steady state a read costs neither a
+    Postgres nor a Redis round trip. Without Redis (or while the
+    subscription is down) the version is only re-read, and the local copy
+    rebuilt, every ``TIER_CATALOG_TTL_SECONDS``.
+
+    That version only invalidates caches: it lives in Redis or in memory
+    and can restart from zero. What clients see (``published_version``) is
+    the durable ``max(SubscriptionTier.version)``, read from Postgres once
+    per catalog version.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[AsyncSession, bool], Awaitable[list]] = _load_tiers,
+        version_loader: Callable[[AsyncSession], Awaitable[int]] = _load_published_version,
+        client=_SHARED_CLIENT,
+        ttl: float = settings.TIER_CATALOG_TTL_SECONDS,
+    ):
+        self._loader = loader
+        self._version_loader = version_loader
+        self._published: Optional[Tuple[int, int]] = None  # (catalog version, published version)
+        self._client = client
+        self._ttl = ttl
+        self._entries: Dict[bool, CatalogEntry] = {}
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._local_version = 0
+        self._listening = False
+        self._listener: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def client(self):
+        if self._client is _SHARED_CLIENT:
+            self._client = get_async_redis()
+        return self._client
+
+    async def _read_version(self) -> int:
+        if self.client is None:
+            return self._local_version
+        return int(await self.client.get(VERSION_KEY) or 0)
+
+    async def version(self) -> int:
+        if self._listening and self._version is not None:
+            return self._version
+        now = time.monotonic()
+        if self._version is None or now - self._checked_at >= self._ttl:
+            try:
+                self._version = await self._read_version()
+            except Exception as e:
+                logger.warning(f"Could not read tier catalog version: {e}")
+                self._version = (self._version or 0) + 1  # Force a rebuild rather than serve stale data
+            if self.client is None:
+                self._invalidate()  # Other workers' writes are invisible; rebuild once per TTL
+            self._checked_at = now
+        return self._version
+
+    async def get(self, db: AsyncSession, include_inactive: bool = False) -> CatalogEntry:
+        version = await self.version()
+        entry = self._entries.get(include_inactive)
+        if entry is not None and entry.version == version:
+            return entry
+
+        async with self._lock:
+            entry = self._entries.get(include_inactive)
+            if entry is not None and entry.version == version:
+                return entry
+            tiers = await self._loader(db, include_inactive)
+            body = serialize(List[SubscriptionTierOut], tiers)
+            entry = CatalogEntry(version=version, body=body, etag=make_etag(body))
+            self._entries[include_inactive] = entry
+            logger.debug("Rebuilt tier catalog (version %s, inactive=%s)", version, include_inactive)
+            return entry
+
+    async def published_version(self, db: AsyncSession) -> int:
+        """ The durable catalog version served to clients by ``/subscriptions/version``. """
+        version = await self.version()
+        if self._published is None or self._published[0] != version:
+            self._published = (version, await self._version_loader(db))
+        return self._published[1]
+
+    def _invalidate(self) -> None:
+        self._entries.clear()
+        self._published = None
+
+    async def bump(self) -> int:
+        """ Record a tier change: drop the local copy and tell every other worker. """
+        self._invalidate()
+        if self.client is None:
+            self._local_version += 1
+            self._version = self._local_version
+            return self._version
+        try:
+            version = int(await self.client.incr(VERSION_KEY))
+            await self.client.publish(CHANNEL, version)
+        except Exception as e:
+            logger.error(f"Could not publish tier catalog change: {e}")
+            self._version, self._checked_at = None, 0.0
+            return 0
+        self._version = version
+        return version
+
+    def _apply(self, version: int) -> None:
+        if version != self._version:
+            self._version = version
+            self._invalidate()
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHANNEL)
+                self._apply(await self._read_version())  # Catch up on anything missed while disconnected
+                self._listening = True
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "message":
+                        self._apply(int(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Tier catalog subscription lost, retrying: {e}")
+                await asyncio.sleep(1)
+            finally:
+                self._listening = False
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def start(self) -> None:
+        """ Follow catalog changes from other workers; no-op without Redis. """
+        if self.client is not None and self._listener is None:
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+tier_catalog = TierCatalog()
@@ -1,16 +1,23 @@
 import uuid
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
-from sqlalchemy.orm import Session
-from backend.core.database import get_db
-from backend.api.auth.auth_service import get_current_user
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Header, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.core.database import get_async_db
+from backend.api.auth.auth_service import get_current_session, get_current_user
 from backend.schemas.user_schema import UserProfileUpdate, UserOut
 from backend.models.user import User
 from backend.api.users.user_service import (
     deactivate_user,
     reactivate_user,
     is_user_active,
+    get_user_profile,
+    load_profile_relationships,
 )
+from backend.core.http_cache import etag_matches
+from backend.core.responses import serialize
 from backend.core.logging_config import get_logger
+from backend.api.middlewares.route_policy import mfa_exempt
+from backend.services.session_cache import session_cache
 
 # Logger setup
 logger = get_logger(__name__)
@@ -19,46 +26,81 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
+def profile_etag(user_id, profile_version: int) -> str:
+    return f'W/"{user_id}-{profile_version}"'
+
+
+async def _load_user(db: AsyncSession, user_id) -> User:
+    user = await db.get(User, user_id)
+    if not user:
+        logger.warning(f"User not found: {user_id}")
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
 @router.get("/profile", response_model=UserOut)
+@mfa_exempt
 async def get_profile(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    request: Request,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Fetch the current user's profile.
+
+    The ETag is the user's ``profile_version``; a matching If-None-Match is
+    answered with 304 from the session cache, without reading the users table.
     """
-    logger.info(f"Fetching profile for user ID {current_user.id}")
+    session = await get_current_session(request, db)
+    cached_version = await session_cache.get_profile_version(session.user_id)
+    if cached_version is not None:
+        etag = profile_etag(session.user_id, cached_version)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+    logger.info("Fetching profile for user ID %s", session.user_id)
+    current_user = await _load_user(db, session.user_id)
     try:
-        return UserOut.from_orm(current_user)
+        await load_profile_relationships(db, current_user)
+        body = serialize(UserOut, current_user)
     except Exception as e:
         logger.exception(f"Error fetching profile for user ID {current_user.id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch profile.")
 
+    await session_cache.set_profile_version(current_user.id, current_user.profile_version)
+    etag = profile_etag(current_user.id, current_user.profile_version)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 
 @router.get("/profile/version", response_model=dict)
-async def get_profile_version(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
-):
+@mfa_exempt
+async def get_profile_version(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Get the profile version for the current user.
     """
-    logger.info(f"Fetching profile version for user ID {current_user.id}")
-    try:
-        return {"profile_version": current_user.profile_version}
-    except Exception as e:
-        logger.exception(f"Error fetching profile version for user ID {current_user.id}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to fetch profile version.")
+    session = await get_current_session(request, db)
+    logger.info("Fetching profile version for user ID %s", session.user_id)
+    version = await session_cache.get_profile_version(session.user_id)
+    if version is None:
+        current_user = await _load_user(db, session.user_id)
+        version = current_user.profile_version
+        await session_cache.set_profile_version(current_user.id, version)
+    return {"profile_version": version}
 
 
 @router.put("/profile", response_model=UserOut)
+@mfa_exempt
 async def update_profile(
     profile_data: UserProfileUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Update the current user's profile.
     """
-    logger.info(f"Updating profile for user ID {current_user.id}")
+    logger.info("Updating profile for user ID %s", current_user.id)
     try:
         # Update user fields
         for key, value in profile_data.dict(exclude_unset=True).items():
@@ -67,10 +109,10 @@ async def update_profile(
         # Increment profile version
         current_user.profile_version += 1
 
-        db.commit()
-        db.refresh(current_user)
+        await db.commit()
+        await load_profile_relationships(db, current_user)
 
-        logger.info(f"Profile updated for user ID {current_user.id}")
+        logger.info("Profile updated for user ID %s", current_user.id)
         return UserOut.from_orm(current_user)
     except Exception as e:
         logger.exception(f"Error updating profile for user ID {current_user.id}: {str(e)}")
@@ -79,20 +121,20 @@ async def update_profile(
 
 @router.put("/deactivate", response_model=dict)
 async def deactivate_account(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)
 ):
     """
     Deactivate the current user's account.
     """
-    logger.info(f"Deactivating account for user ID {current_user.id}")
+    logger.info("Deactivating account for user ID %s", current_user.id)
     try:
-        deactivate_user(db, current_user.id)
+        await deactivate_user(db, current_user.id)
 
         # Increment profile version
         current_user.profile_version += 1
-        db.commit()
+        await db.commit()
 
-        logger.info(f"Account deactivated for user ID {current_user.id}")
+        logger.info("Account deactivated for user ID %s", current_user.id)
         return {"message": "Account deactivated successfully"}
     except Exception as e:
         logger.exception(f"Error deactivating account for user ID {current_user.id}: {str(e)}")
@@ -101,21 +143,21 @@ async def deactivate_account(
 
 @router.put("/reactivate", response_model=dict)
 async def reactivate_account(
-    user_id: uuid.UUID, db: Session = Depends(get_db)
+    user_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Reactivate a user's account (admin feature).
     """
-    logger.info(f"Reactivating account for user ID {user_id}")
+    logger.info("Reactivating account for user ID %s", user_id)
     try:
-        reactivate_user(db, user_id)
+        await reactivate_user(db, user_id)
 
         # Increment profile version
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await get_user_profile(db, user_id)
         user.profile_version += 1
-        db.commit()
+        await db.commit()
 
-        logger.info(f"Account reactivated for user ID {user_id}")
+        logger.info("Account reactivated for user ID %s", user_id)
         return {"message": "Account reactivated successfully"}
     except Exception as e:
         logger.exception(f"Error reactivating account for user ID {user_id}: {str(e)}")
@@ -124,14 +166,14 @@ async def reactivate_account(
 
 @router.get("/active-status", response_model=dict)
 async def check_active_status(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)
 ):
     """
     Check if the current user's account is active.
     """
-    logger.info(f"Checking active status for user ID {current_user.id}")
+    logger.info("Checking active status for user ID %s", current_user.id)
     try:
-        is_active = is_user_active(db, current_user.id)
+        is_active = await is_user_active(db, current_user.id)
         return {"is_active": is_active}
     except Exception as e:
         logger.exception(f"Error checking active status for user ID {current_user.id}: {str(e)}")
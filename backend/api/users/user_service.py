@@ -1,5 +1,5 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from uuid import UUID
 
@@ -10,11 +10,21 @@ from backend.core.logging_config import get_logger
 # Logger setup
 logger = get_logger(__name__)
 
+# Collections serialized by UserOut. Lazy loading is unavailable under asyncio,
+# so they must be loaded explicitly before building the response.
+PROFILE_RELATIONSHIPS = [
+    "followers",
+    "following",
+    "friend_requests_sent",
+    "friend_requests_received",
+    "progress_photos",
+]
+
 ### **Get User Profile**
-def get_user_profile(db: Session, user_id: UUID) -> User:
+async def get_user_profile(db: AsyncSession, user_id: UUID) -> User:
     """ Fetch a user's profile. """
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         return user
@@ -22,49 +32,55 @@ def get_user_profile(db: Session, user_id: UUID) -> User:
         logger.error(f"Database error while fetching profile: {str(e)}")
         raise HTTPException(status_code=500, detail="Database error")
 
+### **Load Profile Relationships**
+async def load_profile_relationships(db: AsyncSession, user: User) -> User:
+    """ Load the relationship collections needed to serialize a profile. """
+    await db.refresh(user, attribute_names=PROFILE_RELATIONSHIPS)
+    return user
+
 ### **Update User Profile**
-def update_user_profile(db: Session, user_id: UUID, profile_data: UserProfileUpdate) -> User:
+async def update_user_profile(db: AsyncSession, user_id: UUID, profile_data: UserProfileUpdate) -> User:
     """ Update a user's profile. """
     try:
-        user = get_user_profile(db, user_id)
+        user = await get_user_profile(db, user_id)
         for field, value in profile_data.dict(exclude_unset=True).items():
             setattr(user, field, value)
         user.profile_version += 1
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         return user
     except SQLAlchemyError as e:
         logger.error(f"Database error while updating profile: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Database error")
 
 ### **Deactivate User Account**
-def deactivate_user(db: Session, user_id: UUID):
+async def deactivate_user(db: AsyncSession, user_id: UUID):
     """ Deactivate a user's account. """
     try:
-        user = get_user_profile(db, user_id)
+        user = await get_user_profile(db, user_id)
         user.is_active = False
         user.profile_version += 1
-        db.commit()
+        await db.commit()
     except SQLAlchemyError as e:
         logger.error(f"Database error while deactivating user: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Database error")
 
 ### **Reactivate User Account**
-def reactivate_user(db: Session, user_id: UUID):
+async def reactivate_user(db: AsyncSession, user_id: UUID):
     """ Reactivate a user's account. """
     try:
-        user = get_user_profile(db, user_id)
+        user = await get_user_profile(db, user_id)
         user.is_active = True
         user.profile_version += 1
-        db.commit()
+        await db.commit()
     except SQLAlchemyError as e:
         logger.error(f"Database error while reactivating user: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Database error")
 
 ### **Check if User is Active**
-def is_user_active(db: Session, user_id: UUID) -> bool:
+async def is_user_active(db: AsyncSession, user_id: UUID) -> bool:
     """ Check if a user account is active. """
-    return get_user_profile(db, user_id).is_active
+    return (await get_user_profile(db, user_id)).is_active
@@ -7,9 +7,11 @@ from backend.api.workouts.workout_service import (
     update_workout,
     delete_workout,
 )
+from backend.api.subscriptions.entitlements import Capability, requires
 from backend.schemas.workout_schema import WorkoutCreate, WorkoutOut
 
-router = APIRouter()
+# Every workout route needs a plan with workout access
+router = APIRouter(dependencies=[Depends(requires(Capability.ACCESS_WORKOUTS))])
 
 @router.post("/", response_model=WorkoutOut)
 def create_new_workout(workout_data: WorkoutCreate, db: Session = Depends(get_db)):
@@ -1,17 +1,11 @@
-import boto3
-from botocore.exceptions import NoCredentialsError
 from backend.core.config import settings
-
-s3_client = boto3.client(
-    "s3",
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_REGION,
-)
+from backend.core.service_registry import get_s3_client
 
 def upload_file_to_s3(file, filename):
+    from botocore.exceptions import NoCredentialsError
+
     try:
-        s3_client.upload_fileobj(
+        get_s3_client().upload_fileobj(
             file.file,
             settings.S3_BUCKET_NAME,
             filename,
@@ -1,18 +1,52 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from starlette.requests import Request
 import os
 
 from backend.core.config import settings
+from backend.core.db_pool import engine_options, register_pool_metrics, resolve_pool_profile
+from backend.core.unit_of_work import get_unit_of_work
 
 # Production database URL
 DATABASE_URL = settings.DATABASE_URL
 
-# Create engine
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+
+def to_async_url(url: str) -> str:
+    """ Convert a sync PostgreSQL URL to its asyncpg equivalent. """
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+
+# Pool sizing comes from the DB_POOL_PROFILE profile plus DB_POOL_* overrides
+pool_profile = resolve_pool_profile(settings)
+sync_pool_metrics = register_pool_metrics("sync")
+async_pool_metrics = register_pool_metrics("async")
+
+# Create engine (sync path, used by Celery tasks and background threads)
+engine = create_engine(DATABASE_URL, **engine_options(pool_profile, sync_pool_metrics))
+sync_pool_metrics.attach(engine.pool)
 
 # Session management
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (request path)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(pool_profile, async_pool_metrics, is_async=True))
+async_pool_metrics.attach(async_engine.sync_engine.pool)
+
+# Async session management. Objects stay usable after commit so handlers can
+# serialize them without an implicit (and, under asyncio, illegal) refresh.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Declarative base for models
 Base = declarative_base()
 
@@ -24,6 +58,17 @@ def get_db():
     finally:
         db.close()
 
+# Dependency for async database session. Inside a request this is the shared,
+# request-scoped session (committed once by UnitOfWorkMiddleware); outside of
+# one it falls back to a private session.
+async def get_async_db(request: Request):
+    unit = get_unit_of_work(request.scope)
+    if unit is not None:
+        yield unit.session
+        return
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Initialize database (for production)
 def init_db():
     from backend.models import user  # Import all models here
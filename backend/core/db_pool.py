@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from backend.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+### **Pool Profiles**
+@dataclass(frozen=True)
+class PoolProfile:
+    """ Connection pool settings for one kind of process. """
+    name: str
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = -1
+    pool_pre_ping: bool = True
+    # Transaction-pooling PgBouncer: no client-side pool, no prepared statements.
+    pgbouncer: bool = False
+
+
+POOL_PROFILES: Dict[str, PoolProfile] = {
+    # Web workers: a warm pool sized for concurrent requests. Connections are
+    # recycled instead of pinged on every checkout.
+    "api": PoolProfile(
+        name="api", pool_size=10, max_overflow=20, pool_timeout=10, pool_recycle=1800, pool_pre_ping=False
+    ),
+    # Celery workers: few, long-idle connections, so ping before use.
+    "celery": PoolProfile(
+        name="celery", pool_size=2, max_overflow=2, pool_timeout=30, pool_recycle=3600, pool_pre_ping=True
+    ),
+    # PgBouncer in transaction mode owns the pooling.
+    "pgbouncer": PoolProfile(name="pgbouncer", pool_pre_ping=False, pgbouncer=True),
+}
+
+
+def resolve_pool_profile(settings) -> PoolProfile:
+    """ Pick the configured profile and apply any explicit DB_POOL_* overrides. """
+    profile = POOL_PROFILES.get(settings.DB_POOL_PROFILE)
+    if profile is None:
+        logger.warning(f"Unknown DB_POOL_PROFILE '{settings.DB_POOL_PROFILE}', using 'api'.")
+        profile = POOL_PROFILES["api"]
+
+    overrides = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    return replace(profile, **{key: value for key, value in overrides.items() if value is not None})
+
+
+def engine_options(profile: PoolProfile, metrics: "PoolMetrics", is_async: bool = False) -> dict:
+    """ Keyword arguments for ``create_engine`` / ``create_async_engine``. """
+    if profile.pgbouncer:
+        options = {"poolclass": instrumented_pool(NullPool, metrics), "pool_pre_ping": profile.pool_pre_ping}
+        if is_async:
+            # asyncpg prepares statements server side by default, which breaks
+            # once PgBouncer hands the next transaction to another backend.
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        return options
+
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return {
+        "poolclass": instrumented_pool(base, metrics),
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+        "pool_recycle": profile.pool_recycle,
+        "pool_pre_ping": profile.pool_pre_ping,
+    }
+
+
+### **Pool Instrumentation**
+class PoolMetrics:
+    """
+    Counters for one engine's pool, fed by pool events.
+
+    Checkout wait is the time spent obtaining a connection from the pool
+    (including opening a new one), which separates pool contention from query
+    time when latency spikes.
+    """
+
+    def __init__(self, name: str, sample_size: int = 1024):
+        self.name = name
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=sample_size)
+        self._pool = None
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def _count(self, attribute: str) -> None:
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def attach(self, pool) -> None:
+        """ Listen to the pool's events and remember it for live gauges. """
+        self._pool = pool
+        event.listen(pool, "connect", lambda *args: self._count("connects"))
+        event.listen(pool, "checkout", lambda *args: self._count("checkouts"))
+        event.listen(pool, "checkin", lambda *args: self._count("checkins"))
+        event.listen(pool, "invalidate", lambda *args: self._count("invalidations"))
+        event.listen(pool, "soft_invalidate", lambda *args: self._count("soft_invalidations"))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            snapshot = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "in_use": self.checkouts - self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+                "timeouts": self.timeouts,
+                "checkout_wait_ms": {
+                    "avg": round(1000 * self.wait_total / self.checkouts, 3) if self.checkouts else 0.0,
+                    "p50": _percentile_ms(waits, 0.50),
+                    "p99": _percentile_ms(waits, 0.99),
+                    "max": round(1000 * self.wait_max, 3),
+                },
+            }
+
+        pool = self._pool
+        if isinstance(pool, QueuePool):
+            snapshot.update(pool_size=pool.size(), checked_out=pool.checkedout(), overflow=max(pool.overflow(), 0))
+        return snapshot
+
+
+def _percentile_ms(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return round(1000 * sorted_values[index], 3)
+
+
+def instrumented_pool(base, metrics: PoolMetrics):
+    """ Subclass ``base`` so every checkout is timed into ``metrics``. """
+
+    class InstrumentedPool(base):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                metrics.record_timeout()
+                raise
+            finally:
+                metrics.record_wait(time.perf_counter() - start)
+
+        def recreate(self):
+            # Keep metrics and gauges attached when the engine is disposed.
+            pool = super().recreate()
+            metrics.attach(pool)
+            return pool
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def register_pool_metrics(name: str) -> PoolMetrics:
+    metrics = PoolMetrics(name)
+    pool_metrics[name] = metrics
+    return metrics
+
+
+def get_pool_metrics(name: Optional[str] = None) -> dict:
+    """ Snapshot of one pool's metrics, or of all registered pools. """
+    if name is not None:
+        return pool_metrics[name].snapshot()
+    return {key: metrics.snapshot() for key, metrics in pool_metrics.items()}
@@ -0,0 +1,5 @@
+import multiprocessing
+
+# Set by the serve supervisor when shutdown begins. Created before the web
+# workers fork, so every worker sees it and fails readiness while draining.
+draining = multiprocessing.Event()
@@ -1,33 +1,280 @@
+import atexit
+import copy
+import json
 import logging
+import multiprocessing
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+from backend.core.config import settings
+from backend.core.log_redaction import REDACTED, SENSITIVE_KEY, redact_text, redact_value
 
 # Get environment (default to development)
-ENV = os.getenv("ENV", "development")
+ENV = settings.ENV
 
 # Logging levels based on environment
 LOG_LEVEL = logging.DEBUG if ENV == "development" else logging.INFO
-LOG_FILE = os.path.join(os.getcwd(), "project_yoked.log")
+LOG_FILE = settings.LOG_FILE or os.path.join(os.getcwd(), "project_yoked.log")
 
 # Logging format
-LOG_FORMAT = "%(asctime)s [%(levelname)s] [%(name)s] %(message)s"
-
-# Configure logging
-root_logger = logging.getLogger()
-root_logger.setLevel(LOG_LEVEL)
-root_logger.handlers = []  # Clear existing handlers
-
-# Add StreamHandler for console logs
-console_handler = logging.StreamHandler()
-console_handler.setLevel(LOG_LEVEL)
-console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-root_logger.addHandler(console_handler)
-
-# Add RotatingFileHandler for file logs
-file_handler = RotatingFileHandler(LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=5)
-file_handler.setLevel(LOG_LEVEL)
-file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-root_logger.addHandler(file_handler)
+LOG_FORMAT = "%(asctime)s [%(levelname)s] [%(process)d] [%(name)s] %(message)s"
+
+DROP_POLICIES = ("drop_new", "drop_oldest", "block")
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``
+RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """ ``"backend.api=0.1,/health=0"`` -> ``{"backend.api": 0.1, "/health": 0.0}`` """
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.rpartition("=")
+        rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+def record_extras(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in RESERVED_ATTRS}
+
+
+### **Filters and Formatters**
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of DEBUG/INFO records from noisy routes or modules.
+
+    A record's ``route`` extra (set by the request logging middleware) is
+    matched exactly against ``route_rates``; otherwise the longest matching
+    logger-name prefix in ``module_rates`` applies. Warnings and above are
+    never sampled.
+    """
+
+    def __init__(self, module_rates: Dict[str, float], route_rates: Dict[str, float]):
+        super().__init__()
+        self.route_rates = route_rates
+        self.module_rates = sorted(module_rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def rate_for(self, record: logging.LogRecord) -> float:
+        route = getattr(record, "route", None)
+        if route is not None and route in self.route_rates:
+            return self.route_rates[route]
+        for prefix, rate in self.module_rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self.rate_for(record)
+        return rate >= 1.0 or random.random() < rate
+
+
+class RedactingFilter(logging.Filter):
+    """
+    Mask secrets before a record leaves the calling thread.
+
+    Mapping arguments and ``extra`` fields with sensitive names are masked,
+    then the formatted message is scrubbed for inline secrets (passwords,
+    tokens, Stripe keys, URL credentials).
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        try:
+            if isinstance(record.args, dict):
+                record.args = redact_value(record.args)
+            record.msg = redact_text(record.getMessage())
+            record.args = None
+        except Exception:
+            return True  # Let the handler report the broken format string
+        for key, value in record_extras(record).items():
+            if SENSITIVE_KEY.search(key):
+                setattr(record, key, REDACTED)
+            elif isinstance(value, (str, dict, list, tuple)):
+                setattr(record, key, redact_value(value))
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """ One JSON object per line: timestamp, level, logger, pid, message and any ``extra`` fields. """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "pid": record.process,
+            "msg": record.getMessage(),
+        }
+        payload.update(record_extras(record))
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str)
+
+
+### **Bounded Queue Handler**
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to the writer thread without blocking the caller.
+
+    When the queue is full the record is handled by ``drop_policy``:
+    ``drop_new`` discards it, ``drop_oldest`` evicts the oldest queued
+    record to make room, and ``block`` waits up to ``block_timeout`` seconds.
+    Dropped records are counted in ``dropped``.
+    """
+
+    def __init__(self, log_queue: queue.Queue, drop_policy: str = "drop_new", block_timeout: float = 1.0):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown log drop policy: {drop_policy}")
+        super().__init__(log_queue)
+        self.drop_policy = drop_policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.drop_policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            if self.drop_policy != "drop_oldest":
+                self.dropped += 1
+                return
+
+        try:
+            self.queue.get_nowait()
+            self.dropped += 1
+        except queue.Empty:
+            pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Resolve the message on the calling thread (arguments may be mutable
+        ORM objects) but keep the traceback separate for the JSON formatter.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def log_file_path(base: str = LOG_FILE, per_process: bool = settings.LOG_FILE_PER_PROCESS) -> str:
+    """ ``app.log`` becomes ``app.<pid>.log`` so workers never rotate a shared file. """
+    if not per_process:
+        return base
+    root, extension = os.path.splitext(base)
+    return f"{root}.{os.getpid()}{extension or '.log'}"
+
+
+def _build_handlers(mode: str) -> list:
+    formatter = JsonFormatter() if settings.LOG_JSON else logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout if mode == "stdout" else sys.stderr)]
+    if mode == "file":
+        handlers.append(RotatingFileHandler(log_file_path(), maxBytes=5 * 1024 * 1024, backupCount=5))
+    for handler in handlers:
+        handler.setLevel(LOG_LEVEL)
+        handler.setFormatter(formatter)
+    return handlers
+
+
+### **Configure Logging**
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[BoundedQueueHandler] = None
+_configured_pid: Optional[int] = None
+
+
+def configure_logging(mode: str = settings.LOG_MODE) -> BoundedQueueHandler:
+    """
+    Route the root logger through a bounded queue drained by one writer thread.
+
+    Log calls only enqueue: records below the level are never formatted,
+    sampled-out records are dropped before formatting, and the rest are
+    redacted, then rendered (text or JSON) and written on the listener
+    thread. ``mode`` is ``file`` (console plus rotating file) or
+    ``stdout`` (console only, for deployments that collect stdout). Safe to
+    call again, e.g. in a forked worker whose listener thread did not survive
+    the fork.
+    """
+    global _listener, _queue_handler, _configured_pid
+    if _configured_pid == os.getpid():
+        return _queue_handler
+
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _queue_handler = BoundedQueueHandler(log_queue, settings.LOG_DROP_POLICY)
+    _queue_handler.setLevel(LOG_LEVEL)
+    _queue_handler.addFilter(SamplingFilter(
+        parse_sample_rates(settings.LOG_SAMPLE_RATES), parse_sample_rates(settings.LOG_ROUTE_SAMPLE_RATES)
+    ))
+    _queue_handler.addFilter(RedactingFilter())
+    _listener = QueueListener(log_queue, *_build_handlers(mode), respect_handler_level=True)
+    _listener.start()
+    _configured_pid = os.getpid()
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(LOG_LEVEL)
+    root_logger.handlers = [_queue_handler]  # Clear existing handlers
+    return _queue_handler
+
+
+def shutdown_logging() -> None:
+    """ Flush queued records and stop the writer thread. """
+    global _configured_pid
+    if _listener is None or _configured_pid != os.getpid():
+        return
+    _listener.stop()
+    _configured_pid = None
+    if _queue_handler.dropped:
+        for handler in _listener.handlers:
+            handler.handle(logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Dropped {_queue_handler.dropped} log records (queue full).",
+            }))
+    for handler in _listener.handlers:
+        handler.close()
+
+
+def dropped_log_records() -> int:
+    return _queue_handler.dropped if _queue_handler else 0
+
+
+def _spawned_child_bootstrapping() -> bool:
+    """
+    True while a spawned child process is still unpickling what its parent sent.
+
+    Such children (the password hasher's pool) import this module only to
+    run a function; they set up their own minimal logging and must never
+    open, write or rotate the parent's log file.
+    """
+    return getattr(multiprocessing.current_process(), "_inheriting", False)
+
+
+if not _spawned_child_bootstrapping():
+    configure_logging()
+    atexit.register(shutdown_logging)
+
+    # Log loaded settings for debugging (secrets masked)
+    if LOG_LEVEL <= logging.DEBUG:
+        logging.getLogger("backend.core.config").debug("Settings loaded: %s", redact_value(settings.model_dump()))
 
 # Convenience function to create loggers
 def get_logger(name):
@@ -0,0 +1,53 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.cache import TTLCache
+
+# Planner row estimates barely move between ANALYZE runs
+_estimates = TTLCache(maxsize=64, ttl=60)
+
+
+def encode_cursor(*values: Any) -> str:
+    """ Opaque keyset cursor for the last row of a page, e.g. ``(timestamp, id)``. """
+    raw = json.dumps([value.isoformat() if hasattr(value, "isoformat") else str(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def parse_utc_timestamp(value: str) -> datetime:
+    """ Cursor parser for naive UTC timestamp columns; an offset (e.g. a hand-made ``+02:00`` cursor) is folded into UTC. """
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> tuple:
+    """ Inverse of ``encode_cursor``; each value goes through its parser. Raises ValueError on a bad cursor. """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(values, list) or len(values) != len(parsers):
+        raise ValueError("Malformed cursor")
+    try:
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+
+
+async def estimated_row_count(db: AsyncSession, table: str) -> Optional[int]:
+    """ Postgres' own row estimate for ``table`` (no scan); None if the table was never analyzed. """
+    estimate = _estimates.get(table)
+    if estimate is None:
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+        )
+        if estimate is None or estimate < 0:
+            return None
+        _estimates.set(table, estimate)
+    return estimate
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+from backend.core.config import settings
+from backend.core.logging_config import LOG_FORMAT, get_logger
+
+logger = get_logger(__name__)
+
+
+class HasherBusyError(Exception):
+    """ Raised when the password hashing queue is full. """
+
+
+### **Worker Functions** (module level so they can be sent to worker processes)
+def _init_worker() -> None:
+    """ Worker processes only log warnings to stderr; the parent alone owns the log file. """
+    logging.basicConfig(level=logging.WARNING, format=LOG_FORMAT)
+
+
+def _hash_worker(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _verify_worker(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def bcrypt_rounds(hashed: str) -> Optional[int]:
+    """ Read the cost factor from a ``$2b$12$...`` hash. """
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded executor instead of the request threadpool.
+
+    At most ``concurrency`` hashes run at once; up to ``max_queue`` more wait
+    for a slot and anything beyond that is rejected with ``HasherBusyError``,
+    so a login storm degrades into fast 503s instead of starving the API.
+    The executor is created on first use, after any worker fork.
+    """
+
+    def __init__(self, rounds: int, concurrency: int, max_queue: int, mode: str = "process"):
+        self.rounds = rounds
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.mode = mode
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    if self.mode == "process":
+                        context = multiprocessing.get_context("spawn")
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.concurrency, mp_context=context, initializer=_init_worker
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.concurrency, thread_name_prefix="password-hasher"
+                        )
+                    logger.info("Password hasher started (%s, %s workers).", self.mode, self.concurrency)
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HasherBusyError("Password hashing queue is full")
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self.busy_seconds += time.perf_counter() - start
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(_hash_worker, password.encode(), self.rounds)
+        return hashed.decode()
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(_verify_worker, password.encode(), hashed.encode())
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """ True when the stored hash was made with a different cost factor. """
+        return bcrypt_rounds(hashed) != self.rounds
+
+    def metrics(self) -> dict:
+        return {
+            "mode": self.mode,
+            "rounds": self.rounds,
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_ms": round(1000 * self.busy_seconds / self.completed, 3) if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    concurrency=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    mode=settings.PASSWORD_HASH_EXECUTOR,
+)
@@ -0,0 +1,118 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from backend.core.cache import TTLCache
+from backend.core.logging_config import get_logger
+from backend.core.redis_client import get_async_redis
+
+logger = get_logger(__name__)
+
+REDIS_KEY_PREFIX = "ratelimit:"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """ A GCRA limit: ``burst`` requests at once, refilled at ``per_minute``. """
+    burst: int
+    per_minute: float
+
+    @property
+    def interval_ms(self) -> int:
+        return max(1, int(60000 / self.per_minute))
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """ Parse ``"<burst>:<per_minute>"``, e.g. ``"5:1"``. """
+        burst, per_minute = spec.split(":")
+        return cls(burst=int(burst), per_minute=float(per_minute))
+
+
+# GCRA over several keys at once: the request is admitted only if every key
+# admits it, and only then are the keys' theoretical arrival times advanced.
+# Returns the wait in milliseconds (0 when admitted).
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local new_tats = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local interval = tonumber(ARGV[i * 2 - 1])
+    local burst = tonumber(ARGV[i * 2])
+    local tat = tonumber(redis.call('GET', key) or now)
+    if tat < now then tat = now end
+    local new_tat = tat + interval
+    local allow_at = new_tat - burst * interval
+    if now < allow_at then
+        wait = math.max(wait, allow_at - now)
+    end
+    new_tats[i] = new_tat
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, new_tats[i], 'PX', new_tats[i] - now)
+end
+return 0
+"""
+
+
+class RateLimiter:
+    """
+    Token-bucket style limiter (GCRA) shared across workers through Redis.
+
+    Without Redis, or if Redis fails, the same algorithm runs in process on a
+    bounded TTL cache, which keeps tests and single-worker setups working.
+    """
+
+    def __init__(self, max_local_keys: int = 100000):
+        self._local = TTLCache(maxsize=max_local_keys, ttl=24 * 3600)
+        self._lock = threading.Lock()
+        self._script = None
+
+    async def hit(self, limits: List[Tuple[str, RateLimit]]) -> float:
+        """ Record one attempt against every key; return seconds to wait, or 0 if allowed. """
+        client = get_async_redis()
+        if client is not None:
+            try:
+                if self._script is None:
+                    self._script = client.register_script(GCRA_SCRIPT)
+                args = []
+                for _, limit in limits:
+                    args.extend([limit.interval_ms, limit.burst])
+                wait_ms = await self._script(keys=[REDIS_KEY_PREFIX + key for key, _ in limits], args=args)
+                return int(wait_ms) / 1000
+            except Exception as e:
+                logger.warning(f"Redis rate limiter failed, using in-process fallback: {e}")
+        return self._hit_local(limits)
+
+    def _hit_local(self, limits: List[Tuple[str, RateLimit]], now_ms: Optional[int] = None) -> float:
+        now = now_ms if now_ms is not None else int(time.time() * 1000)
+        with self._lock:
+            new_tats: Dict[str, int] = {}
+            wait = 0
+            for key, limit in limits:
+                tat = max(self._local.get(key) or now, now)
+                new_tat = tat + limit.interval_ms
+                allow_at = new_tat - limit.burst * limit.interval_ms
+                if now < allow_at:
+                    wait = max(wait, allow_at - now)
+                new_tats[key] = new_tat
+            if wait > 0:
+                return wait / 1000
+            for key, new_tat in new_tats.items():
+                self._local.set(key, new_tat, ttl=(new_tat - now) / 1000)
+            return 0.0
+
+    def reset(self) -> None:
+        self._local.clear()
+
+
+def retry_after_header(wait_seconds: float) -> Dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(wait_seconds)))}
+
+
+rate_limiter = RateLimiter()
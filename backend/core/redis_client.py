@@ -0,0 +1,79 @@
+from typing import Optional
+
+from backend.core.config import settings
+from backend.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_redis_client = None
+_async_redis_client = None
+_redis_unavailable = False
+
+
+def _redis_module():
+    global _redis_unavailable
+
+    if not settings.REDIS_URL:
+        _redis_unavailable = True
+        return None
+    try:
+        import redis
+    except ImportError:
+        logger.warning("REDIS_URL is set but the redis package is not installed; using in-process caches only.")
+        _redis_unavailable = True
+        return None
+    return redis
+
+
+def get_redis() -> Optional["redis.Redis"]:
+    """
+    Return a shared Redis client, or None when Redis is not configured.
+
+    The client is created on first use so importing this module never opens a
+    connection. Callers must treat None as "run in-process only".
+    """
+    global _redis_client
+
+    if _redis_client is not None or _redis_unavailable:
+        return _redis_client
+
+    redis = _redis_module()
+    if redis is None:
+        return None
+
+    _redis_client = redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=0.25,
+        socket_connect_timeout=0.25,
+        health_check_interval=30,
+    )
+    logger.info("Redis client configured.")
+    return _redis_client
+
+
+def get_async_redis() -> Optional["redis.asyncio.Redis"]:
+    """
+    Return a shared asyncio Redis client, or None when Redis is not configured.
+
+    Used where Redis is the primary store on the request path, so calls must
+    not block the event loop.
+    """
+    global _async_redis_client
+
+    if _async_redis_client is not None or _redis_unavailable:
+        return _async_redis_client
+
+    redis = _redis_module()
+    if redis is None:
+        return None
+
+    import redis.asyncio
+
+    _async_redis_client = redis.asyncio.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=1,
+        socket_connect_timeout=1,
+        health_check_interval=30,
+    )
+    logger.info("Async Redis client configured.")
+    return _async_redis_client
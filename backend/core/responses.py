@@ -0,0 +1,54 @@
+from functools import lru_cache
+from typing import Any, Mapping, Optional, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import TypeAdapter
+
+from backend.core.config import settings
+from backend.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def default_response_class() -> Type[JSONResponse]:
+    """ ORJSONResponse when FAST_JSON_RESPONSES is on and orjson is installed. """
+    if not settings.FAST_JSON_RESPONSES:
+        return JSONResponse
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        logger.warning("FAST_JSON_RESPONSES is on but orjson is not installed; using JSONResponse.")
+        return JSONResponse
+    return ORJSONResponse
+
+
+@lru_cache(maxsize=None)
+def response_adapter(model_type: Any) -> TypeAdapter:
+    """ One compiled TypeAdapter per response type, e.g. ``UserOut`` or ``List[PaymentOut]``. """
+    return TypeAdapter(model_type)
+
+
+def serialize(model_type: Any, value: Any) -> bytes:
+    """
+    JSON bytes for ``value`` as ``model_type``, converted exactly once.
+
+    An instance of ``model_type`` is dumped as is; anything else (ORM rows,
+    lists of them) is validated from attributes first.
+    """
+    adapter = response_adapter(model_type)
+    if not (isinstance(model_type, type) and isinstance(value, model_type)):
+        value = adapter.validate_python(value, from_attributes=True)
+    return adapter.dump_json(value)
+
+
+class ModelResponse(Response):
+    """
+    Pre-serialized JSON response.
+
+    FastAPI does not re-validate a returned Response against the route's
+    ``response_model``, which stays on the route for the OpenAPI schema.
+    """
+    media_type = "application/json"
+
+    def __init__(self, model_type: Any, content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None):
+        super().__init__(serialize(model_type, content), status_code=status_code, headers=headers)
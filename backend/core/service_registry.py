@@ -0,0 +1,130 @@
+import os
+import threading
+from typing import Any, Callable, Dict
+
+from backend.core.config import settings
+from backend.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ServiceRegistry:
+    """
+    External clients built on first use, one set per process.
+
+    Nothing is imported or connected at application import time. After a
+    fork (pre-fork servers, Celery prefork workers) the child drops every
+    instance inherited from the parent and builds its own, so sockets and
+    connection pools are never shared across processes.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        self._factories[name] = factory
+        self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._instances:
+                if name not in self._factories:
+                    raise KeyError(f"Unknown service: {name}")
+                self._instances[name] = self._factories[name]()
+                logger.debug("Initialized service %s", name)
+            return self._instances[name]
+
+    def is_initialized(self, name: str) -> bool:
+        return name in self._instances
+
+    def reset(self, name: str = None) -> None:
+        """ Drop one (or every) built instance; the next ``get`` rebuilds it. """
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._instances.clear()
+
+
+class LazyService:
+    """ Module-like proxy, e.g. ``stripe.Subscription.modify(...)``, resolved through the registry on use. """
+
+    def __init__(self, registry: ServiceRegistry, name: str):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._registry.get(self._name), attribute)
+
+
+### **Factories**
+def _build_stripe():
+    import stripe
+
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    return stripe
+
+
+def _build_s3_client():
+    import boto3
+
+    return boto3.client(
+        "s3",
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION,
+    )
+
+
+def _build_smtp_pool():
+    from backend.services.email_service import SMTPConnectionPool
+
+    return SMTPConnectionPool(
+        host=settings.MAIL_SERVER,
+        port=settings.MAIL_PORT,
+        username=settings.MAIL_USERNAME if settings.USE_CREDENTIALS else None,
+        password=settings.MAIL_PASSWORD if settings.USE_CREDENTIALS else None,
+        starttls=settings.MAIL_STARTTLS,
+        ssl_tls=settings.MAIL_SSL_TLS,
+        max_size=settings.SMTP_POOL_SIZE,
+    )
+
+
+def _build_celery_app():
+    from backend.tasks.celery_app import celery_app
+
+    return celery_app
+
+
+services = ServiceRegistry()
+services.register("stripe", _build_stripe)
+services.register("s3", _build_s3_client)
+services.register("smtp", _build_smtp_pool)
+services.register("celery", _build_celery_app)
+
+# Drop-in for ``import stripe``: the SDK is imported and keyed on first attribute access
+stripe = LazyService(services, "stripe")
+
+
+def get_s3_client():
+    return services.get("s3")
+
+
+def get_smtp_pool():
+    return services.get("smtp")
+
+
+def get_celery_app():
+    return services.get("celery")
@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from backend.core.cache import TTLCache
+from backend.core.config import settings
+from backend.core.logging_config import get_logger
+from backend.core.redis_client import get_async_redis
+
+logger = get_logger(__name__)
+
+
+class TTLStore(ABC):
+    """
+    Small async key/value store for ephemeral state that must expire.
+
+    Keys live in a namespace. Values must be JSON-serializable so the same
+    caller works against either backend.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """ Return the value, or None if missing or expired. """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """ Store a value for ``ttl`` seconds. """
+
+    @abstractmethod
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        """ Store a value only if the key is absent; return whether it was stored. """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """ Remove a key. """
+
+    @abstractmethod
+    async def ttl(self, key: str) -> Optional[float]:
+        """ Seconds until the key expires, or None if it does not exist. """
+
+
+class MemoryTTLStore(TTLStore):
+    """ Per-process store on a bounded LRU+TTL cache. """
+
+    def __init__(self, namespace: str, maxsize: int, max_ttl: float = 7 * 24 * 3600):
+        super().__init__(namespace)
+        self._cache = TTLCache(maxsize=maxsize, ttl=max_ttl)
+        self._lock = threading.Lock()
+
+    async def get(self, key):
+        item = self._cache.get(self._key(key))
+        return None if item is None else item[0]
+
+    async def set(self, key, value, ttl):
+        self._cache.set(self._key(key), (value, time.monotonic() + ttl), ttl=ttl)
+
+    async def add(self, key, value, ttl):
+        with self._lock:
+            if self._cache.get(self._key(key)) is not None:
+                return False
+            self._cache.set(self._key(key), (value, time.monotonic() + ttl), ttl=ttl)
+            return True
+
+    async def delete(self, key):
+        self._cache.pop(self._key(key))
+
+    async def ttl(self, key):
+        item = self._cache.get(self._key(key))
+        return None if item is None else max(0.0, item[1] - time.monotonic())
+
+
+class RedisTTLStore(TTLStore):
+    """ Store shared by every worker, using Redis key expiry. """
+
+    def __init__(self, namespace: str, client):
+        super().__init__(namespace)
+        self.client = client
+
+    async def get(self, key):
+        raw = await self.client.get(self._key(key))
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key, value, ttl):
+        await self.client.set(self._key(key), json.dumps(value), px=max(1, int(ttl * 1000)))
+
+    async def add(self, key, value, ttl):
+        return bool(await self.client.set(self._key(key), json.dumps(value), px=max(1, int(ttl * 1000)), nx=True))
+
+    async def delete(self, key):
+        await self.client.delete(self._key(key))
+
+    async def ttl(self, key):
+        remaining = await self.client.pttl(self._key(key))
+        return None if remaining < 0 else remaining / 1000
+
+
+def get_ttl_store(namespace: str) -> TTLStore:
+    """ Return a Redis-backed store when Redis is configured, otherwise an in-memory one. """
+    client = get_async_redis()
+    if client is not None:
+        return RedisTTLStore(namespace, client)
+    return MemoryTTLStore(namespace, maxsize=settings.TTL_STORE_MAX_ENTRIES)
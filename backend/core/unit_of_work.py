@@ -0,0 +1,61 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import Scope
+
+from backend.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Key under which the unit of work lives in the ASGI scope.
+SCOPE_KEY = "yoked.unit_of_work"
+
+
+class RequestUnitOfWork:
+    """
+    One database session shared by everything that handles a single request.
+
+    The session is only opened the first time ``session`` is read, so requests
+    answered from caches never touch the pool. ``complete`` commits or rolls
+    back once and closes the session.
+    """
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def opened(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    async def commit(self) -> None:
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def complete(self, success: bool) -> None:
+        """ Commit on success, roll back otherwise, and release the connection. """
+        if self._session is None:
+            return
+        try:
+            if success:
+                await self._session.commit()
+            else:
+                await self._session.rollback()
+        finally:
+            await self._session.close()
+            self._session = None
+
+
+def get_unit_of_work(scope: Scope) -> Optional[RequestUnitOfWork]:
+    """ Return the unit of work attached to this request, if any. """
+    return scope.get(SCOPE_KEY)
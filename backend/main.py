@@ -1,12 +1,14 @@
-import subprocess
-import signal
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.api.middlewares.admin_middleware import AdminValidationMiddleware
-from backend.api.middlewares.mfa_middleware import MFAMiddleware
+from backend.api.middlewares.auth_middleware import AuthMiddleware
+from backend.api.middlewares.route_policy import route_policies
+from backend.api.middlewares.logging_middleware import RequestLoggingMiddleware
+from backend.api.middlewares.unit_of_work_middleware import UnitOfWorkMiddleware
 from backend.api.payments.webhooks.stripe_webhook import stripe_webhook
 from backend.core.config import settings
 from backend.api.auth.auth_routes import router as auth_router
@@ -16,11 +18,15 @@ from backend.api.workouts.workout_routes import router as workout_router
 from backend.api.payments.webhooks.stripe_webhook import router as stripe_webhook
 from backend.api.subscriptions.subscription_routes import router as subscription_router
 from backend.api.admin.admin_routes import router as admin_router
-from backend.api.middlewares.session_middleware import SessionValidationMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
-from backend.core.database import init_db, get_db, engine
-from backend.core.logging_config import get_logger
-from backend.tasks.celery_app import celery_app
+from backend.core.database import init_db, engine, async_engine
+from backend.core.lifecycle import draining
+from backend.api.subscriptions.tier_catalog import tier_catalog
+from backend.core.logging_config import get_logger, shutdown_logging
+from backend.core.responses import default_response_class
+from backend.services.session_activity import session_activity
+from backend.services.session_audit import session_audit
+from backend.core.password_hashing import password_hasher
 
 
 # Initialize logging
@@ -32,6 +38,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="Welcome to the Yoked Fitness API",
     debug=settings.DEBUG,
+    default_response_class=default_response_class(),
 )
 
 # Middleware: HTTPS
@@ -42,40 +49,16 @@ if not settings.DEBUG:
 # Parse ALLOWED_HOSTS from settings
 allowed_origins = settings.ALLOWED_HOSTS.split(",")
 
-@app.middleware("http")
-async def log_request(request: Request, call_next):
-    logger.info(f"Processing request {request.method} {request.url}")
-    response = await call_next(request)
-    logger.info(f"Response status: {response.status_code}")
-    return response
+# Middleware: Authentication (session, MFA and admin checks in one pass)
+app.add_middleware(AuthMiddleware)
+logger.info("Auth middleware added.")
 
-# Middleware: Inject DB Session
-@app.middleware("http")
-async def db_session_middleware(request: Request, call_next):
-    request.state.db = get_db
-    response = await call_next(request)
-    return response
+# Middleware: Request-scoped DB session (must wrap the auth middleware)
+app.add_middleware(UnitOfWorkMiddleware)
+logger.info("Unit of work middleware added.")
 
-# Middleware: Session Validation
-try:
-    app.add_middleware(SessionValidationMiddleware)
-    logger.info("Session validation middleware added.")
-except Exception as e:
-    logger.error(f"Failed to add session middleware: {e}")
-
-# Middleware: MFA Validation
-try:
-    app.add_middleware(MFAMiddleware)
-    logger.info("MFA validation middleware added.")
-except Exception as e:
-    logger.error(f"Failed to add mfa middleware: {e}")
-
-# Middleware: Admin Validation
-try:
-    app.add_middleware(AdminValidationMiddleware)
-    logger.info("Admin validation middleware added.")
-except Exception as e:
-    logger.error(f"Failed to add admin middleware: {e}")
+# Middleware: Request logging
+app.add_middleware(RequestLoggingMiddleware)
 
 # Configure CORS Middleware
 app.add_middleware(
@@ -86,7 +69,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-logger.info(f"CORS middleware configured with origins: {allowed_origins}")
+logger.info("CORS middleware configured with origins: %s", allowed_origins)
 
 # Static files for frontend
 try:
@@ -138,79 +121,6 @@ try:
 except Exception as e:
     logger.error(f"Failed to register Admin router: {e}")
 
-# Startup Event
-redis_server = None
-celery_worker = None
-celery_beat = None
-
-def start_redis():
-    """
-    Start the Redis server in the background.
-    """
-    global redis_server
-    try:
-        redis_server = subprocess.Popen(
-            ["redis-server"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        logger.info("Redis server started.")
-    except Exception as e:
-        logger.error(f"Failed to start Redis server: {e}")
-        raise
-
-def stop_redis():
-    """
-    Stop the Redis server.
-    """
-    global redis_server
-    try:
-        if redis_server:
-            redis_server.terminate()
-            redis_server.wait()
-            logger.info("Redis server stopped.")
-    except Exception as e:
-        logger.error(f"Error stopping Redis server: {e}")
-
-def start_celery():
-    """
-    Start Celery worker and beat scheduler.
-    """
-    global celery_worker, celery_beat
-    try:
-        celery_worker = subprocess.Popen(
-            ["celery", "-A", "backend.tasks.celery_app", "worker", "--loglevel=info"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        celery_beat = subprocess.Popen(
-            ["celery", "-A", "backend.tasks.celery_app", "beat", "--loglevel=info"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        logger.info("Celery worker and beat scheduler started.")
-    except Exception as e:
-        logger.error(f"Failed to start Celery: {e}")
-        raise
-
-def stop_celery():
-    """
-    Stop Celery worker and beat scheduler.
-    """
-    global celery_worker, celery_beat
-    try:
-        if celery_worker:
-            celery_worker.terminate()
-            celery_worker.wait()
-            logger.info("Celery worker stopped.")
-
-        if celery_beat:
-            celery_beat.terminate()
-            celery_beat.wait()
-            logger.info("Celery beat scheduler stopped.")
-    except Exception as e:
-        logger.error(f"Error stopping Celery: {e}")
-
 # FastAPI startup event
 @app.on_event("startup")
 async def startup_event():
@@ -219,8 +129,10 @@ async def startup_event():
     """
     logger.info("Starting application...")
     try:
-        start_redis()
-        start_celery()
+        session_activity.start()
+        tier_catalog.start()
+        if settings.SESSION_BACKEND == "redis" and settings.SESSION_POSTGRES_AUDIT:
+            session_audit.start()
     except Exception as e:
         logger.critical(f"Error during startup: {e}")
         raise
@@ -233,24 +145,46 @@ async def shutdown_event():
     """
     logger.info("Shutting down application...")
     try:
-        stop_redis()
-        stop_celery()
+        session_audit.stop()
+        session_activity.stop()
+        await tier_catalog.stop()
+        password_hasher.shutdown()
         engine.dispose()
+        await async_engine.dispose()
         logger.info("Clean shutdown completed.")
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
+    finally:
+        shutdown_logging()
 
 # Health Check Endpoint
 @app.get("/health", tags=["System"])
 def health_check():
     return {"status": "ok", "environment": settings.ENV}
 
+@app.get("/health/ready", tags=["System"])
+async def readiness_check():
+    """ 200 while this worker should receive traffic: not draining and the database answers. """
+    if draining.is_set():
+        return JSONResponse(status_code=503, content={"status": "draining"})
+    try:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning(f"Readiness check failed: {e}")
+        return JSONResponse(status_code=503, content={"status": "unavailable"})
+    return {"status": "ready"}
+
+# Compile auth policies once every route is registered
+route_policies.compile(app.routes)
+
+# Development server; production runs `python -m backend.serve`
 if __name__ == "__main__":
     logger.info("Starting Uvicorn server...")
     uvicorn.run(
         "backend.main:app",
         host=settings.HOST,
-        port=8000,
+        port=settings.PORT,
         reload=settings.DEBUG,
         ssl_keyfile=settings.SSL_KEYFILE if not settings.DEBUG else None,
         ssl_certfile=settings.SSL_CERTFILE if not settings.DEBUG else None,
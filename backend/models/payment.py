@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, UUID
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, UUID, Index
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 from backend.core.database import Base
@@ -39,6 +39,12 @@ class Payment(Base):
     renewal_date = Column(DateTime, nullable=True)
     timestamp = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
 
+    # Keyset pagination: (timestamp, id) seeks, newest first (see payment_service._payment_page)
+    __table_args__ = (
+        Index("ix_payments_user_id_timestamp_id", user_id, timestamp.desc(), id.desc()),
+        Index("ix_payments_timestamp_id", timestamp.desc(), id.desc()),
+    )
+
     # Relationships
     user = relationship("User", back_populates="payments")
     subscription = relationship("UserSubscription", back_populates="payments")
@@ -21,6 +21,11 @@ class PaymentStatus(str, Enum):
     COMPLETE = "COMPLETE"
 
 
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 # Payment Create Schema
 class PaymentCreate(BaseModel):
     user_id: Optional[UUID4] = Field(None, description="The UUID of the user making the payment")
@@ -65,24 +70,25 @@ class PaymentVerify(BaseModel):
         orm_mode = True
 
 
-# User Payment History Schema
-class PaymentHistory(BaseModel):
-    payments: List[PaymentOut] = Field(..., description="List of payments for the user")
-    total_amount_spent: Optional[int] = Field(0, description="Total amount spent by the user in cents")
+# Keyset Page Schema
+class PaymentPage(BaseModel):
+    payments: List[PaymentOut] = Field(..., description="Payments on this page, newest first")
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to get the next page; null on the last page")
+    total: Optional[int] = Field(None, description="Total matching payments, when requested")
+    total_is_estimate: bool = Field(False, description="Whether `total` is a planner estimate rather than an exact count")
 
     class Config:
         orm_mode = True
 
 
-# Admin Payment History Schema
-class AdminPaymentHistory(BaseModel):
-    user_id: UUID = Field(..., description="UUID of the user")
-    user_email: str = Field(..., description="Email of the user")
-    payments: List[PaymentOut] = Field(..., description="List of payments made by the user")
+# User Payment History Schema
+class PaymentHistory(PaymentPage):
     total_amount_spent: Optional[int] = Field(0, description="Total amount spent by the user in cents")
 
-    class Config:
-        orm_mode = True
+
+# Admin Payment History Schema
+class AdminPaymentHistory(PaymentPage):
+    pass
 
 # Subscription Details Schema
 class UserSubscriptionDetails(BaseModel):
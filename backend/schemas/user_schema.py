@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from pydantic import BaseModel, Field, EmailStr, UUID4, PositiveInt, PositiveFloat
+from pydantic import BaseModel, Field, EmailStr, UUID4, PositiveInt, PositiveFloat, field_validator
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -96,6 +96,12 @@ class UserOut(UserBase):
     mfa_secret: Optional[str] = Field(None, description="MFA secret key for TOTP")
     mfa_backup_codes: Optional[List[str]] = Field(None, description="Backup codes for MFA")
 
+    @field_validator("followers", "following", "friend_requests_sent", "friend_requests_received", mode="before")
+    @classmethod
+    def related_user_ids(cls, value):
+        """ Relationship collections hold User objects; the API exposes their IDs. """
+        return [getattr(item, "id", item) for item in value or []]
+
     class Config:
         from_attributes = True
 
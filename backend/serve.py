@@ -0,0 +1,300 @@
+"""
+Process entry point for running Yoked.
+
+    python -m backend.serve                  # roles from SERVE_ROLES (default: web)
+    python -m backend.serve web --workers 4
+    python -m backend.serve worker email-worker beat
+    python -m backend.serve all              # redis + celery + web, for local development
+
+``web`` imports the app once in the supervisor and forks WEB_CONCURRENCY
+uvicorn workers that share one listening socket. The supervisor restarts
+workers that die, reports ready once every worker is serving and
+``/health/ready`` answers, and on SIGTERM/SIGINT drains: readiness turns
+503, then workers finish in-flight requests before exiting. Redis and the
+Celery roles run as separate supervised processes, one of each per
+deployment rather than one per web worker.
+"""
+import argparse
+import asyncio
+import importlib
+import multiprocessing
+import os
+import signal
+import socket
+import ssl
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+from backend.core.config import settings
+from backend.core.lifecycle import draining
+from backend.core.logging_config import configure_logging, get_logger, shutdown_logging
+
+logger = get_logger(__name__)
+
+WEB_ROLE = "web"
+CELERY_APP = "backend.tasks.celery_app"
+PROCESS_ROLES: Dict[str, List[str]] = {
+    "redis": ["redis-server"],
+    "worker": ["celery", "-A", CELERY_APP, "worker", "--loglevel=info"],
+    "email-worker": ["celery", "-A", CELERY_APP, "worker", "-Q", settings.EMAIL_QUEUE, "-n", "email@%h", "--loglevel=info"],
+    "beat": ["celery", "-A", CELERY_APP, "beat", "--loglevel=info"],
+}
+ALL_ROLES = ("redis", "worker", "email-worker", "beat", WEB_ROLE)
+# Stop order: the web tier first, Redis last
+STOP_ORDER = (WEB_ROLE, "beat", "worker", "email-worker", "redis")
+RESTART_DELAY_SECONDS = 1.0
+
+
+def role_environment(role: str) -> dict:
+    """ Celery processes get the small Celery pool profile unless everything goes through PgBouncer. """
+    env = dict(os.environ)
+    if role in ("worker", "email-worker", "beat") and settings.DB_POOL_PROFILE != "pgbouncer":
+        env["DB_POOL_PROFILE"] = "celery"
+    return env
+
+
+def load_app(app_path: str):
+    module_name, _, attribute = app_path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+### **Web Worker (runs in the forked child)**
+def _run_web_worker(app, sock: socket.socket, ready, ssl_files) -> None:
+    # Uvicorn installs its own SIGINT/SIGTERM handlers for the graceful shutdown;
+    # these only swallow the signal it re-raises once it has finished.
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: None)
+    configure_logging()  # The supervisor's log writer thread did not survive the fork
+
+    # Never reuse connections a pool might have opened in the supervisor
+    from backend.core.database import async_engine, engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+    import uvicorn
+
+    config = uvicorn.Config(
+        app,
+        lifespan="on",
+        log_config=None,
+        access_log=False,  # RequestLoggingMiddleware already logs each request
+        timeout_graceful_shutdown=settings.SERVE_GRACEFUL_TIMEOUT,
+        ssl_keyfile=ssl_files[0],
+        ssl_certfile=ssl_files[1],
+    )
+    server = uvicorn.Server(config)
+
+    async def serve():
+        task = asyncio.create_task(server.serve(sockets=[sock]))
+        while not server.started and not task.done():
+            await asyncio.sleep(0.05)
+        if server.started:
+            ready.set()
+        await task
+
+    exit_code = 0
+    try:
+        asyncio.run(serve())
+    except BaseException:
+        logger.exception("Web worker crashed")
+        exit_code = 1
+    finally:
+        shutdown_logging()
+    os._exit(exit_code)
+
+
+### **Supervisor**
+class Supervisor:
+    """ Starts the requested roles, keeps them running and stops them gracefully. """
+
+    def __init__(
+        self,
+        roles: List[str],
+        workers: int = 1,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        app_path: str = "backend.main:app",
+        ready_path: str = "/health/ready",
+    ):
+        self.roles = [role for role in ALL_ROLES if role in roles]
+        self.workers = max(1, workers)
+        self.host = host
+        self.port = port
+        self.app_path = app_path
+        self.ready_path = ready_path
+        self.ssl_files = (settings.SSL_KEYFILE, settings.SSL_CERTFILE) if settings.SSL_KEYFILE else (None, None)
+        self.processes: Dict[str, subprocess.Popen] = {}
+        self.web_workers: Dict[int, "multiprocessing.synchronize.Event"] = {}
+        self.stopping = False
+        self.failed = False
+        self.app = None
+        self.sock: Optional[socket.socket] = None
+
+    def _request_stop(self, signum, _frame):
+        if not self.stopping:
+            logger.info("Received %s, shutting down.", signal.Signals(signum).name)
+        self.stopping = True
+
+    # External processes
+    def _start_process(self, role: str) -> None:
+        # Output is inherited, never piped: an unread pipe eventually blocks the child
+        self.processes[role] = subprocess.Popen(PROCESS_ROLES[role], env=role_environment(role))
+        logger.info("Started %s (pid %s).", role, self.processes[role].pid)
+
+    def _stop_process(self, role: str) -> None:
+        process = self.processes.pop(role, None)
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=settings.SERVE_GRACEFUL_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        logger.info("Stopped %s.", role)
+
+    # Web workers
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET6 if ":" in self.host else socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        self.port = sock.getsockname()[1]
+        return sock
+
+    def _spawn_web_worker(self) -> None:
+        ready = multiprocessing.Event()
+        pid = os.fork()
+        if pid == 0:
+            _run_web_worker(self.app, self.sock, ready, self.ssl_files)
+        self.web_workers[pid] = ready
+
+    def _reap_web_workers(self) -> int:
+        """ Collect exited workers; return how many died. """
+        died = 0
+        for pid in list(self.web_workers):
+            finished, status = os.waitpid(pid, os.WNOHANG)
+            if finished:
+                self.web_workers.pop(pid)
+                died += 1
+                log = logger.info if self.stopping else logger.warning
+                log("Web worker %s exited with status %s.", pid, os.waitstatus_to_exitcode(status))
+        return died
+
+    def _stop_web_workers(self) -> None:
+        for pid in self.web_workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + settings.SERVE_GRACEFUL_TIMEOUT + 5
+        while self.web_workers and time.monotonic() < deadline:
+            self._reap_web_workers()
+            time.sleep(0.1)
+        for pid in self.web_workers:
+            logger.warning("Web worker %s did not drain in time; killing it.", pid)
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.web_workers.clear()
+        logger.info("Web workers stopped.")
+
+    # Readiness
+    def probe(self) -> bool:
+        """ True once the app's readiness endpoint answers 200. """
+        scheme = "https" if self.ssl_files[0] else "http"
+        host = "127.0.0.1" if self.host in ("0.0.0.0", "") else "::1" if self.host == "::" else self.host
+        host = f"[{host}]" if ":" in host else host
+        request = urllib.request.Request(
+            f"{scheme}://{host}:{self.port}{self.ready_path}",
+            headers={"X-Forwarded-Proto": "https"},  # Don't get redirected by HTTPSRedirectMiddleware
+        )
+        context = ssl._create_unverified_context() if scheme == "https" else None
+        try:
+            with urllib.request.urlopen(request, timeout=2, context=context) as response:
+                return response.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
+
+    def wait_until_ready(self) -> bool:
+        deadline = time.monotonic() + settings.SERVE_READY_TIMEOUT
+        while time.monotonic() < deadline and not self.stopping:
+            self._reap_web_workers()
+            if self.web_workers and all(event.is_set() for event in self.web_workers.values()) and self.probe():
+                return True
+            time.sleep(0.2)
+        return False
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        for role in self.roles:
+            if role != WEB_ROLE:
+                self._start_process(role)
+
+        if WEB_ROLE in self.roles:
+            self.app = load_app(self.app_path)  # Preloaded once; workers share it copy-on-write
+            self.sock = self._bind()
+            for _ in range(self.workers):
+                self._spawn_web_worker()
+            if self.wait_until_ready():
+                logger.info("Ready: %s web workers on %s:%s.", self.workers, self.host, self.port)
+            elif not self.stopping:
+                logger.error("Web workers were not ready within %ss.", settings.SERVE_READY_TIMEOUT)
+                self.stopping = self.failed = True
+
+        while not self.stopping:
+            if WEB_ROLE in self.roles:
+                if self._reap_web_workers():
+                    time.sleep(RESTART_DELAY_SECONDS)
+                while not self.stopping and len(self.web_workers) < self.workers:
+                    self._spawn_web_worker()
+            for role, process in list(self.processes.items()):
+                if process.poll() is not None and not self.stopping:
+                    logger.warning("%s exited with status %s; restarting.", role, process.returncode)
+                    time.sleep(RESTART_DELAY_SECONDS)
+                    self._start_process(role)
+            time.sleep(0.5)
+
+        for role in STOP_ORDER:
+            if role == WEB_ROLE and self.web_workers:
+                # Fail readiness first so load balancers stop routing here, then drain
+                draining.set()
+                time.sleep(settings.SERVE_DRAIN_SECONDS)
+                self._stop_web_workers()
+            elif role in self.processes:
+                self._stop_process(role)
+        if self.sock is not None:
+            self.sock.close()
+        logger.info("Shutdown complete.")
+        return 1 if self.failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.serve", description="Run Yoked server roles.")
+    parser.add_argument("roles", nargs="*", choices=ALL_ROLES + ("all",), help="Roles to run (default: SERVE_ROLES).")
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY, help="Web worker processes.")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--app", default="backend.main:app", help="ASGI app as module:attribute.")
+    parser.add_argument("--ready-path", default="/health/ready", help="Readiness endpoint to wait for.")
+    args = parser.parse_args(argv)
+
+    roles = args.roles or [role.strip() for role in settings.SERVE_ROLES.split(",") if role.strip()]
+    if "all" in roles:
+        roles = list(ALL_ROLES)
+    supervisor = Supervisor(roles, workers=args.workers, host=args.host, port=args.port, app_path=args.app, ready_path=args.ready_path)
+    try:
+        return supervisor.run()
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import smtplib
+import ssl
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from email.message import EmailMessage
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.core.config import settings
+from backend.core.logging_config import get_logger
+from backend.core.service_registry import get_celery_app
+from backend.templates.email_templates import email_templates
+
+# Logger setup
+logger = get_logger(__name__)
+
+
+def render_email(template_name: str, context: dict) -> str:
+    """ Render a registered template; done on the worker, not in the request. """
+    return email_templates.render(template_name, context)
+
+
+### **SMTP Connection Pool**
+class SMTPConnectionPool:
+    """
+    Bounded pool of authenticated SMTP connections for one worker process.
+
+    Connections are reused until they have been idle for ``max_idle`` seconds
+    or have sent ``max_messages`` messages; an idle connection is checked
+    with NOOP before reuse. Broken connections are dropped, never returned.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        ssl_tls: bool = False,
+        max_size: int = 4,
+        max_idle: float = 60,
+        max_messages: int = 100,
+        timeout: float = 10,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.ssl_tls = ssl_tls
+        self.max_idle = max_idle
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self._idle = deque()  # (connection, last_used, sent)
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.ssl_tls:
+            connection = smtplib.SMTP_SSL(
+                self.host, self.port, timeout=self.timeout, context=ssl.create_default_context()
+            )
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                connection.starttls(context=ssl.create_default_context())
+        if self.username:
+            connection.login(self.username, self.password)
+        self.connections_opened += 1
+        return connection
+
+    def _take_idle(self):
+        with self._lock:
+            while self._idle:
+                connection, last_used, sent = self._idle.pop()
+                if time.monotonic() - last_used < self.max_idle and sent < self.max_messages:
+                    return connection, sent
+                self._quit(connection)
+        return None, 0
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        connection, sent = self._take_idle()
+        try:
+            if connection is not None:
+                try:
+                    connection.noop()
+                except (smtplib.SMTPException, OSError):
+                    self._quit(connection)
+                    connection = None
+            if connection is None:
+                connection, sent = self._connect(), 0
+
+            try:
+                yield connection
+            except (smtplib.SMTPServerDisconnected, OSError):
+                self._quit(connection)
+                connection = None
+                raise
+            finally:
+                if connection is not None:
+                    with self._lock:
+                        self._idle.append((connection, time.monotonic(), sent + 1))
+        finally:
+            self._slots.release()
+
+    def send(self, message: EmailMessage) -> None:
+        with self.connection() as connection:
+            connection.send_message(message)
+
+    @staticmethod
+    def _quit(connection) -> None:
+        try:
+            connection.quit()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            while self._idle:
+                self._quit(self._idle.pop()[0])
+
+
+def build_message(subject: str, recipient: str, html: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = settings.MAIL_FROM
+    message["To"] = recipient
+    message.set_content("This email requires an HTML-capable client.")
+    message.add_alternative(html, subtype="html")
+    return message
+
+
+### **Request-side Enqueueing**
+async def queue_email(subject: str, recipient: str, template_name: str, context: dict) -> bool:
+    """
+    Hand a transactional email to the Celery email queue.
+
+    Returns False (and logs) if the broker cannot be reached, so callers can
+    decide whether that matters instead of failing the request.
+    """
+    try:
+        # Sent by name: the API process never imports the task modules
+        await run_in_threadpool(
+            get_celery_app().send_task,
+            "backend.tasks.email_tasks.send_email_task",
+            args=(subject, recipient, template_name, context),
+            retry=True,
+            retry_policy={"max_retries": 2, "interval_start": 0, "interval_step": 0.2, "interval_max": 0.5},
+        )
+        logger.info("Queued '%s' email to %s", template_name, recipient)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to queue '{template_name}' email to {recipient}: {e}")
+        return False
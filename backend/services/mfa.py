@@ -1,64 +1,163 @@
-import pyotp
-import qrcode
-from io import BytesIO
+import asyncio
 import base64
-from sqlalchemy.orm import Session
+import hashlib
+import hmac
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Optional
+
+import pyotp
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
 from backend.models.user import User
+from backend.core.config import settings
 from backend.core.logging_config import get_logger
+from backend.core.ttl_store import MemoryTTLStore, get_ttl_store
 
 # Logger setup
 logger = get_logger(__name__)
 
+ISSUER_NAME = "Yoked App"
+QR_MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+# QR rendering is CPU work; keep it off the event loop and the request threadpool.
+_qr_executor = ThreadPoolExecutor(max_workers=settings.MFA_QR_WORKERS, thread_name_prefix="mfa-qr")
+
+# Nothing that reveals a TOTP secret is written to Redis. A rendered QR code
+# encodes its secret, so QR codes stay in process; a pending admin setup is
+# shared as a random nonce, and its secret is derived from it with SECRET_KEY.
+qr_cache = MemoryTTLStore("mfa-qr", maxsize=settings.TTL_STORE_MAX_ENTRIES)
+pending_setups = get_ttl_store("mfa-pending")
+used_codes = get_ttl_store("mfa-used")
+
+
+def _secret_key(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def _pending_secret(user_id, nonce: str) -> str:
+    """ The TOTP secret for a pending setup: 160 bits of HMAC-SHA256 keyed with SECRET_KEY, in base32. """
+    digest = hmac.new(settings.SECRET_KEY.encode(), f"mfa-pending:{user_id}:{nonce}".encode(), hashlib.sha256).digest()
+    return base64.b32encode(digest[:20]).decode()
+
+### **Render a QR Code**
+def render_qr_code(provisioning_uri: str, image_format: str = "png") -> str:
+    """
+    Render a provisioning URI as a base64 data URI. SVG is much cheaper than PNG.
+    """
+    import qrcode
+    import qrcode.image.svg
+
+    buffer = BytesIO()
+    if image_format == "svg":
+        qrcode.make(provisioning_uri, image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qrcode.make(provisioning_uri).save(buffer, format="PNG")
+    encoded = base64.b64encode(buffer.getvalue()).decode("utf-8")
+    return f"data:{QR_MEDIA_TYPES[image_format]};base64,{encoded}"
+
+
+async def get_qr_code(secret: str, email: str, image_format: Optional[str] = None) -> str:
+    """
+    Return the QR data URI for a secret, rendered at most once per MFA_QR_CACHE_SECONDS.
+    """
+    image_format = image_format or settings.MFA_QR_FORMAT
+    if image_format not in QR_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported QR code format")
+
+    cache_key = f"{_secret_key(secret)}:{image_format}"
+    cached = await qr_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    provisioning_uri = pyotp.TOTP(secret).provisioning_uri(name=email, issuer_name=ISSUER_NAME)
+    loop = asyncio.get_running_loop()
+    qr_code = await loop.run_in_executor(_qr_executor, render_qr_code, provisioning_uri, image_format)
+    await qr_cache.set(cache_key, qr_code, ttl=settings.MFA_QR_CACHE_SECONDS)
+    return qr_code
+
 ### **Generate MFA Secret**
-def generate_mfa_secret(email: str):
+async def generate_mfa_secret(email: str, image_format: Optional[str] = None):
     """
     Generates a TOTP secret and QR code for MFA setup.
     """
-    logger.info(f"Generating MFA secret for email: {email}")
+    logger.info("Generating MFA secret for email: %s", email)
     try:
         secret = pyotp.random_base32()
-        totp = pyotp.TOTP(secret)
-        provisioning_uri = totp.provisioning_uri(name=email, issuer_name="Yoked App")
-
-        # Generate QR Code
-        qr_code_img = qrcode.make(provisioning_uri)
-        buffer = BytesIO()
-        qr_code_img.save(buffer, format="PNG")
-        qr_code_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
-
         return {
             "mfa_secret": secret,
-            "qr_code": f"data:image/png;base64,{qr_code_base64}",
+            "qr_code": await get_qr_code(secret, email, image_format),
             "manual_key": secret
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating MFA secret for email {email}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate MFA secret")
 
+### **Pending MFA Setup**
+async def get_pending_mfa_setup(user_id, email: str, image_format: Optional[str] = None):
+    """
+    Return the user's pending (not yet confirmed) MFA secret, creating one if needed.
+
+    Reloading the setup page within MFA_QR_CACHE_SECONDS shows the same secret
+    and reuses the already rendered QR code. Only a nonce is stored, so
+    read access to Redis is not enough to enroll as the user.
+    """
+    nonce = await pending_setups.get(str(user_id))
+    if nonce is None:
+        nonce = secrets.token_urlsafe(16)
+        if not await pending_setups.add(str(user_id), nonce, ttl=settings.MFA_QR_CACHE_SECONDS):
+            nonce = await pending_setups.get(str(user_id)) or nonce  # A concurrent reload won
+    secret = _pending_secret(user_id, nonce)
+    try:
+        return {"mfa_secret": secret, "qr_code": await get_qr_code(secret, email, image_format), "manual_key": secret}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating MFA setup for email {email}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to generate MFA secret")
+
+
+async def clear_pending_mfa_setup(user_id) -> None:
+    await pending_setups.delete(str(user_id))
+
 ### **Verify MFA Code**
-def verify_mfa_code(secret: str, code: str) -> bool:
+async def verify_mfa_code(secret: str, code: str) -> bool:
     """
     Verifies the provided TOTP code using the secret.
+
+    Codes are accepted within MFA_TOTP_VALID_WINDOW steps of now, and each
+    code can be used once: accepted codes are remembered until they can no
+    longer be valid.
     """
-    logger.info("Verifying MFA code")
+    logger.debug("Verifying MFA code")
     try:
         totp = pyotp.TOTP(secret)
-        return totp.verify(code)
+        window = settings.MFA_TOTP_VALID_WINDOW
+        if not totp.verify(code, valid_window=window):
+            return False
+
+        replay_ttl = totp.interval * (2 * window + 1)
+        if not await used_codes.add(f"{_secret_key(secret)}:{code}", True, ttl=replay_ttl):
+            logger.warning("Rejected replayed MFA code")
+            return False
+        return True
     except Exception as e:
         logger.error(f"Error verifying MFA code: {str(e)}")
         return False
 
 ### **Reset MFA for a User**
-def reset_mfa(user_id: str, db: Session):
+async def reset_mfa(user_id: str, db: AsyncSession):
     """
     Reset the MFA configuration for a user.
     Clears the MFA secret and backup codes from the user.
     """
-    logger.info(f"Resetting MFA for user_id: {user_id}")
+    logger.info("Resetting MFA for user_id: %s", user_id)
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
@@ -66,10 +165,10 @@ def reset_mfa(user_id: str, db: Session):
         user.mfa_secret = None
         user.mfa_backup_codes = None
         user.mfa_enabled = False
-        db.commit()
+        await db.commit()
 
-        logger.info(f"MFA reset successfully for user_id: {user_id}")
+        logger.info("MFA reset successfully for user_id: %s", user_id)
     except SQLAlchemyError as e:
         logger.error(f"Database error while resetting MFA for user_id {user_id}: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to reset MFA")
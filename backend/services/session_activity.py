@@ -0,0 +1,100 @@
+import threading
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import DateTime, String, column, update, values
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.core.config import settings
+from backend.core.database import SessionLocal
+from backend.core.logging_config import get_logger
+from backend.models.session import SessionModel
+
+# Logger setup
+logger = get_logger(__name__)
+
+
+class SessionActivityBuffer:
+    """
+    Write-behind buffer for ``sessions.last_activity``.
+
+    Requests only record a timestamp in memory. A background thread flushes
+    the buffer every ``interval`` seconds with a single
+    ``UPDATE ... FROM (VALUES ...)``, so each session is written at most once
+    per interval instead of once per request. ``stop`` drains what is left.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def touch(self, token: str, when: datetime = None) -> None:
+        with self._lock:
+            self._pending[token] = when or datetime.utcnow()
+
+    def discard(self, token: str) -> None:
+        with self._lock:
+            self._pending.pop(token, None)
+
+    def flush(self) -> int:
+        """ Write all buffered touches in one statement and return how many were written. """
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+
+        activity = values(
+            column("token", String),
+            column("last_activity", DateTime),
+            name="activity",
+        ).data(list(pending.items()))
+
+        stmt = (
+            update(SessionModel)
+            .where(SessionModel.token == activity.c.token)
+            .values(last_activity=activity.c.last_activity)
+            .execution_options(synchronize_session=False)
+        )
+
+        db = SessionLocal()
+        try:
+            db.execute(stmt)
+            db.commit()
+            logger.debug("Flushed last_activity for %s sessions", len(pending))
+            return len(pending)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Failed to flush session activity: {str(e)}")
+            # Put the touches back unless a newer one arrived meanwhile.
+            with self._lock:
+                for token, when in pending.items():
+                    self._pending.setdefault(token, when)
+            return 0
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="session-activity-flusher", daemon=True)
+        self._thread.start()
+        logger.info("Session activity flusher started (interval: %ss).", self.interval)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+        self.flush()
+        logger.info("Session activity flusher stopped and drained.")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.flush()
+
+
+session_activity = SessionActivityBuffer(interval=settings.SESSION_ACTIVITY_FLUSH_SECONDS)
@@ -0,0 +1,140 @@
+import queue
+import threading
+from typing import List, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.core.database import SessionLocal
+from backend.core.logging_config import get_logger
+from backend.models.session import SessionModel
+from backend.schemas.session_schema import UserSession
+
+# Logger setup
+logger = get_logger(__name__)
+
+
+class SessionAuditLog:
+    """
+    Asynchronous Postgres copy of sessions kept in another store.
+
+    Request handlers only enqueue operations. A background thread applies them
+    in batches through the sync engine, so the durable audit trail never adds
+    latency to login, MFA or logout. ``stop`` drains what is left.
+    """
+
+    def __init__(self, batch_size: int = 500, max_queue: int = 100000):
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Tuple[str, object]]" = queue.Queue(maxsize=max_queue)
+        self._thread = None
+
+    def record_created(self, session: UserSession) -> None:
+        self._put(("create", session))
+
+    def record_deleted(self, tokens: List[str]) -> None:
+        if tokens:
+            self._put(("delete", list(tokens)))
+
+    def record_mfa_verified(self, token: str) -> None:
+        self._put(("mfa", token))
+
+    def _put(self, operation) -> None:
+        try:
+            self._queue.put_nowait(operation)
+        except queue.Full:
+            logger.error(f"Session audit queue full, dropping '{operation[0]}' record")
+
+    def flush(self) -> int:
+        """ Apply every queued operation and return how many were written. """
+        applied = 0
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return applied
+            applied += self._apply(batch)
+
+    @staticmethod
+    def _write(db, kind: str, payload) -> None:
+        if kind == "create":
+            db.add(SessionModel(**payload.model_dump()))
+        elif kind == "delete":
+            db.execute(delete(SessionModel).where(SessionModel.token.in_(payload)))
+        elif kind == "mfa":
+            db.execute(update(SessionModel).where(SessionModel.token == payload).values(mfa_verified=True))
+
+    def _apply(self, batch) -> int:
+        """
+        Write a batch in one transaction; if that fails, retry it one record at a time.
+
+        One bad record (e.g. a session whose user was deleted) then costs only
+        itself, and is the only one logged as dropped.
+        """
+        db = SessionLocal()
+        try:
+            try:
+                for kind, payload in batch:
+                    self._write(db, kind, payload)
+                db.commit()
+                logger.debug("Wrote %s session audit records", len(batch))
+                return len(batch)
+            except SQLAlchemyError as e:
+                db.rollback()
+                logger.warning(f"Session audit batch of {len(batch)} failed, retrying one by one: {str(e)}")
+
+            applied = 0
+            for kind, payload in batch:
+                try:
+                    self._write(db, kind, payload)
+                    db.commit()
+                    applied += 1
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    logger.error(f"Dropped session audit '{kind}' record: {str(e)}")
+            return applied
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="session-audit-writer", daemon=True)
+        self._thread.start()
+        logger.info("Session audit writer started.")
+
+    def stop(self, timeout: float = 5) -> None:
+        if self._thread is not None:
+            try:
+                self._queue.put(("stop", None), timeout=timeout)
+            except queue.Full:
+                logger.error("Session audit queue full at shutdown; draining without the writer thread.")
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.error("Session audit writer did not stop in time.")
+            self._thread = None
+        self.flush()
+        logger.info("Session audit writer stopped and drained.")
+
+    def _run(self) -> None:
+        while True:
+            operation = self._queue.get()
+            if operation[0] == "stop":
+                return
+            batch = [operation]
+            while len(batch) < self.batch_size:
+                try:
+                    operation = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if operation[0] == "stop":
+                    self._apply(batch)
+                    return
+                batch.append(operation)
+            self._apply(batch)
+
+
+session_audit = SessionAuditLog()
@@ -0,0 +1,267 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.core.logging_config import get_logger
+from backend.core.redis_client import get_async_redis
+from backend.models.session import SessionModel
+from backend.schemas.session_schema import UserSession
+from backend.services.session_activity import session_activity
+from backend.services.session_audit import SessionAuditLog, session_audit
+
+# Logger setup
+logger = get_logger(__name__)
+
+
+class SessionStoreError(Exception):
+    """ Raised by a session backend when its store cannot be reached. """
+
+
+class SessionBackend(ABC):
+    """
+    Storage for login sessions used by ``session_service``.
+
+    Every method receives the request's ``AsyncSession`` so that backends
+    living in Postgres can share the request's transaction; other backends
+    ignore it.
+    """
+
+    name = "abstract"
+
+    @abstractmethod
+    async def find_active(self, user_id: UUID, is_mobile: bool, db: AsyncSession) -> Optional[UserSession]:
+        """ Return an unexpired session of the given kind for the user, if any. """
+
+    @abstractmethod
+    async def create(self, session: UserSession, db: AsyncSession) -> None:
+        """ Persist a new session. """
+
+    @abstractmethod
+    async def get(self, token: str, db: AsyncSession) -> Optional[UserSession]:
+        """ Return the session for ``token``; expired sessions may still be returned. """
+
+    @abstractmethod
+    async def mark_mfa_verified(self, token: str, db: AsyncSession) -> None:
+        """ Flag the session as MFA verified. """
+
+    @abstractmethod
+    async def delete(self, token: str, db: AsyncSession) -> None:
+        """ Remove one session. """
+
+    @abstractmethod
+    async def delete_for_user(self, user_id: UUID, db: AsyncSession, is_mobile: bool = None) -> List[str]:
+        """ Remove a user's sessions, optionally only web or mobile, and return their tokens. """
+
+    def touch(self, token: str) -> None:
+        """ Record activity on a session. Writes are buffered by session_activity. """
+        session_activity.touch(token)
+
+
+### **Postgres Backend**
+class PostgresSessionBackend(SessionBackend):
+    """ Sessions stored in the ``sessions`` table. """
+
+    name = "postgres"
+
+    async def find_active(self, user_id, is_mobile, db):
+        session = await db.scalar(select(SessionModel).where(
+            SessionModel.user_id == user_id,
+            SessionModel.is_mobile == is_mobile,
+            SessionModel.expires_at > datetime.utcnow()
+        ).limit(1))
+        return UserSession.model_validate(session) if session else None
+
+    async def create(self, session, db):
+        db.add(SessionModel(**session.model_dump()))
+        await db.commit()
+
+    async def get(self, token, db):
+        session = await db.scalar(select(SessionModel).where(SessionModel.token == token))
+        return UserSession.model_validate(session) if session else None
+
+    async def mark_mfa_verified(self, token, db):
+        await db.execute(update(SessionModel).where(SessionModel.token == token).values(mfa_verified=True))
+        await db.commit()
+
+    async def delete(self, token, db):
+        await db.execute(delete(SessionModel).where(SessionModel.token == token))
+        await db.commit()
+        session_activity.discard(token)
+
+    async def delete_for_user(self, user_id, db, is_mobile=None):
+        stmt = delete(SessionModel).where(SessionModel.user_id == user_id)
+        if is_mobile is not None:
+            stmt = stmt.where(SessionModel.is_mobile == is_mobile)
+        tokens = (await db.scalars(stmt.returning(SessionModel.token))).all()
+        await db.commit()
+        for token in tokens:
+            session_activity.discard(token)
+        return list(tokens)
+
+
+### **Redis Backend**
+TOKEN_KEY_PREFIX = "sessions:token:"
+USER_INDEX_PREFIX = "sessions:user:"
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Sessions stored in Redis with native TTL expiry.
+
+    Each session is a JSON value under ``sessions:token:<token>`` that expires
+    with the session. ``sessions:user:<user_id>`` is a set of the user's tokens
+    used for "logout all"; stale members are pruned when read. When an audit
+    log is given, every change is also copied to Postgres in the background.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, audit: Optional[SessionAuditLog] = None):
+        self.client = client
+        self.audit = audit
+
+    @staticmethod
+    def _ttl(session: UserSession) -> int:
+        return max(1, int((session.expires_at - datetime.utcnow()).total_seconds()))
+
+    async def _load_many(self, tokens) -> List[Optional[UserSession]]:
+        if not tokens:
+            return []
+        raw = await self.client.mget([TOKEN_KEY_PREFIX + token for token in tokens])
+        return [UserSession.model_validate_json(value) if value else None for value in raw]
+
+    async def _user_tokens(self, user_id) -> List[str]:
+        members = await self.client.smembers(USER_INDEX_PREFIX + str(user_id))
+        return [member.decode() if isinstance(member, bytes) else member for member in members]
+
+    async def find_active(self, user_id, is_mobile, db):
+        try:
+            tokens = await self._user_tokens(user_id)
+            sessions = await self._load_many(tokens)
+            stale = [token for token, session in zip(tokens, sessions) if session is None]
+            if stale:
+                await self.client.srem(USER_INDEX_PREFIX + str(user_id), *stale)
+        except Exception as e:
+            raise SessionStoreError(str(e)) from e
+
+        now = datetime.utcnow()
+        for session in sessions:
+            if session is not None and session.is_mobile == is_mobile and session.expires_at > now:
+                return session
+        return None
+
+    async def create(self, session, db):
+        ttl = self._ttl(session)
+        index_key = USER_INDEX_PREFIX + str(session.user_id)
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.set(TOKEN_KEY_PREFIX + session.token, session.model_dump_json(), ex=ttl)
+                pipe.sadd(index_key, session.token)
+                # The index lives as long as the user's longest session.
+                pipe.expire(index_key, ttl, nx=True)
+                pipe.expire(index_key, ttl, gt=True)
+                await pipe.execute()
+        except Exception as e:
+            raise SessionStoreError(str(e)) from e
+
+        if self.audit is not None:
+            self.audit.record_created(session)
+
+    async def get(self, token, db):
+        try:
+            raw = await self.client.get(TOKEN_KEY_PREFIX + token)
+        except Exception as e:
+            raise SessionStoreError(str(e)) from e
+        return UserSession.model_validate_json(raw) if raw else None
+
+    async def mark_mfa_verified(self, token, db):
+        session = await self.get(token, db)
+        if session is None:
+            return
+        session.mfa_verified = True
+        try:
+            await self.client.set(TOKEN_KEY_PREFIX + token, session.model_dump_json(), keepttl=True, xx=True)
+        except Exception as e:
+            raise SessionStoreError(str(e)) from e
+
+        if self.audit is not None:
+            self.audit.record_mfa_verified(token)
+
+    async def delete(self, token, db):
+        session = await self.get(token, db)
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.delete(TOKEN_KEY_PREFIX + token)
+                if session is not None:
+                    pipe.srem(USER_INDEX_PREFIX + str(session.user_id), token)
+                await pipe.execute()
+        except Exception as e:
+            raise SessionStoreError(str(e)) from e
+
+        self._forget([token])
+
+    async def delete_for_user(self, user_id, db, is_mobile=None):
+        index_key = USER_INDEX_PREFIX + str(user_id)
+        try:
+            tokens = await self._user_tokens(user_id)
+            if is_mobile is not None:
+                sessions = await self._load_many(tokens)
+                tokens = [
+                    token for token, session in zip(tokens, sessions)
+                    if session is not None and session.is_mobile == is_mobile
+                ]
+            if tokens:
+                async with self.client.pipeline(transaction=True) as pipe:
+                    pipe.delete(*(TOKEN_KEY_PREFIX + token for token in tokens))
+                    pipe.srem(index_key, *tokens)
+                    await pipe.execute()
+        except Exception as e:
+            raise SessionStoreError(str(e)) from e
+
+        self._forget(tokens)
+        return tokens
+
+    def touch(self, token: str) -> None:
+        # Only the Postgres audit copy tracks last_activity.
+        if self.audit is not None:
+            session_activity.touch(token)
+
+    def _forget(self, tokens: List[str]) -> None:
+        for token in tokens:
+            session_activity.discard(token)
+        if self.audit is not None:
+            self.audit.record_deleted(tokens)
+
+
+### **Backend Selection**
+_backend: Optional[SessionBackend] = None
+
+
+def get_session_backend() -> SessionBackend:
+    """ Return the configured backend; Redis falls back to Postgres when unavailable. """
+    global _backend
+    if _backend is not None:
+        return _backend
+
+    if settings.SESSION_BACKEND == "redis":
+        client = get_async_redis()
+        if client is not None:
+            audit = session_audit if settings.SESSION_POSTGRES_AUDIT else None
+            _backend = RedisSessionBackend(client, audit=audit)
+            logger.info("Using Redis session backend (Postgres audit copy: %s).", audit is not None)
+            return _backend
+        logger.warning("SESSION_BACKEND is 'redis' but Redis is not configured; using Postgres.")
+
+    _backend = PostgresSessionBackend()
+    return _backend
+
+
+def set_session_backend(backend: Optional[SessionBackend]) -> None:
+    """ Replace the active backend (None re-reads settings on next use). """
+    global _backend
+    _backend = backend
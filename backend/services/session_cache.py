@@ -0,0 +1,217 @@
+import asyncio
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from backend.core.cache import TTLCache
+from backend.core.config import settings
+from backend.core.logging_config import get_logger
+from backend.core.redis_client import get_async_redis, get_redis
+from backend.models.user import User
+from backend.schemas.session_schema import UserSession
+
+# Logger setup
+logger = get_logger(__name__)
+
+REDIS_KEY_PREFIX = "session:"
+PROFILE_VERSION_PREFIX = "profile_version:"
+SUBSCRIPTION_PLAN_PREFIX = "subscription_plan:"
+
+
+class SessionCache:
+    """
+    Two-tier cache of validated session snapshots keyed by token.
+
+    The local tier is a bounded LRU with a short TTL so that an invalidation
+    issued by another worker is picked up quickly. The Redis tier, when
+    configured, is shared by every worker and is cleared explicitly on logout.
+    Neither tier ever outlives the session's own ``expires_at``.
+
+    Per-user values (``profile_version``, ``subscription_plan``) live in
+    Redis only: a local copy would keep serving the old value on every
+    worker but the one that committed the change. Without Redis they are
+    not cached and callers read the users table.
+    """
+
+    def __init__(self, maxsize: int, ttl: int, redis_ttl: int):
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.redis_ttl = redis_ttl
+        self._pending = set()  # Redis writes scheduled by commit hooks
+
+    @staticmethod
+    def _remaining_seconds(session: UserSession) -> float:
+        return (session.expires_at - datetime.utcnow()).total_seconds()
+
+    async def get(self, token: str) -> Optional[UserSession]:
+        session = self.local.get(token)
+        if session is None:
+            session = await self._redis_get(token)
+            if session is not None:
+                self.local.set(token, session, ttl=self._remaining_seconds(session))
+
+        if session is not None and session.expires_at < datetime.utcnow():
+            await self.invalidate(token)
+            return None
+        return session
+
+    async def set(self, session: UserSession) -> None:
+        remaining = self._remaining_seconds(session)
+        self.local.set(session.token, session, ttl=remaining)
+
+        client = get_async_redis()
+        if client is None or remaining <= 0:
+            return
+        try:
+            await client.set(
+                REDIS_KEY_PREFIX + session.token,
+                session.model_dump_json(),
+                ex=max(1, int(min(self.redis_ttl, remaining))),
+            )
+        except Exception as e:
+            logger.warning(f"Session cache write to Redis failed: {e}")
+
+    async def invalidate(self, token: str) -> None:
+        await self.invalidate_many([token])
+
+    async def invalidate_many(self, tokens: Iterable[str]) -> None:
+        tokens = list(tokens)
+        if not tokens:
+            return
+        for token in tokens:
+            self.local.pop(token)
+
+        client = get_async_redis()
+        if client is None:
+            return
+        try:
+            await client.delete(*(REDIS_KEY_PREFIX + token for token in tokens))
+        except Exception as e:
+            logger.warning(f"Session cache invalidation in Redis failed: {e}")
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    async def get_profile_version(self, user_id) -> Optional[int]:
+        """ Last known ``profile_version`` for a user, without reading the users table. """
+        return await self._get_user_value(PROFILE_VERSION_PREFIX, user_id)
+
+    async def set_profile_version(self, user_id, version: int, committed: bool = False) -> None:
+        """
+        Remember a user's ``profile_version``.
+
+        ``committed`` values come from a just-committed change and always win.
+        Values seen on a read only fill a gap, so a slow read can never
+        replace a newer version with an older one.
+        """
+        await self._set_user_value(PROFILE_VERSION_PREFIX, user_id, version, committed)
+
+    async def get_subscription_plan(self, user_id) -> Optional[str]:
+        """ Last known ``subscription_plan`` (tier name) for a user. """
+        return await self._get_user_value(SUBSCRIPTION_PLAN_PREFIX, user_id)
+
+    async def set_subscription_plan(self, user_id, plan: str, committed: bool = False) -> None:
+        """ Same rules as ``set_profile_version``: a read never replaces a known plan. """
+        await self._set_user_value(SUBSCRIPTION_PLAN_PREFIX, user_id, plan, committed)
+
+    def publish_committed(self, prefix: str, user_id, value) -> None:
+        """
+        Record a just-committed user value from a synchronous commit hook.
+
+        The Redis write runs as a task on the running event loop; with no
+        loop (a sync route's worker thread or a Celery task) nothing async is
+        blocked, so the sync client is used.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._sync_redis_set(prefix, user_id, value)
+            return
+        task = loop.create_task(self._set_user_value(prefix, user_id, value, committed=True))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _get_user_value(self, prefix: str, user_id):
+        client = get_async_redis()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(prefix + str(user_id))
+        except Exception as e:
+            logger.warning(f"User cache read from Redis failed: {e}")
+            return None
+        if raw is None:
+            return None
+        value = raw.decode() if isinstance(raw, bytes) else raw
+        return int(value) if prefix == PROFILE_VERSION_PREFIX else value
+
+    async def _set_user_value(self, prefix: str, user_id, value, committed: bool) -> None:
+        client = get_async_redis()
+        if client is None:
+            return
+        try:
+            # Only a committed change may overwrite; a read merely fills the gap
+            await client.set(prefix + str(user_id), value, ex=self.redis_ttl, nx=not committed)
+        except Exception as e:
+            logger.warning(f"User cache write to Redis failed: {e}")
+
+    def _sync_redis_set(self, prefix: str, user_id, value) -> None:
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.set(prefix + str(user_id), value, ex=self.redis_ttl)
+        except Exception as e:
+            logger.warning(f"User cache write to Redis failed: {e}")
+
+    async def _redis_get(self, token: str) -> Optional[UserSession]:
+        client = get_async_redis()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(REDIS_KEY_PREFIX + token)
+        except Exception as e:
+            logger.warning(f"Session cache read from Redis failed: {e}")
+            return None
+        return UserSession.model_validate_json(raw) if raw else None
+
+
+session_cache = SessionCache(
+    maxsize=settings.SESSION_CACHE_SIZE,
+    ttl=settings.SESSION_CACHE_TTL_SECONDS,
+    redis_ttl=settings.SESSION_CACHE_REDIS_TTL_SECONDS,
+)
+
+
+### **User Change Tracking**
+PENDING_USER_VALUES = "pending_user_values"
+
+# User columns mirrored in the cache, with their cache key prefix
+TRACKED_USER_COLUMNS = {
+    "profile_version": PROFILE_VERSION_PREFIX,
+    "subscription_plan": SUBSCRIPTION_PLAN_PREFIX,
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session, flush_context):
+    """ Note every tracked user column this flush changed. """
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        attrs = inspect(obj).attrs
+        for column in TRACKED_USER_COLUMNS:
+            if attrs[column].history.has_changes():
+                session.info.setdefault(PENDING_USER_VALUES, {})[(column, obj.id)] = getattr(obj, column)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_user_changes(session):
+    for (column, user_id), value in session.info.pop(PENDING_USER_VALUES, {}).items():
+        session_cache.publish_committed(TRACKED_USER_COLUMNS[column], user_id, value)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session):
+    session.info.pop(PENDING_USER_VALUES, None)
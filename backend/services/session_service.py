@@ -1,16 +1,20 @@
 import uuid
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
-from backend.models.session import SessionModel as SessionModel
 from backend.core.logging_config import get_logger
 from backend.schemas.session_schema import UserSession
-from uuid import UUID
+from backend.services.session_backends import SessionStoreError, get_session_backend
+from backend.services.session_cache import session_cache
+from uuid import UUID, uuid4
 
 # Logger setup
 logger = get_logger(__name__)
 
+# Errors from any session backend
+STORE_ERRORS = (SQLAlchemyError, SessionStoreError)
+
 # Session durations
 WEB_SESSION_DURATION = timedelta(days=7)  # Web session duration
 MOBILE_SESSION_DURATION = timedelta(days=365)  # Mobile session duration
@@ -19,92 +23,126 @@ MOBILE_SESSION_DURATION = timedelta(days=365)  # Mobile session duration
 def generate_token() -> str:
     """Generate a unique session token."""
     token = str(uuid.uuid4())
-    logger.debug(f"Generated session token: {token}")
+    logger.debug("Generated session token")
     return token
 
 ### **Create a New Session**
-def create_session(user_id: UUID, db: Session, is_mobile: bool = False, mfa_verified: bool = False, device_type: str = None, location: str = None, ip_address: str = None) -> str:
+async def create_session(user_id: UUID, db: AsyncSession, is_mobile: bool = False, mfa_verified: bool = False, device_type: str = None, location: str = None, ip_address: str = None) -> str:
     """
     Create a new session for the user or return an existing active session.
     """
-    logger.info(f"Creating or fetching session for user_id: {user_id}, is_mobile: {is_mobile}")
+    logger.debug("Creating or fetching session for user_id: %s, is_mobile: %s", user_id, is_mobile)
+    backend = get_session_backend()
 
     try:
-        existing_session = db.query(SessionModel).filter(
-            SessionModel.user_id == user_id,
-            SessionModel.is_mobile == is_mobile,
-            SessionModel.expires_at > datetime.utcnow()
-        ).first()
-
+        existing_session = await backend.find_active(user_id, is_mobile, db)
         if existing_session:
             return existing_session.token
 
-        token = generate_token()
-        expires_at = datetime.utcnow() + (MOBILE_SESSION_DURATION if is_mobile else WEB_SESSION_DURATION)
-
-        new_session = SessionModel(
+        now = datetime.utcnow()
+        new_session = UserSession(
+            id=uuid4(),
             user_id=user_id,
-            token=token,
-            expires_at=expires_at,
+            token=generate_token(),
+            created_at=now,
+            expires_at=now + (MOBILE_SESSION_DURATION if is_mobile else WEB_SESSION_DURATION),
             is_mobile=is_mobile,
             mfa_verified=mfa_verified,
             device_type=device_type,
             location=location,
             ip_address=ip_address,
-            last_activity=datetime.utcnow()
+            last_activity=now,
         )
-        db.add(new_session)
-        db.commit()
-        db.refresh(new_session)
-        return token
+        await backend.create(new_session, db)
+        return new_session.token
 
-    except SQLAlchemyError as e:
-        db.rollback()
+    except STORE_ERRORS as e:
+        logger.error(f"Failed to create session for user_id {user_id}: {str(e)}")
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create session")
 
 ### **Validate a Session Token**
-def validate_session(token: str, db: Session) -> SessionModel:
+async def validate_session(token: str, db: AsyncSession) -> UserSession:
     """
     Validate a session token.
+
+    Returns a detached snapshot of the session. Snapshots are served from the
+    session cache when possible, so the common case never touches the store.
+    Activity is recorded through the backend and written behind.
+    """
+    backend = get_session_backend()
+
+    cached = await session_cache.get(token)
+    if cached is not None:
+        backend.touch(token)
+        return cached
+
+    try:
+        session = await backend.get(token, db)
+        if not session:
+            raise HTTPException(status_code=401, detail="Session not found")
+        if session.expires_at < datetime.utcnow():
+            await backend.delete(token, db)
+            raise HTTPException(status_code=401, detail="Session expired")
+    except STORE_ERRORS as e:
+        logger.error(f"Session store error during validation: {str(e)}")
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to validate session")
+
+    backend.touch(token)
+    await session_cache.set(session)
+    return session
+
+### **Validate a Session Once per Request**
+async def get_request_session(request, token: str, db: AsyncSession) -> UserSession:
     """
-    session = db.query(SessionModel).filter(SessionModel.token == token).first()
+    Validate a session token at most once per request.
 
-    if not session:
-        raise HTTPException(status_code=401, detail="Session not found")
-    if session.expires_at < datetime.utcnow():
-        db.delete(session)
-        db.commit()
-        raise HTTPException(status_code=401, detail="Session expired")
+    The snapshot is stored on ``request.state.session`` and reused by every
+    later middleware and dependency that asks for the same token.
+    """
+    session = getattr(request.state, "session", None)
+    if session is not None and session.token == token:
+        return session
 
-    session.last_activity = datetime.utcnow()
-    db.commit()
+    session = await validate_session(token, db)
+    request.state.session = session
     return session
 
+### **Mark a Session as MFA Verified**
+async def mark_session_mfa_verified(token: str, db: AsyncSession):
+    """
+    Flag a session as MFA verified and drop its cached snapshot.
+    """
+    try:
+        await get_session_backend().mark_mfa_verified(token, db)
+    except STORE_ERRORS as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to update session")
+    finally:
+        await session_cache.invalidate(token)
+
 ### **Invalidate All User Sessions**
-def invalidate_session(user_id: UUID, db: Session, is_mobile: bool = None):
+async def invalidate_session(user_id: UUID, db: AsyncSession, is_mobile: bool = None):
     """
     Invalidate all sessions for the user or optionally only for web or mobile.
     """
     try:
-        query = db.query(SessionModel).filter(SessionModel.user_id == user_id)
-        if is_mobile is not None:
-            query = query.filter(SessionModel.is_mobile == is_mobile)
-        query.delete()
-        db.commit()
-    except SQLAlchemyError as e:
-        db.rollback()
+        tokens = await get_session_backend().delete_for_user(user_id, db, is_mobile=is_mobile)
+        await session_cache.invalidate_many(tokens)
+    except STORE_ERRORS as e:
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to invalidate sessions")
 
 ### **Invalidate a Specific Session**
-def invalidate_specific_session(token: str, db: Session):
+async def invalidate_specific_session(token: str, db: AsyncSession):
     """
     Invalidate a specific session.
     """
     try:
-        session = db.query(SessionModel).filter(SessionModel.token == token).first()
-        if session:
-            db.delete(session)
-            db.commit()
-    except SQLAlchemyError as e:
-        db.rollback()
+        await get_session_backend().delete(token, db)
+    except STORE_ERRORS as e:
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to invalidate session")
+    finally:
+        await session_cache.invalidate(token)
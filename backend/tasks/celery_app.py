@@ -1,11 +1,13 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 from backend.core.config import settings
 
 celery_app = Celery(
     "tasks",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
+    include=["backend.tasks.cleanup", "backend.tasks.email_tasks", "backend.tasks.quota_tasks"],
 )
 
 celery_app.conf.update(
@@ -15,6 +17,10 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     broker_connection_retry_on_startup=True,
+    # Transactional email runs on its own queue so slow SMTP never delays cleanup jobs
+    task_routes={
+        "backend.tasks.email_tasks.*": {"queue": settings.EMAIL_QUEUE},
+    },
     beat_schedule={
         "cleanup-expired-sessions": {
             "task": "backend.tasks.cleanup.cleanup_expired_sessions",
@@ -32,7 +38,19 @@ celery_app.conf.update(
             "task": "backend.tasks.cleanup.validate_with_stripe",
             "schedule": crontab(minute="15", hour="*/2"),  # Every 2 hours at :15
         },
+        "reconcile-quota-counters": {
+            "task": "backend.tasks.quota_tasks.reconcile_quota_counters",
+            "schedule": crontab(minute="*/15"),  # Every 15 minutes
+        },
     },
 )
 
 celery_app.autodiscover_tasks(["backend.tasks"])
+
+
+@worker_process_init.connect
+def compile_email_templates(**kwargs):
+    """ Compile every email template once per worker process, before the first task runs. """
+    from backend.templates.email_templates import email_templates
+
+    email_templates.compile_all()
@@ -5,13 +5,9 @@ from backend.core.database import SessionLocal
 from backend.models.payment import Payment, PaymentStatus
 from backend.models.session import Session as UserSession
 from backend.core.logging_config import get_logger
-import stripe
-from backend.core.config import settings
+from backend.core.service_registry import stripe
 from backend.tasks.celery_app import celery_app
 
-# Initialize Stripe
-stripe.api_key = settings.STRIPE_SECRET_KEY
-
 # Logger setup
 logger = get_logger(__name__)
 
@@ -27,7 +23,7 @@ def cleanup_expired_sessions():
             UserSession.expires_at < datetime.utcnow()
         ).delete()
         db.commit()
-        logger.info(f"Removed {expired_count} expired sessions.")
+        logger.info("Removed %s expired sessions.", expired_count)
     except SQLAlchemyError as e:
         logger.error(f"Error cleaning up expired sessions: {str(e)}")
         db.rollback()
@@ -48,7 +44,7 @@ def cleanup_pending_payments():
         ).all()
 
         for payment in pending_payments:
-            logger.info(f"Marking payment {payment.id} as failed (expired).")
+            logger.info("Marking payment %s as failed (expired).", payment.id)
             payment.status = PaymentStatus.FAILED
         db.commit()
     except SQLAlchemyError as e:
@@ -71,7 +67,7 @@ def cleanup_expired_subscriptions():
         ).all()
 
         for subscription in expired_subscriptions:
-            logger.info(f"Marking subscription {subscription.id} as expired.")
+            logger.info("Marking subscription %s as expired.", subscription.id)
             subscription.status = PaymentStatus.FAILED
         db.commit()
     except SQLAlchemyError as e:
@@ -97,10 +93,10 @@ def validate_with_stripe():
                 # Verify the session with Stripe
                 stripe_session = stripe.checkout.Session.retrieve(payment.stripe_payment_id)
                 if stripe_session.payment_status == "paid":
-                    logger.info(f"Payment {payment.id} marked as successful (Stripe confirmed).")
+                    logger.info("Payment %s marked as successful (Stripe confirmed).", payment.id)
                     payment.status = PaymentStatus.SUCCESS
                 elif stripe_session.payment_status in ["failed", "expired"]:
-                    logger.info(f"Payment {payment.id} marked as failed (Stripe confirmed).")
+                    logger.info("Payment %s marked as failed (Stripe confirmed).", payment.id)
                     payment.status = PaymentStatus.FAILED
                 db.commit()
             except stripe.error.StripeError as e:
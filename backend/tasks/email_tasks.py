@@ -0,0 +1,40 @@
+import smtplib
+
+from backend.core.config import settings
+from backend.core.logging_config import get_logger
+from backend.core.service_registry import get_smtp_pool
+from backend.services.email_service import build_message, render_email
+from backend.tasks.celery_app import celery_app
+
+# Logger setup
+logger = get_logger(__name__)
+
+# Failures worth retrying: dropped connections, timeouts, 4xx replies
+TRANSIENT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError)
+
+
+@celery_app.task(bind=True, name="backend.tasks.email_tasks.send_email_task", max_retries=settings.EMAIL_MAX_RETRIES)
+def send_email_task(self, subject: str, recipient: str, template_name: str, context: dict):
+    """
+    Render and send one transactional email through the worker's SMTP pool.
+
+    Transient failures are retried with exponential backoff; permanent
+    rejections (5xx, refused recipients) are logged and dropped.
+    """
+    message = build_message(subject, recipient, render_email(template_name, context))
+    try:
+        get_smtp_pool().send(message)
+        logger.info("Email '%s' sent to %s", template_name, recipient)
+    except smtplib.SMTPResponseException as e:
+        if 400 <= e.smtp_code < 500:
+            raise self.retry(exc=e, countdown=_backoff(self.request.retries))
+        logger.error(f"Email '{template_name}' to {recipient} rejected: {e.smtp_code} {e.smtp_error!r}")
+    except smtplib.SMTPRecipientsRefused as e:
+        logger.error(f"Email '{template_name}' to {recipient} refused: {e.recipients}")
+    except TRANSIENT_ERRORS as e:
+        logger.warning(f"Email '{template_name}' to {recipient} failed, retrying: {e}")
+        raise self.retry(exc=e, countdown=_backoff(self.request.retries))
+
+
+def _backoff(retries: int) -> int:
+    return min(settings.EMAIL_RETRY_BACKOFF_MAX_SECONDS, 2 ** retries * 5)
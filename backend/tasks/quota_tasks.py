@@ -0,0 +1,30 @@
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.api.subscriptions.quotas import reconcile_quotas
+from backend.core.database import SessionLocal
+from backend.core.logging_config import get_logger
+from backend.core.redis_client import get_redis
+from backend.tasks.celery_app import celery_app
+
+# Logger setup
+logger = get_logger(__name__)
+
+@celery_app.task
+def reconcile_quota_counters():
+    """
+    Raise Redis usage counters that fell behind Postgres.
+    """
+    client = get_redis()
+    if client is None:
+        logger.debug("No Redis configured; quota counters are per-process and not reconciled.")
+        return 0
+    db = SessionLocal()
+    try:
+        corrected = reconcile_quotas(db, client)
+        logger.info("Reconciled %s quota counters.", corrected)
+        return corrected
+    except SQLAlchemyError as e:
+        logger.error(f"Database error during quota reconciliation: {str(e)}")
+        return 0
+    finally:
+        db.close()
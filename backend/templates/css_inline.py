@@ -0,0 +1,116 @@
+import re
+from typing import Dict, List, Tuple
+
+STYLE_BLOCK = re.compile(r"<style[^>]*>(.*?)</style>", re.S | re.I)
+OPEN_TAG = re.compile(r"<([a-zA-Z][a-zA-Z0-9]*)((?:\s[^<>]*?)?)(/?)>")
+CLASS_ATTR = re.compile(r'\sclass="([^"]*)"')
+STYLE_ATTR = re.compile(r'\sstyle="([^"]*)"')
+SIMPLE_SELECTOR = re.compile(r"^([a-zA-Z][a-zA-Z0-9]*)?(?:\.([\w-]+))?$")
+COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+
+def _split_rules(css: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """ Split a stylesheet into (selector, declarations) rules and untouched at-rules. """
+    rules, kept = [], []
+    css = COMMENT.sub("", css)
+    index = 0
+    while index < len(css):
+        open_brace = css.find("{", index)
+        if open_brace == -1:
+            break
+        prelude = css[index:open_brace].strip()
+        depth, end = 1, open_brace + 1
+        while end < len(css) and depth:
+            depth += {"{": 1, "}": -1}.get(css[end], 0)
+            end += 1
+        body = css[open_brace + 1:end - 1]
+        if prelude.startswith("@"):
+            kept.append(f"{prelude} {{{body}}}")
+        else:
+            rules.append((prelude, body.strip()))
+        index = end
+    return rules, kept
+
+
+def _parse_declarations(body: str) -> Dict[str, str]:
+    declarations = {}
+    for item in body.split(";"):
+        if ":" in item:
+            name, value = item.split(":", 1)
+            declarations[name.strip().lower()] = value.strip()
+    return declarations
+
+
+def inline_css(html: str) -> str:
+    """
+    Move simple ``<style>`` rules onto the elements they match.
+
+    Only ``tag``, ``.class`` and ``tag.class`` selectors are inlined; anything
+    else (pseudo-classes, combinators, ``@media``) stays in the ``<style>``
+    block for clients that support it. Declarations apply in specificity then
+    source order, and an element's own ``style`` attribute always wins.
+    Template placeholders such as ``{{ link }}`` in attributes are preserved.
+    """
+    blocks = STYLE_BLOCK.findall(html)
+    if not blocks:
+        return html
+
+    inlined: List[Tuple[int, int, str, str, Dict[str, str]]] = []
+    leftover: List[str] = []
+    order = 0
+    for block in blocks:
+        rules, kept = _split_rules(block)
+        leftover.extend(kept)
+        for selectors, body in rules:
+            remaining = []
+            for selector in (s.strip() for s in selectors.split(",")):
+                match = SIMPLE_SELECTOR.match(selector)
+                if not match or not selector:
+                    remaining.append(selector)
+                    continue
+                tag, css_class = match.group(1), match.group(2)
+                specificity = (10 if css_class else 0) + (1 if tag else 0)
+                inlined.append((specificity, order, (tag or "").lower(), css_class, _parse_declarations(body)))
+                order += 1
+            if remaining:
+                leftover.append(f"{', '.join(remaining)} {{ {body} }}")
+    inlined.sort(key=lambda rule: (rule[0], rule[1]))
+
+    def apply(match):
+        tag, attrs, self_closing = match.group(1), match.group(2), match.group(3)
+        lowered = tag.lower()
+        if lowered in ("html", "head", "meta", "title", "style", "link", "br"):
+            return match.group(0)
+        class_match = CLASS_ATTR.search(attrs)
+        classes = set(class_match.group(1).split()) if class_match else set()
+
+        declarations: Dict[str, str] = {}
+        for _, _, rule_tag, rule_class, rule_declarations in inlined:
+            if rule_tag and rule_tag != lowered:
+                continue
+            if rule_class and rule_class not in classes:
+                continue
+            declarations.update(rule_declarations)
+        if not declarations:
+            return match.group(0)
+
+        style_match = STYLE_ATTR.search(attrs)
+        if style_match:
+            declarations.update(_parse_declarations(style_match.group(1)))
+            attrs = STYLE_ATTR.sub("", attrs)
+        style = "; ".join(f"{name}: {value}" for name, value in declarations.items())
+        return f'<{tag}{attrs} style="{style}"{self_closing}>'
+
+    head, separator, body = html.partition("<body")
+    if separator:
+        body = OPEN_TAG.sub(apply, separator + body)
+    else:
+        head = OPEN_TAG.sub(apply, head)
+
+    # Whatever could not be inlined goes back where the first <style> block was.
+    first_block = STYLE_BLOCK.search(head)
+    head = STYLE_BLOCK.sub("", head)
+    if first_block and leftover:
+        position = first_block.start()
+        head = head[:position] + "<style>\n" + "\n".join(leftover) + "\n</style>" + head[position:]
+    return head + body
@@ -1,6 +1,6 @@
 # backend/templates/email_templates.py
 
-from datetime import datetime
+from backend.templates.registry import EmailTemplateRegistry
 
 # Email verification template
 EMAIL_VERIFICATION_TEMPLATE = """\
@@ -65,9 +65,13 @@ EMAIL_VERIFICATION_TEMPLATE = """\
             <p>If you didn’t sign up for Yoked, you can safely ignore this email.</p>
         </div>
         <div class="footer">
-            <p>&copy; {year} Yoked. All rights reserved.</p>
+            <p>&copy; {{ current_year }} Yoked. All rights reserved.</p>
         </div>
     </div>
 </body>
 </html>
-""".replace("{year}", str(datetime.now().year))
+"""
+
+# Registered only; email workers compile them all at process start (see tasks/celery_app.py).
+email_templates = EmailTemplateRegistry()
+email_templates.register("email_verification", EMAIL_VERIFICATION_TEMPLATE)
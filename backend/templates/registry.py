@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from backend.templates.css_inline import inline_css
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+
+class EmailTemplateRegistry:
+    """
+    Email templates compiled once and rendered many times.
+
+    ``compile_all`` inlines each template's CSS and compiles it with Jinja2
+    up front (email workers call it at process start), so per-send work is
+    only filling in the context: the static HTML is kept as constants in the
+    compiled template. ``render_many`` reuses one compiled template for a
+    whole batch of recipients. Registering is free, so importing the
+    templates module costs nothing in processes that never send email.
+    """
+
+    def __init__(self):
+        self._environment: Optional["Environment"] = None
+        self._sources: Dict[str, str] = {}
+        self._templates: Dict[str, "Template"] = {}
+
+    def register(self, name: str, source: str) -> None:
+        self._sources[name] = source
+        self._templates.pop(name, None)
+
+    def _compile(self, source: str) -> "Template":
+        if self._environment is None:
+            from jinja2 import Environment, StrictUndefined
+
+            self._environment = Environment(autoescape=True, undefined=StrictUndefined)
+        return self._environment.from_string(inline_css(source))
+
+    def compile_all(self) -> None:
+        """ Compile every registered template now; a broken template fails here, not on its first send. """
+        for name, source in self._sources.items():
+            if name not in self._templates:
+                self._templates[name] = self._compile(source)
+
+    def is_compiled(self, name: str) -> bool:
+        return name in self._templates
+
+    def get(self, name: str) -> "Template":
+        template = self._templates.get(name)
+        if template is None:
+            try:
+                source = self._sources[name]
+            except KeyError:
+                raise KeyError(f"Unknown email template: {name}") from None
+            template = self._templates[name] = self._compile(source)
+        return template
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sources
+
+    @staticmethod
+    def _defaults() -> dict:
+        return {"current_year": datetime.utcnow().year}
+
+    def render(self, name: str, context: dict) -> str:
+        return self.get(name).render({**self._defaults(), **context})
+
+    def render_many(self, name: str, contexts: Iterable[dict]) -> List[str]:
+        """ Render one compiled template against many contexts, e.g. for a digest or campaign. """
+        template = self.get(name)
+        defaults = self._defaults()
+        return [template.render({**defaults, **context}) for context in contexts]
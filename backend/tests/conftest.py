@@ -1,7 +1,9 @@
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, clear_mappers
-from backend.core.database import Base, get_db
+from sqlalchemy.pool import NullPool
+from backend.core.database import Base, get_db, get_async_db, to_async_url
 from backend.models.user import User, UserType
 from backend.core.config import settings  # Import TEST_DATABASE_URL
 from backend.api.auth.auth_service import get_current_user
@@ -14,6 +16,13 @@ from backend.main import app
 engine = create_engine(settings.TEST_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for request handlers. NullPool because TestClient may run each
+# request on a different event loop.
+async_engine = create_async_engine(to_async_url(settings.TEST_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Set up the test database
 @pytest.fixture(scope="session", autouse=True)
 def setup_database():
@@ -70,6 +79,16 @@ def override_get_db(db_session):
     app.dependency_overrides[get_db] = lambda: db_session
 
 
+# Override get_async_db dependency globally
+@pytest.fixture(autouse=True)
+def override_get_async_db():
+    async def _get_test_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = _get_test_async_db
+
+
 # Override get_current_user dependency globally
 @pytest.fixture(autouse=True)
 def override_get_current_user(mock_user):
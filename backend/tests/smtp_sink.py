@@ -0,0 +1,78 @@
+import socketserver
+import threading
+from email import message_from_bytes
+
+
+class SMTPSink:
+    """
+    Minimal local SMTP server that accepts every message and keeps it in memory.
+
+    Speaks just enough SMTP (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT)
+    for ``smtplib`` clients, without TLS or auth. Use as a context manager;
+    ``port`` is picked by the OS.
+    """
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self.messages = []
+        self.connections = 0
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str):
+                self.wfile.write((line + "\r\n").encode())
+
+            def handle(self):
+                sink.connections += 1
+                self.reply("220 smtp-sink ready")
+                envelope = {"from": None, "to": []}
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode().strip()
+                    verb = command.split(" ", 1)[0].upper()
+                    if verb == "EHLO":
+                        self.reply("250-smtp-sink")
+                        self.reply("250 8BITMIME")
+                    elif verb == "HELO" or verb == "NOOP":
+                        self.reply("250 OK")
+                    elif verb == "MAIL":
+                        envelope = {"from": command.split(":", 1)[1].strip(), "to": []}
+                        self.reply("250 OK")
+                    elif verb == "RCPT":
+                        envelope["to"].append(command.split(":", 1)[1].strip())
+                        self.reply("250 OK")
+                    elif verb == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        lines = []
+                        while True:
+                            data = self.rfile.readline()
+                            if data in (b".\r\n", b".\n", b""):
+                                break
+                            lines.append(data[1:] if data.startswith(b"..") else data)
+                        sink.messages.append(message_from_bytes(b"".join(lines)))
+                        self.reply("250 OK: queued")
+                    elif verb == "RSET":
+                        envelope = {"from": None, "to": []}
+                        self.reply("250 OK")
+                    elif verb == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        self.reply("502 Command not implemented")
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        self._server = Server((host, 0), Handler)
+        self.host, self.port = self._server.server_address
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
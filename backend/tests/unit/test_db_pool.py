@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from backend.core.db_pool import POOL_PROFILES, PoolMetrics, engine_options, resolve_pool_profile
+
+
+def make_settings(profile="api", **overrides):
+    values = dict(
+        DB_POOL_PROFILE=profile,
+        DB_POOL_SIZE=None,
+        DB_MAX_OVERFLOW=None,
+        DB_POOL_TIMEOUT=None,
+        DB_POOL_RECYCLE=None,
+        DB_POOL_PRE_PING=None,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_overrides_apply_on_top_of_profile():
+    profile = resolve_pool_profile(make_settings("celery", DB_POOL_SIZE=7))
+    assert profile.pool_size == 7
+    assert profile.max_overflow == POOL_PROFILES["celery"].max_overflow
+
+
+def test_unknown_profile_falls_back_to_api():
+    assert resolve_pool_profile(make_settings("nope")).name == "api"
+
+
+def test_pgbouncer_profile_disables_pooling_and_prepared_statements():
+    profile = POOL_PROFILES["pgbouncer"]
+    options = engine_options(profile, PoolMetrics("test"), is_async=True)
+    assert issubclass(options["poolclass"], NullPool)
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert options["connect_args"]["prepared_statement_cache_size"] == 0
+
+
+def test_checkouts_and_waits_are_recorded():
+    metrics = PoolMetrics("test")
+    engine = create_engine("sqlite://", **engine_options(POOL_PROFILES["api"], metrics))
+    metrics.attach(engine.pool)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert metrics.snapshot()["in_use"] == 1
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 1
+    assert snapshot["checkins"] == 1
+    assert snapshot["connects"] == 1
+    assert snapshot["in_use"] == 0
+    assert snapshot["checkout_wait_ms"]["max"] > 0
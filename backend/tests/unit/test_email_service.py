@@ -0,0 +1,31 @@
+from backend.services.email_service import SMTPConnectionPool, build_message, render_email
+from backend.tests.smtp_sink import SMTPSink
+
+
+def test_render_verification_email():
+    html = render_email("email_verification", {"username": "sam", "verification_link": "https://x/verify"})
+    assert "Hi sam," in html
+    assert 'href="https://x/verify"' in html
+
+
+def test_pool_reuses_connection_across_messages():
+    with SMTPSink() as sink:
+        pool = SMTPConnectionPool(host=sink.host, port=sink.port)
+        for recipient in ("a@example.com", "b@example.com", "c@example.com"):
+            pool.send(build_message("Hello", recipient, "<p>hi</p>"))
+        pool.close()
+
+    assert [message["To"] for message in sink.messages] == ["a@example.com", "b@example.com", "c@example.com"]
+    assert sink.connections == 1
+    assert pool.connections_opened == 1
+
+
+def test_pool_replaces_connection_after_message_limit():
+    with SMTPSink() as sink:
+        pool = SMTPConnectionPool(host=sink.host, port=sink.port, max_messages=2)
+        for _ in range(3):
+            pool.send(build_message("Hello", "a@example.com", "<p>hi</p>"))
+        pool.close()
+
+    assert len(sink.messages) == 3
+    assert pool.connections_opened == 2
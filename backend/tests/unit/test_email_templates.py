@@ -0,0 +1,60 @@
+import pytest
+
+from backend.templates.css_inline import inline_css
+from backend.templates.registry import EmailTemplateRegistry
+
+SOURCE = """<html><head><style>
+p { color: red; }
+.note { color: blue; font-size: 12px; }
+a:hover { color: green; }
+@media (max-width: 600px) { p { font-size: 10px; } }
+</style></head>
+<body><p>Hi {{ name }}</p><p class="note" style="margin: 0">{{ note }}</p><a href="{{ link }}">go</a></body></html>"""
+
+
+def test_inline_css_applies_simple_rules_and_keeps_the_rest():
+    html = inline_css(SOURCE)
+    assert '<p style="color: red">' in html
+    assert 'style="color: blue; font-size: 12px; margin: 0"' in html
+    assert 'href="{{ link }}"' in html
+    assert "a:hover" in html and "@media" in html
+    assert ".note" not in html
+
+
+def test_render_many_uses_one_compiled_template():
+    registry = EmailTemplateRegistry()
+    registry.register("digest", SOURCE)
+
+    rendered = registry.render_many("digest", [
+        {"name": "Ann", "note": "<b>1</b>", "link": "https://x/1"},
+        {"name": "Bob", "note": "2", "link": "https://x/2"},
+    ])
+
+    assert len(rendered) == 2
+    assert "Hi Ann" in rendered[0] and "Hi Bob" in rendered[1]
+    assert "&lt;b&gt;1&lt;/b&gt;" in rendered[0]
+
+
+def test_missing_context_is_an_error():
+    registry = EmailTemplateRegistry()
+    registry.register("digest", SOURCE)
+    with pytest.raises(Exception):
+        registry.render("digest", {"name": "Ann"})
+
+
+def test_compile_all_compiles_every_template_before_first_get():
+    registry = EmailTemplateRegistry()
+    registry.register("digest", SOURCE)
+    registry.register("reminder", SOURCE)
+    assert not registry.is_compiled("digest")
+
+    registry.compile_all()
+
+    assert registry.is_compiled("digest") and registry.is_compiled("reminder")
+
+
+def test_shipped_templates_compile():
+    from backend.templates.email_templates import email_templates
+
+    email_templates.compile_all()
+    assert email_templates.is_compiled("email_verification")
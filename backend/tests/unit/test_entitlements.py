@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api.subscriptions.entitlements import (
+    DEFAULT_PLAN,
+    FREE_ENTITLEMENTS,
+    Capability,
+    EntitlementResolver,
+    Entitlements,
+    compile_tier,
+    requires,
+)
+
+
+def make_tier(name="Pro", **flags):
+    columns = {capability.name.lower(): False for capability in Capability}
+    columns.update(flags)
+    return SimpleNamespace(name=name, max_reel_uploads=5, max_saved_workouts=None, max_messages_per_day=50, **columns)
+
+
+class FakeCatalog:
+    def __init__(self):
+        self.current = 1
+
+    async def version(self):
+        return self.current
+
+
+def test_tier_compiles_to_bitset_and_limits():
+    entitlements = compile_tier(make_tier(access_reels=True, direct_messaging=True))
+    assert entitlements.capabilities == Capability.ACCESS_REELS | Capability.DIRECT_MESSAGING
+    assert entitlements.allows(Capability.ACCESS_REELS)
+    assert not entitlements.allows(Capability.ACCESS_REELS | Capability.ACCESS_WORKOUTS)
+    assert (entitlements.max_reel_uploads, entitlements.max_saved_workouts) == (5, 0)
+
+
+def test_resolver_caches_until_catalog_version_changes():
+    loads = []
+
+    async def loader(db, plan):
+        loads.append(plan)
+        return make_tier(plan, access_workouts=True) if plan == "Pro" else None
+
+    catalog = FakeCatalog()
+    resolver = EntitlementResolver(loader=loader, catalog=catalog, ttl=3600)
+
+    async def scenario():
+        first = await resolver.resolve(None, "Pro")
+        assert await resolver.resolve(None, "Pro") is first
+        assert (await resolver.resolve(None, "Gone")).capabilities == Capability(0)
+        assert await resolver.resolve(None, "Gone") is not None
+        catalog.current = 2
+        await resolver.resolve(None, "Pro")
+
+    asyncio.run(scenario())
+    assert loads == ["Pro", "Gone", "Pro"]
+
+
+def test_requires_rejects_missing_capability():
+    check = requires(Capability.ACCESS_REELS, Capability.REELS_AD_FREE)
+    allowed = Entitlements(plan="Pro", capabilities=Capability.ACCESS_REELS | Capability.REELS_AD_FREE)
+    assert asyncio.run(check(allowed)) is allowed
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(check(Entitlements(plan="Free", capabilities=Capability.ACCESS_REELS)))
+    assert error.value.status_code == 403
+
+
+def test_default_plan_without_a_tier_row_gets_free_entitlements():
+    async def loader(db, plan):
+        return None
+
+    resolver = EntitlementResolver(loader=loader, catalog=FakeCatalog(), ttl=3600)
+    entitlements = asyncio.run(resolver.resolve(None, DEFAULT_PLAN))
+    assert entitlements is FREE_ENTITLEMENTS and entitlements.allows(Capability.ACCESS_WORKOUTS)
+    assert entitlements.max_messages_per_day < 0
+
+
+def test_compiled_tiers_expire_after_ttl():
+    loads = []
+
+    async def loader(db, plan):
+        loads.append(plan)
+        return make_tier(plan)
+
+    resolver = EntitlementResolver(loader=loader, catalog=FakeCatalog(), ttl=0)
+
+    async def scenario():
+        await resolver.resolve(None, "Pro")
+        await resolver.resolve(None, "Pro")
+
+    asyncio.run(scenario())
+    assert loads == ["Pro", "Pro"]
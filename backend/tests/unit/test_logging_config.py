@@ -0,0 +1,88 @@
+import json
+import logging
+import queue
+
+from backend.core.log_redaction import redact_text, redact_value
+from backend.core.logging_config import (
+    BoundedQueueHandler,
+    JsonFormatter,
+    RedactingFilter,
+    SamplingFilter,
+    log_file_path,
+    parse_sample_rates,
+)
+
+
+def record(message, args=None, level=logging.INFO, name="backend", **extra):
+    return logging.makeLogRecord(
+        {"msg": message, "args": args, "levelno": level, "levelname": logging.getLevelName(level), "name": name, **extra}
+    )
+
+
+def drain(log_queue):
+    return [log_queue.get_nowait().msg for _ in range(log_queue.qsize())]
+
+
+def test_drop_new_keeps_queued_records():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, "drop_new")
+    for message in ("a", "b", "c"):
+        handler.handle(record(message))
+
+    assert drain(log_queue) == ["a", "b"]
+    assert handler.dropped == 1
+
+
+def test_drop_oldest_keeps_latest_records():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, "drop_oldest")
+    for message in ("a", "b", "c"):
+        handler.handle(record(message))
+
+    assert drain(log_queue) == ["b", "c"]
+    assert handler.dropped == 1
+
+
+def test_per_process_log_file(monkeypatch):
+    monkeypatch.setattr("os.getpid", lambda: 4242)
+
+    assert log_file_path("/var/log/app.log", per_process=True) == "/var/log/app.4242.log"
+    assert log_file_path("/var/log/app.log", per_process=False) == "/var/log/app.log"
+
+
+def test_secrets_are_redacted():
+    assert redact_text("password=hunter2 user=bob") == "password=*** user=bob"
+    assert redact_text("key sk_live_abc123 used") == "key *** used"
+    assert redact_text("postgresql://app:s3cret@db/yoked") == "postgresql://app:***@db/yoked"
+    assert redact_value({"MAIL_PASSWORD": "x", "nested": {"api_key": "y"}, "ENV": "prod"}) == {
+        "MAIL_PASSWORD": "***", "nested": {"api_key": "***"}, "ENV": "prod"
+    }
+
+    log_record = record("Login %s with %s", ("bob", {"token": "abc"}), session_token="abc", user="bob")
+    RedactingFilter().filter(log_record)
+    assert log_record.getMessage() == "Login bob with {'token': '***'}"
+    assert (log_record.session_token, log_record.user) == ("***", "bob")
+
+
+def test_plain_settings_named_like_secrets_are_kept():
+    settings_dump = {"PASSWORD_HASH_EXECUTOR": "process", "PASSWORD_HASH_WORKERS": 4, "USE_CREDENTIALS": True, "MAIL_PASSWORD": "x"}
+    assert redact_text(str(redact_value(settings_dump))) == (
+        "{'PASSWORD_HASH_EXECUTOR': 'process', 'PASSWORD_HASH_WORKERS': 4, 'USE_CREDENTIALS': True, 'MAIL_PASSWORD': '***'}"
+    )
+
+
+def test_sampling_by_route_and_module():
+    sampler = SamplingFilter(parse_sample_rates("backend.api=0,backend.api.users=1"), parse_sample_rates("/health=0"))
+
+    assert not sampler.filter(record("GET /health 200", route="/health"))
+    assert sampler.filter(record("GET /health 500", level=logging.ERROR, route="/health"))
+    assert not sampler.filter(record("noisy", name="backend.api.payments.payment_routes"))
+    assert sampler.filter(record("kept", name="backend.api.users.user_routes"))
+    assert sampler.filter(record("kept", name="backend.apiary"))
+
+
+def test_json_formatter_includes_extras():
+    payload = json.loads(JsonFormatter().format(record("GET %s", ("/x",), route="/x", status=200)))
+
+    assert payload["msg"] == "GET /x"
+    assert (payload["level"], payload["route"], payload["status"]) == ("INFO", "/x", 200)
@@ -0,0 +1,64 @@
+import asyncio
+import base64
+
+import pyotp
+
+from backend.services import mfa
+
+
+def test_svg_and_png_qr_codes():
+    uri = pyotp.TOTP(pyotp.random_base32()).provisioning_uri(name="a@example.com", issuer_name=mfa.ISSUER_NAME)
+
+    png = mfa.render_qr_code(uri, "png")
+    svg = mfa.render_qr_code(uri, "svg")
+
+    assert base64.b64decode(png.split(",", 1)[1]).startswith(b"\x89PNG")
+    assert svg.startswith("data:image/svg+xml;base64,")
+    assert b"<svg" in base64.b64decode(svg.split(",", 1)[1])
+
+
+def test_pending_setup_reuses_secret_and_rendered_qr(monkeypatch):
+    renders = []
+    original = mfa.render_qr_code
+    monkeypatch.setattr(mfa, "render_qr_code", lambda uri, fmt: renders.append(fmt) or original(uri, fmt))
+
+    async def scenario():
+        first = await mfa.get_pending_mfa_setup("user-1", "a@example.com", "svg")
+        second = await mfa.get_pending_mfa_setup("user-1", "a@example.com", "svg")
+        await mfa.clear_pending_mfa_setup("user-1")
+        third = await mfa.get_pending_mfa_setup("user-1", "a@example.com", "svg")
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first == second
+    assert third["mfa_secret"] != first["mfa_secret"]
+    assert renders == ["svg", "svg"]
+
+
+def test_pending_secret_is_not_stored(monkeypatch):
+    stored = {}
+    original_add = mfa.pending_setups.add
+
+    async def recording_add(key, value, ttl):
+        stored[key] = value
+        return await original_add(key, value, ttl)
+
+    monkeypatch.setattr(mfa.pending_setups, "add", recording_add)
+
+    async def scenario():
+        await mfa.clear_pending_mfa_setup("user-2")
+        return await mfa.get_pending_mfa_setup("user-2", "b@example.com", "svg")
+
+    setup = asyncio.run(scenario())
+    assert stored and setup["mfa_secret"] not in stored.values()
+    assert pyotp.TOTP(setup["mfa_secret"]).verify(pyotp.TOTP(setup["mfa_secret"]).now())
+
+
+def test_totp_code_cannot_be_replayed():
+    secret = pyotp.random_base32()
+    code = pyotp.TOTP(secret).now()
+
+    async def scenario():
+        return [await mfa.verify_mfa_code(secret, code) for _ in range(2)] + [await mfa.verify_mfa_code(secret, "000000")]
+
+    assert asyncio.run(scenario()) == [True, False, False]
@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from backend.core.pagination import decode_cursor, encode_cursor, parse_utc_timestamp
+
+
+def test_cursor_round_trip():
+    timestamp, payment_id = datetime(2025, 3, 1, 12, 30, 5, 123456), uuid.uuid4()
+    cursor = encode_cursor(timestamp, payment_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, datetime.fromisoformat, uuid.UUID) == (timestamp, payment_id)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor("2025-03-01T00:00:00"), encode_cursor("x", "y"), "WzEsIDJd"])  # last: base64 of [1, 2]
+def test_bad_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, datetime.fromisoformat, uuid.UUID)
+
+
+def test_aware_cursor_timestamp_is_folded_into_naive_utc():
+    payment_id = uuid.uuid4()
+    tampered = encode_cursor("2025-03-01T14:30:00+02:00", payment_id)
+    timestamp, _ = decode_cursor(tampered, parse_utc_timestamp, uuid.UUID)
+    assert timestamp == datetime(2025, 3, 1, 12, 30) and timestamp.tzinfo is None
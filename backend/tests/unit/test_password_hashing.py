@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import os
+
+import pytest
+
+from backend.core.password_hashing import HasherBusyError, PasswordHasher, bcrypt_rounds
+
+
+def make_hasher(**kwargs):
+    options = dict(rounds=4, concurrency=1, max_queue=10, mode="thread")
+    options.update(kwargs)
+    return PasswordHasher(**options)
+
+
+def test_hash_and_verify_round_trip():
+    hasher = make_hasher()
+
+    async def scenario():
+        hashed = await hasher.hash("s3cret")
+        assert bcrypt_rounds(hashed) == 4
+        assert await hasher.verify("s3cret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+
+    asyncio.run(scenario())
+    assert hasher.metrics()["completed"] == 3
+    hasher.shutdown()
+
+
+def test_needs_rehash_when_cost_changes():
+    hasher = make_hasher()
+    hashed = asyncio.run(hasher.hash("s3cret"))
+    assert not hasher.needs_rehash(hashed)
+    assert make_hasher(rounds=5).needs_rehash(hashed)
+    hasher.shutdown()
+
+
+def test_rejects_when_queue_is_full():
+    hasher = make_hasher(max_queue=1)
+
+    async def scenario():
+        results = await asyncio.gather(*(hasher.hash("pw") for _ in range(3)), return_exceptions=True)
+        return [r for r in results if isinstance(r, HasherBusyError)]
+
+    assert len(asyncio.run(scenario())) == 1
+    assert hasher.metrics()["rejected"] == 1
+    hasher.shutdown()
+
+
+def describe_logging():
+    from backend.core import logging_config
+
+    handlers = logging.getLogger().handlers
+    return os.getpid(), logging_config._listener is None, [type(handler).__name__ for handler in handlers]
+
+
+def test_worker_processes_do_not_open_the_log_file():
+    hasher = make_hasher(mode="process")
+
+    async def scenario():
+        return await hasher._run(describe_logging)
+
+    pid, no_listener, handlers = asyncio.run(scenario())
+    hasher.shutdown()
+    assert pid != os.getpid()
+    assert no_listener
+    assert "RotatingFileHandler" not in handlers and "BoundedQueueHandler" not in handlers
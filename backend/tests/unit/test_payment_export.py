@@ -0,0 +1,88 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.api.payments import payment_export
+from backend.api.payments.payment_export import (
+    EXPORT_FIELDS,
+    ExportSlots,
+    encode_chunks,
+    payment_export_query,
+    render_rows,
+)
+from backend.models.payment import PaymentPlatform, PaymentStatus
+
+ROW = (
+    uuid.UUID(int=1), uuid.UUID(int=2), None, 1999, "USD", PaymentPlatform.STRIPE, PaymentStatus.PAID,
+    "pi_123", None, None, datetime(2025, 1, 2, 3, 4, 5), None,
+)
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def collect(stream):
+    return b"".join([data async for data in stream])
+
+
+def test_csv_rows_use_enum_names_and_blank_nulls():
+    lines = list(csv.reader(io.StringIO(render_rows([EXPORT_FIELDS], "csv") + render_rows([ROW], "csv"))))
+    record = dict(zip(lines[0], lines[1]))
+    assert record["platform"] == "STRIPE" and record["status"] == "PAID"
+    assert record["subscription_id"] == "" and record["timestamp"] == "2025-01-02T03:04:05"
+
+
+def test_ndjson_rows_keep_json_types():
+    record = json.loads(render_rows([ROW], "ndjson"))
+    assert record["amount"] == 1999 and record["renewal_date"] is None
+    assert record["user_id"] == str(uuid.UUID(int=2))
+
+
+def test_gzip_is_applied_on_the_fly():
+    body = asyncio.run(collect(encode_chunks(chunks("a,b\n", "1,2\n"), compress=True)))
+    assert gzip.decompress(body) == b"a,b\n1,2\n"
+    assert asyncio.run(collect(encode_chunks(chunks("a,b\n"), compress=False))) == b"a,b\n"
+
+
+def test_export_query_filters_columns_directly():
+    sql = str(payment_export_query(datetime(2025, 1, 1), datetime(2026, 1, 1), "PAID", "STRIPE").compile(
+        dialect=postgresql.dialect()
+    ))
+    assert "payments.timestamp >= " in sql and "payments.timestamp < " in sql
+    assert "payments.status = " in sql and "payments.platform = " in sql
+    assert sql.rstrip().endswith("ORDER BY payments.timestamp, payments.id")
+
+
+def test_export_slots_refuse_without_waiting_and_release_once():
+    slots = ExportSlots(limit=1)
+    release = slots.try_acquire()
+    assert release is not None
+    assert slots.try_acquire() is None
+
+    release()
+    release()
+    assert slots.try_acquire() is not None
+    assert slots.try_acquire() is None
+
+
+def test_stream_releases_its_slot_when_it_fails(monkeypatch):
+    async def failing_chunks(query, export_format, batch_size):
+        yield "id\n"
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(payment_export, "_export_chunks", failing_chunks)
+    slots = ExportSlots(limit=1)
+    stream = payment_export.stream_payment_export(None, release_slot=slots.try_acquire())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect(stream))
+    assert slots.try_acquire() is not None
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import fakeredis
+import pytest
+from fastapi import HTTPException
+
+from backend.api.subscriptions.entitlements import Entitlements
+from backend.api.subscriptions.quotas import (
+    Quota,
+    Window,
+    active_users_key,
+    consume_quota,
+    counter_key,
+    quota_counter,
+    reconcile_quotas,
+    window_bounds,
+)
+
+
+class FakeAsyncDB:
+    def __init__(self, count):
+        self.count = count
+        self.queries = 0
+
+    async def scalar(self, statement):
+        self.queries += 1
+        return self.count
+
+
+@pytest.fixture(autouse=True)
+def clean_counters():
+    quota_counter.reset()
+    yield
+    quota_counter.reset()
+
+
+def test_window_bounds():
+    now = datetime(2025, 2, 14, 13, 30)
+    assert window_bounds(Window.DAY, now) == ("20250214", datetime(2025, 2, 14), datetime(2025, 2, 15))
+    assert window_bounds(Window.MONTH, now) == ("202502", datetime(2025, 2, 1), datetime(2025, 3, 1))
+    assert window_bounds(Window.LIFETIME, now) == ("all", None, None)
+
+
+def test_quota_stops_at_limit_and_reports_headers():
+    user = SimpleNamespace(id=uuid4(), subscription_plan="Pro")
+    entitlements = Entitlements(plan="Pro", max_messages_per_day=2)
+
+    async def scenario():
+        first = await consume_quota(user, Quota.MESSAGES, None, entitlements=entitlements)
+        second = await consume_quota(user, Quota.MESSAGES, None, entitlements=entitlements)
+        assert (first.remaining, second.remaining) == (1, 0)
+        await consume_quota(user, Quota.MESSAGES, None, entitlements=entitlements)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 429
+    assert error.value.headers["X-Quota-Messages-Remaining"] == "0"
+    assert "X-Quota-Messages-Reset" in error.value.headers
+
+
+def test_lifetime_quota_is_seeded_from_postgres_once_and_released():
+    user = SimpleNamespace(id=uuid4(), subscription_plan="Pro")
+    entitlements = Entitlements(plan="Pro", max_saved_workouts=5)
+    db = FakeAsyncDB(count=3)
+
+    async def scenario():
+        assert (await consume_quota(user, Quota.SAVED_WORKOUTS, db, entitlements=entitlements)).used == 4
+        assert (await consume_quota(user, Quota.SAVED_WORKOUTS, db, entitlements=entitlements)).used == 5
+        assert (await consume_quota(user, Quota.SAVED_WORKOUTS, db, amount=-9, entitlements=entitlements)).used == 0
+
+    asyncio.run(scenario())
+    assert db.queries == 1
+
+
+def test_negative_limit_is_unlimited():
+    user = SimpleNamespace(id=uuid4(), subscription_plan="Pro")
+    entitlements = Entitlements(plan="Pro", max_messages_per_day=-1)
+    usage = asyncio.run(consume_quota(user, Quota.MESSAGES, None, amount=1000, entitlements=entitlements))
+    assert usage.remaining is None
+
+
+def test_reconcile_only_raises_counters_to_postgres_counts():
+    client = fakeredis.FakeRedis()
+    now = datetime.utcnow()
+    period = window_bounds(Window.DAY, now)[0]
+    behind, ahead, gone = str(uuid4()), str(uuid4()), str(uuid4())
+    client.set(counter_key(Quota.MESSAGES, period, behind), 2)
+    client.set(counter_key(Quota.MESSAGES, period, ahead), 7)
+    client.sadd(active_users_key(Quota.MESSAGES, period), behind, ahead, gone)
+    db = SimpleNamespace(scalar=lambda statement: 4)
+
+    assert reconcile_quotas(db, client, now) == 1
+    assert int(client.get(counter_key(Quota.MESSAGES, period, behind))) == 4
+    assert int(client.get(counter_key(Quota.MESSAGES, period, ahead))) == 7
+    assert client.smembers(active_users_key(Quota.MESSAGES, period)) == {behind.encode(), ahead.encode()}
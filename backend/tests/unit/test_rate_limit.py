@@ -0,0 +1,32 @@
+from backend.core.rate_limit import RateLimit, RateLimiter, retry_after_header
+
+
+def test_parse_spec():
+    limit = RateLimit.parse("5:2")
+    assert limit.burst == 5
+    assert limit.interval_ms == 30000
+
+
+def test_burst_then_reject_then_refill():
+    limiter = RateLimiter()
+    limits = [("login:email:a@example.com", RateLimit(burst=3, per_minute=60))]
+
+    assert all(limiter._hit_local(limits, now_ms=0) == 0 for _ in range(3))
+    wait = limiter._hit_local(limits, now_ms=0)
+    assert wait == 1.0
+    assert retry_after_header(wait) == {"Retry-After": "1"}
+
+    # One token comes back per second.
+    assert limiter._hit_local(limits, now_ms=1000) == 0
+    assert limiter._hit_local(limits, now_ms=1000) > 0
+
+
+def test_rejected_attempt_does_not_consume_other_keys():
+    limiter = RateLimiter()
+    email = ("login:email:a@example.com", RateLimit(burst=1, per_minute=60))
+    ip = ("login:ip:10.0.0.1", RateLimit(burst=2, per_minute=60))
+
+    assert limiter._hit_local([email, ip], now_ms=0) == 0
+    assert limiter._hit_local([email, ip], now_ms=0) > 0
+    # The IP bucket still has its second token.
+    assert limiter._hit_local([("login:email:b@example.com", email[1]), ip], now_ms=0) == 0
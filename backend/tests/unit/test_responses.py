@@ -0,0 +1,45 @@
+import json
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+from backend.core import responses
+from backend.core.responses import ModelResponse, response_adapter, serialize
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+def test_adapters_are_built_once_per_type():
+    assert response_adapter(List[Item]) is response_adapter(List[Item])
+
+
+def test_orm_like_objects_are_validated_from_attributes():
+    rows = [SimpleNamespace(id=1, name="a"), SimpleNamespace(id=2, name="b")]
+    assert json.loads(serialize(List[Item], rows)) == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+
+def test_model_instances_are_not_revalidated(monkeypatch):
+    item = Item(id=1, name="a")
+    adapter = response_adapter(Item)
+    monkeypatch.setattr(adapter, "validate_python", lambda *args, **kwargs: pytest.fail("revalidated"))
+    assert serialize(Item, item) == b'{"id":1,"name":"a"}'
+
+
+def test_model_response_carries_bytes_and_headers():
+    response = ModelResponse(Item, Item(id=1, name="a"), headers={"ETag": '"1"'})
+    assert response.body == b'{"id":1,"name":"a"}'
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["etag"] == '"1"'
+
+
+def test_default_response_class_follows_setting(monkeypatch):
+    monkeypatch.setattr(responses.settings, "FAST_JSON_RESPONSES", False)
+    assert responses.default_response_class() is JSONResponse
+    monkeypatch.setattr(responses.settings, "FAST_JSON_RESPONSES", True)
+    assert responses.default_response_class() is ORJSONResponse
@@ -0,0 +1,86 @@
+from fastapi import APIRouter, FastAPI
+
+from backend.api.middlewares.route_policy import (
+    AUTHENTICATED,
+    PUBLIC,
+    SESSION_ONLY,
+    SUPERUSER,
+    RoutePolicyRegistry,
+    mfa_exempt,
+    public,
+    superuser_only,
+)
+
+
+def build_registry():
+    router = APIRouter()
+
+    @router.get("/")
+    @public
+    def list_items():
+        return []
+
+    @router.post("/")
+    def create_item():
+        return {}
+
+    @router.get("/version")
+    @public
+    def version():
+        return {}
+
+    @router.get("/{item_id}")
+    @public
+    def get_item(item_id: str):
+        return {}
+
+    @router.put("/{item_id}")
+    def update_item(item_id: str):
+        return {}
+
+    @router.get("/{item_id}/owner")
+    @mfa_exempt
+    def get_owner(item_id: str):
+        return {}
+
+    @router.post("/create")
+    @superuser_only
+    def create_admin():
+        return {}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/items")
+
+    @app.get("/health")
+    def health():
+        return {}
+
+    registry = RoutePolicyRegistry()
+    registry.compile(app.routes)
+    return registry
+
+
+def test_static_routes_use_declared_policy():
+    registry = build_registry()
+    assert registry.resolve("GET", "/api/items/") == PUBLIC
+    assert registry.resolve("GET", "/api/items/version") == PUBLIC
+    assert registry.resolve("POST", "/api/items/create") == SUPERUSER
+
+
+def test_policy_depends_on_method():
+    registry = build_registry()
+    assert registry.resolve("POST", "/api/items/") == AUTHENTICATED
+    assert registry.resolve("PUT", "/api/items/42") == AUTHENTICATED
+
+
+def test_parameterised_routes_are_matched():
+    registry = build_registry()
+    assert registry.resolve("GET", "/api/items/42") == PUBLIC
+    assert registry.resolve("GET", "/api/items/42/owner") == SESSION_ONLY
+
+
+def test_unknown_paths_fall_back_to_defaults():
+    registry = build_registry()
+    assert registry.resolve("GET", "/api/unknown") == AUTHENTICATED
+    assert registry.resolve("GET", "/health") == PUBLIC
+    assert registry.resolve("GET", "/docs") == PUBLIC
@@ -0,0 +1,53 @@
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+
+
+async def app(scope, receive, send):
+    """ Minimal ASGI app served by the supervisor under test. """
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            await send({"type": message["type"] + ".complete"})
+            if message["type"] == "lifespan.shutdown":
+                return
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+
+def test_web_workers_become_ready_serve_and_drain():
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.serve", "web", "--workers", "2", "--host", "127.0.0.1", "--port", "0",
+         "--app", "backend.tests.unit.test_serve:app", "--ready-path", "/"],
+        cwd=REPO_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        env={**os.environ, "LOG_MODE": "stdout", "LOG_JSON": "false", "SERVE_DRAIN_SECONDS": "0"},
+    )
+    try:
+        port, deadline = None, time.monotonic() + 30
+        while port is None and time.monotonic() < deadline:
+            line = process.stdout.readline()
+            match = re.search(r"Ready: 2 web workers on 127.0.0.1:(\d+)", line)
+            port = int(match.group(1)) if match else None
+        assert port, "supervisor never reported ready"
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5) as response:
+            worker_pid = int(response.read())
+        assert worker_pid != process.pid
+
+        process.send_signal(signal.SIGTERM)
+        output, _ = process.communicate(timeout=30)
+        assert process.returncode == 0
+        assert "Shutdown complete." in output
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
@@ -0,0 +1,45 @@
+from sqlalchemy.exc import IntegrityError
+
+from backend.services import session_audit
+from backend.services.session_audit import SessionAuditLog
+
+
+class FakeDB:
+    def __init__(self, written):
+        self.written = written
+        self.pending = []
+
+    def commit(self):
+        if "orphan" in self.pending:
+            raise IntegrityError("INSERT", {}, Exception("violates foreign key constraint"))
+        self.written.extend(self.pending)
+        self.pending = []
+
+    def rollback(self):
+        self.pending = []
+
+    def close(self):
+        pass
+
+
+def test_one_failing_record_does_not_drop_its_batch(monkeypatch):
+    written = []
+    monkeypatch.setattr(session_audit, "SessionLocal", lambda: FakeDB(written))
+    monkeypatch.setattr(SessionAuditLog, "_write", staticmethod(lambda db, kind, payload: db.pending.append(payload)))
+
+    audit = SessionAuditLog()
+    for token in ("a", "orphan", "b"):
+        audit.record_mfa_verified(token)
+
+    assert audit.flush() == 2
+    assert written == ["a", "b"]
+
+
+def test_stop_returns_when_the_writer_is_gone_and_the_queue_is_full(monkeypatch):
+    monkeypatch.setattr(SessionAuditLog, "flush", lambda self: 0)
+    audit = SessionAuditLog(max_queue=1)
+    audit.record_mfa_verified("a")
+    audit._thread = type("DeadThread", (), {"join": lambda self, timeout: None, "is_alive": lambda self: False})()
+
+    audit.stop(timeout=0.01)
+    assert audit._thread is None
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from backend.core.config import settings
+from backend.schemas.session_schema import UserSession
+from backend.services import session_backends
+from backend.services.session_backends import (
+    TOKEN_KEY_PREFIX,
+    USER_INDEX_PREFIX,
+    PostgresSessionBackend,
+    RedisSessionBackend,
+    get_session_backend,
+    set_session_backend,
+)
+
+
+def test_redis_backend_falls_back_to_postgres_without_redis(monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_BACKEND", "redis")
+    monkeypatch.setattr(session_backends, "get_async_redis", lambda: None)
+    set_session_backend(None)
+    try:
+        assert isinstance(get_session_backend(), PostgresSessionBackend)
+    finally:
+        set_session_backend(None)
+
+
+def make_session(user_id, token, is_mobile=False):
+    now = datetime.utcnow()
+    return UserSession(
+        id=uuid4(),
+        user_id=user_id,
+        token=token,
+        created_at=now,
+        expires_at=now + timedelta(days=1),
+        is_mobile=is_mobile,
+        mfa_verified=False,
+        last_activity=now,
+    )
+
+
+def test_redis_backend_round_trip():
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def scenario():
+        backend = RedisSessionBackend(fakeredis.FakeAsyncRedis())
+        user_id = uuid4()
+        await backend.create(make_session(user_id, "web"), db=None)
+        await backend.create(make_session(user_id, "phone", is_mobile=True), db=None)
+
+        assert (await backend.find_active(user_id, False, db=None)).token == "web"
+        assert await backend.client.ttl(TOKEN_KEY_PREFIX + "web") > 0
+
+        await backend.mark_mfa_verified("web", db=None)
+        assert (await backend.get("web", db=None)).mfa_verified
+
+        assert await backend.delete_for_user(user_id, db=None, is_mobile=True) == ["phone"]
+        assert await backend.get("phone", db=None) is None
+
+        await backend.delete("web", db=None)
+        assert await backend.find_active(user_id, False, db=None) is None
+        assert await backend.client.smembers(USER_INDEX_PREFIX + str(user_id)) == set()
+
+    asyncio.run(scenario())
@@ -0,0 +1,141 @@
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from backend.schemas.session_schema import UserSession
+from backend.services import session_cache as session_cache_module
+from backend.services.session_cache import PROFILE_VERSION_PREFIX, SessionCache
+
+
+def make_session(token="token", expires_in=timedelta(days=1)):
+    now = datetime.utcnow()
+    return UserSession(
+        id=uuid4(),
+        user_id=uuid4(),
+        token=token,
+        created_at=now,
+        expires_at=now + expires_in,
+        is_mobile=False,
+        mfa_verified=True,
+        last_activity=now,
+    )
+
+
+def test_cached_session_is_returned():
+    async def scenario():
+        cache = SessionCache(maxsize=10, ttl=60, redis_ttl=60)
+        session = make_session()
+        await cache.set(session)
+        assert await cache.get("token") == session
+
+    asyncio.run(scenario())
+
+
+def test_invalidated_session_is_dropped():
+    async def scenario():
+        cache = SessionCache(maxsize=10, ttl=60, redis_ttl=60)
+        await cache.set(make_session("a"))
+        await cache.set(make_session("b"))
+        await cache.invalidate_many(["a", "b"])
+        assert await cache.get("a") is None
+        assert await cache.get("b") is None
+
+    asyncio.run(scenario())
+
+
+def test_expired_session_is_never_cached():
+    async def scenario():
+        cache = SessionCache(maxsize=10, ttl=60, redis_ttl=60)
+        await cache.set(make_session(expires_in=timedelta(seconds=-1)))
+        assert await cache.get("token") is None
+
+    asyncio.run(scenario())
+
+
+def test_cache_is_bounded():
+    async def scenario():
+        cache = SessionCache(maxsize=2, ttl=60, redis_ttl=60)
+        for token in ("a", "b", "c"):
+            await cache.set(make_session(token))
+        assert await cache.get("a") is None
+        assert await cache.get("c") is not None
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def shared_redis(monkeypatch):
+    """ One fake Redis server behind both the async and the sync client, as every worker would see it. """
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(session_cache_module, "get_async_redis", lambda: fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(session_cache_module, "get_redis", lambda: fakeredis.FakeRedis(server=server))
+
+
+def test_read_never_replaces_a_newer_profile_version(shared_redis):
+    async def scenario():
+        cache = SessionCache(maxsize=10, ttl=60, redis_ttl=60)
+        user_id = uuid4()
+        await cache.set_profile_version(user_id, 3, committed=True)
+        await cache.set_profile_version(user_id, 2)
+        assert await cache.get_profile_version(user_id) == 3
+
+    asyncio.run(scenario())
+
+
+def test_committed_profile_version_always_wins(shared_redis):
+    async def scenario():
+        cache = SessionCache(maxsize=10, ttl=60, redis_ttl=60)
+        user_id = uuid4()
+        await cache.set_profile_version(user_id, 5)
+        await cache.set_profile_version(user_id, 6, committed=True)
+        assert await cache.get_profile_version(user_id) == 6
+        assert await cache.get_profile_version(uuid4()) is None
+
+    asyncio.run(scenario())
+
+
+def test_read_never_replaces_a_known_subscription_plan(shared_redis):
+    async def scenario():
+        cache = SessionCache(maxsize=10, ttl=60, redis_ttl=60)
+        user_id = uuid4()
+        await cache.set_subscription_plan(user_id, "Pro", committed=True)
+        await cache.set_subscription_plan(user_id, "Free")
+        assert await cache.get_subscription_plan(user_id) == "Pro"
+
+    asyncio.run(scenario())
+
+
+def test_other_workers_never_serve_an_old_profile_version(shared_redis):
+    async def scenario():
+        committing = SessionCache(maxsize=10, ttl=60, redis_ttl=60)
+        other = SessionCache(maxsize=10, ttl=60, redis_ttl=60)
+        user_id = uuid4()
+        await other.set_profile_version(user_id, 1)
+        assert await other.get_profile_version(user_id) == 1
+
+        committing.publish_committed(PROFILE_VERSION_PREFIX, user_id, 2)
+        await asyncio.sleep(0)
+        assert await other.get_profile_version(user_id) == 2
+
+    asyncio.run(scenario())
+
+
+def test_commit_hook_publishes_without_a_running_loop(shared_redis):
+    user_id = uuid4()
+    SessionCache(maxsize=10, ttl=60, redis_ttl=60).publish_committed(PROFILE_VERSION_PREFIX, user_id, 4)
+    assert asyncio.run(SessionCache(maxsize=10, ttl=60, redis_ttl=60).get_profile_version(user_id)) == 4
+
+
+def test_user_values_are_not_cached_without_redis(monkeypatch):
+    monkeypatch.setattr(session_cache_module, "get_async_redis", lambda: None)
+
+    async def scenario():
+        cache = SessionCache(maxsize=10, ttl=60, redis_ttl=60)
+        user_id = uuid4()
+        await cache.set_profile_version(user_id, 3, committed=True)
+        assert await cache.get_profile_version(user_id) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+
+# Everything the API process imports to serve requests, ending with the app itself
+APP_MODULES = (
+    "backend.core.database",
+    "backend.api.middlewares.auth_middleware",
+    "backend.api.middlewares.unit_of_work_middleware",
+    "backend.api.auth.auth_routes",
+    "backend.api.admin.admin_routes",
+    "backend.api.users.user_routes",
+    "backend.api.subscriptions.subscription_routes",
+    "backend.api.payments.payment_service",
+    "backend.api.payments.payment_routes",
+    "backend.api.payments.webhooks.stripe_webhook",
+    "backend.main",
+)
+# SDKs that must only load when first used
+LAZY_MODULES = ("stripe", "boto3", "celery", "qrcode", "PIL", "jinja2")
+
+PROBE = f"""
+import json, sys, time
+failed = {{}}
+started = time.perf_counter()
+for module in {APP_MODULES!r}:
+    try:
+        __import__(module)
+    except ImportError as e:
+        failed[module] = str(e)
+elapsed = time.perf_counter() - started
+templates = sys.modules.get("backend.templates.email_templates")
+compiled = [] if templates is None else [
+    name for name in templates.email_templates._sources if templates.email_templates.is_compiled(name)
+]
+print(json.dumps({{
+    "elapsed": elapsed,
+    "failed": failed,
+    "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules],
+    "compiled_templates": compiled,
+}}))
+"""
+
+
+def run_probe() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "LOG_MODE": "stdout", "LOG_JSON": "false", "ENV": "production"},
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cold_import_is_lazy():
+    report = run_probe()
+
+    assert report["loaded"] == []
+    assert report["compiled_templates"] == []
+    if report["failed"]:
+        pytest.skip(f"Only partly checked; these modules do not import in this tree: {report['failed']}")
+
+
+@pytest.mark.skipif(not os.getenv("IMPORT_BUDGET_SECONDS"), reason="Set IMPORT_BUDGET_SECONDS to check cold import time")
+def test_cold_import_is_within_budget():
+    assert run_probe()["elapsed"] < float(os.environ["IMPORT_BUDGET_SECONDS"])
+
+
+def test_registry_builds_lazily_and_once():
+    from backend.core.service_registry import ServiceRegistry
+
+    calls = []
+    registry = ServiceRegistry()
+    registry.register("client", lambda: calls.append(1) or object())
+
+    assert not registry.is_initialized("client")
+    assert registry.get("client") is registry.get("client")
+    assert calls == [1]
+
+    registry._after_fork()
+    registry.get("client")
+    assert calls == [1, 1]
@@ -0,0 +1,102 @@
+import asyncio
+import uuid
+
+import pytest
+
+from backend.api.subscriptions.tier_catalog import TierCatalog
+from backend.core.http_cache import etag_matches
+
+TIER = {
+    "id": uuid.UUID(int=1), "name": "Free", "description": None, "price": 0, "currency": "USD", "features": [],
+    "is_active": True, "has_ads": True, "reels_ad_free": False, "access_workouts": True, "workout_filters": False,
+    "access_community_read": True, "access_community_post": False, "private_community_challenges": False,
+    "access_nutrition": False, "calorie_tracking": False, "personalized_nutrition": False,
+    "direct_messaging": False, "basic_progress_tracking": True, "enhanced_progress_tracking": False,
+    "access_live_classes": False, "one_on_one_coaching": False, "priority_support": False, "is_hidden": False,
+    "is_trial_available": False, "trial_period_days": 0, "billing_cycle": "monthly",
+    "cancellation_policy": "Cancel anytime", "max_reel_uploads": 0, "max_saved_workouts": 5,
+    "max_messages_per_day": 10, "recurring_interval": "monthly", "version": 1,
+}
+
+
+class FakeLoader:
+    def __init__(self):
+        self.calls = 0
+        self.tiers = [dict(TIER)]
+
+    async def __call__(self, db, include_inactive):
+        self.calls += 1
+        return self.tiers
+
+
+def test_serves_cached_bytes_until_bumped():
+    loader = FakeLoader()
+    catalog = TierCatalog(loader=loader, client=None, ttl=3600)
+
+    async def scenario():
+        first = await catalog.get(None)
+        second = await catalog.get(None)
+        loader.tiers[0]["price"] = 999
+        await catalog.bump()
+        third = await catalog.get(None)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first is second and loader.calls == 2
+    assert b'"price":999' in third.body and third.etag != first.etag
+    assert third.version == first.version + 1
+
+
+def test_published_version_comes_from_the_database():
+    reads = []
+
+    async def version_loader(db):
+        reads.append(db)
+        return 7
+
+    catalog = TierCatalog(loader=FakeLoader(), version_loader=version_loader, client=None, ttl=3600)
+
+    async def scenario():
+        # A fresh process starts its cache counter at zero but still reports the durable version
+        assert await catalog.published_version("db") == 7
+        assert await catalog.published_version("db") == 7
+        await catalog.bump()
+        assert await catalog.published_version("db") == 7
+
+    asyncio.run(scenario())
+    assert len(reads) == 2
+
+
+def test_bump_is_broadcast_to_other_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    clients = [fakeredis.FakeAsyncRedis(server=server) for _ in range(2)]
+    loaders = [FakeLoader(), FakeLoader()]
+    writer, reader = (TierCatalog(loader=l, client=c) for l, c in zip(loaders, clients))
+
+    async def scenario():
+        reader.start()
+        while not reader._listening:
+            await asyncio.sleep(0.01)
+        await reader.get(None)
+        await reader.get(None)
+        version = await writer.bump()
+        for _ in range(100):
+            if await reader.version() == version:
+                break
+            await asyncio.sleep(0.02)
+        await reader.get(None)
+        await reader.stop()
+        return version
+
+    version = asyncio.run(scenario())
+    assert version == 1
+    assert loaders[1].calls == 2
+
+
+def test_if_none_match():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
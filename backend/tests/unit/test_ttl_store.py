@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from backend.core.ttl_store import MemoryTTLStore, RedisTTLStore
+
+
+def run_contract(store):
+    async def scenario():
+        assert await store.get("a") is None
+        assert await store.ttl("a") is None
+
+        assert await store.add("a", {"n": 1}, ttl=60)
+        assert not await store.add("a", {"n": 2}, ttl=60)
+        assert await store.get("a") == {"n": 1}
+        assert 0 < await store.ttl("a") <= 60
+
+        await store.set("a", {"n": 3}, ttl=60)
+        assert await store.get("a") == {"n": 3}
+
+        await store.delete("a")
+        assert await store.get("a") is None
+        assert await store.add("a", True, ttl=60)
+
+    asyncio.run(scenario())
+
+
+def test_memory_store_contract():
+    run_contract(MemoryTTLStore("test", maxsize=10))
+
+
+def test_memory_store_is_bounded():
+    store = MemoryTTLStore("test", maxsize=2)
+
+    async def scenario():
+        for key in ("a", "b", "c"):
+            await store.set(key, key, ttl=60)
+        return [await store.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [None, "b", "c"]
+
+
+def test_redis_store_contract():
+    fakeredis = pytest.importorskip("fakeredis")
+    run_contract(RedisTTLStore("test", fakeredis.FakeAsyncRedis()))
@@ -0,0 +1,55 @@
+import asyncio
+
+from backend.core.unit_of_work import RequestUnitOfWork
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    async def commit(self):
+        self.calls.append("commit")
+
+    async def rollback(self):
+        self.calls.append("rollback")
+
+    async def close(self):
+        self.calls.append("close")
+
+
+def make_unit():
+    opened = []
+
+    def factory():
+        session = FakeSession()
+        opened.append(session)
+        return session
+
+    return RequestUnitOfWork(factory), opened
+
+
+def test_session_is_opened_lazily_and_shared():
+    unit, opened = make_unit()
+    assert not unit.opened
+    assert opened == []
+
+    assert unit.session is unit.session
+    assert len(opened) == 1
+
+
+def test_complete_without_session_is_noop():
+    unit, opened = make_unit()
+    asyncio.run(unit.complete(success=True))
+    assert opened == []
+
+
+def test_complete_commits_or_rolls_back_then_closes():
+    unit, opened = make_unit()
+    unit.session
+    asyncio.run(unit.complete(success=True))
+    assert opened[0].calls == ["commit", "close"]
+    assert not unit.opened
+
+    unit.session
+    asyncio.run(unit.complete(success=False))
+    assert opened[1].calls == ["rollback", "close"]
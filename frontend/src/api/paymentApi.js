@@ -95,14 +95,14 @@ export const cancelPayment = async () => {
 
 /**
  * Get the current user's payment history
- * @param {number} page - Page number for paginated results
+ * @param {string|null} cursor - `next_cursor` from the previous page, or null for the first page
  * @param {number} pageSize - Number of results per page
- * @returns {Object} Paginated list of user payments
+ * @returns {Object} Page of user payments with `next_cursor` (null on the last page)
  */
-export const getPaymentHistory = async (page = 1, pageSize = 10) => {
+export const getPaymentHistory = async (cursor = null, pageSize = 10) => {
   try {
     const response = await apiClient.get("/history", {
-      params: { page, page_size: pageSize },
+      params: { cursor: cursor ?? undefined, page_size: pageSize },
     });
     return response.data;
   } catch (error) {
@@ -112,14 +112,14 @@ export const getPaymentHistory = async (page = 1, pageSize = 10) => {
 
 /**
  * Admin: Get all users' payment history
- * @param {number} page - Page number for paginated results
+ * @param {string|null} cursor - `next_cursor` from the previous page, or null for the first page
  * @param {number} pageSize - Number of results per page
- * @returns {Object} Paginated list of all user payments
+ * @returns {Object} Page of all user payments with `next_cursor` (null on the last page)
  */
-export const getAdminPaymentHistory = async (page = 1, pageSize = 10) => {
+export const getAdminPaymentHistory = async (cursor = null, pageSize = 10) => {
   try {
     const response = await apiClient.get("/admin/history", {
-      params: { page, page_size: pageSize },
+      params: { cursor: cursor ?? undefined, page_size: pageSize },
     });
     return response.data;
   } catch (error) {